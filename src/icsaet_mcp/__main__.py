@@ -1,17 +1,37 @@
 """Entry point for icsaet-mcp server."""
 
+import argparse
 import logging
 import sys
+from typing import TYPE_CHECKING, Any
 
 from pydantic import ValidationError
 
 from icsaet_mcp import __version__
-from icsaet_mcp.config import get_settings
-from icsaet_mcp.server import mcp
+from icsaet_mcp.config import HTTP_TRANSPORTS, get_settings
+
+if TYPE_CHECKING:
+    from fastmcp import FastMCP
 
 logger = logging.getLogger(__name__)
 
 
+def __getattr__(name: str) -> Any:
+    # FastMCP and the tool registrations load only once the configuration
+    # is known to be valid, so configuration errors are reported at once
+    if name == "mcp":
+        from icsaet_mcp.server import mcp
+
+        return mcp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def load_server() -> "FastMCP[Any]":
+    """Import the FastMCP server with its tools and prompts registered."""
+    server: FastMCP[Any] = sys.modules[__name__].mcp
+    return server
+
+
 def configure_logging() -> None:
     """Configure logging to stderr with INFO level."""
     logging.basicConfig(
@@ -22,14 +42,47 @@ def configure_logging() -> None:
     )
 
 
-def main() -> None:
-    """Start the ICAET MCP server."""
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line options; unset options fall back to settings."""
+    parser = argparse.ArgumentParser(
+        prog="icsaet-mcp", description="Serve the ICAET knowledge base over MCP."
+    )
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", *HTTP_TRANSPORTS],
+        help="stdio for one client, or http/sse to serve many (MCP_TRANSPORT)",
+    )
+    parser.add_argument("--host", help="interface to bind to (HTTP_HOST)")
+    parser.add_argument("--port", type=int, help="port to listen on (HTTP_PORT)")
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        help="server processes sharing the port (HTTP_WORKERS)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Start the ICAET MCP server.
+
+    Args:
+        argv: Command line arguments; defaults to sys.argv[1:].
+    """
+    args = parse_args(argv)
     configure_logging()
 
     logger.info(f"Starting ICAET MCP Server v{__version__}")
 
     try:
-        get_settings()
+        settings = get_settings()
         logger.info("Configuration validated successfully")
 
     except ValidationError as e:
@@ -62,7 +115,23 @@ def main() -> None:
 
     try:
         logger.info("Starting MCP server...")
-        mcp.run()
+        transport = args.transport or settings.mcp_transport
+        if transport in HTTP_TRANSPORTS:
+            from icsaet_mcp.transport import serve_http
+
+            serve_http(
+                load_server(),
+                settings,
+                transport,
+                host=args.host or settings.http_host,
+                port=args.port if args.port is not None else settings.http_port,
+                workers=(
+                    args.workers if args.workers is not None else settings.http_workers
+                ),
+            )
+        else:
+            # The banner checks PyPI for FastMCP updates before serving
+            load_server().run(show_banner=False)
 
     except KeyboardInterrupt:
         logger.info("Received shutdown signal")
@@ -0,0 +1,375 @@
+"""Answer rendering and pagination for ICAET query results."""
+
+import asyncio
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+from icsaet_mcp.codec import dumps
+from icsaet_mcp.config import Settings
+from icsaet_mcp.storage import immediate_transaction, open_shared_db
+
+logger = logging.getLogger(__name__)
+
+TEXT_FIELDS = ("answer", "text", "content")
+SPEAKER_FIELDS = ("speakers", "speaker")
+SOURCE_FIELDS = ("sources", "references", "citations")
+NAME_FIELDS = ("name", "title")
+URL_FIELDS = ("url", "link", "href")
+
+# Longest speaker or source list rendered under an answer
+MAX_LISTED = 20
+# How far back from a page boundary to look for a line or word break
+BREAK_WINDOW = 0.2
+
+
+def _first_string(item: dict[str, Any], fields: Iterable[str]) -> str | None:
+    for field in fields:
+        if isinstance(value := item.get(field), str) and value.strip():
+            return value.strip()
+    return None
+
+
+def _as_list(value: Any) -> list[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _unique(values: Iterable[str | None]) -> list[str]:
+    return list(dict.fromkeys(value for value in values if value))
+
+
+def extract_speakers(result: dict[str, Any]) -> list[str]:
+    """Speaker names from a /query response, in order and without repeats.
+
+    Accepts a "speakers" or "speaker" field holding names or objects
+    with a "name" field.
+    """
+    speakers: list[str | None] = []
+    for field in SPEAKER_FIELDS:
+        for item in _as_list(result.get(field)):
+            if isinstance(item, str):
+                speakers.append(item.strip())
+            elif isinstance(item, dict):
+                speakers.append(_first_string(item, NAME_FIELDS))
+    return _unique(speakers)
+
+
+def extract_sources(result: dict[str, Any]) -> list[str]:
+    """Sources from a /query response as "Title (url)" lines.
+
+    Accepts a "sources", "references" or "citations" field holding
+    strings or objects with a title/name and url/link.
+    """
+    sources: list[str | None] = []
+    for field in SOURCE_FIELDS:
+        for item in _as_list(result.get(field)):
+            if isinstance(item, str):
+                sources.append(item.strip())
+            elif isinstance(item, dict):
+                title = _first_string(item, NAME_FIELDS)
+                url = _first_string(item, URL_FIELDS)
+                sources.append(f"{title} ({url})" if title and url else title or url)
+    return _unique(sources)
+
+
+def _listing(label: str, items: list[str], separator: str) -> str:
+    shown = separator.join(items[:MAX_LISTED])
+    if len(items) > MAX_LISTED:
+        shown += f"{separator}... and {len(items) - MAX_LISTED} more"
+    return f"{label}{shown}"
+
+
+def render_answer(result: Any) -> str:
+    """Build the answer text for a decoded /query response.
+
+    The answer text is followed by the speakers and sources the response
+    lists, if any. Responses without a text field are rendered as compact
+    JSON rather than a Python repr.
+
+    Args:
+        result: Decoded response body.
+
+    Returns:
+        Answer text.
+    """
+    if isinstance(result, str):
+        return result
+    if not isinstance(result, dict):
+        return dumps(result).decode()
+    text = _first_string(result, TEXT_FIELDS)
+    if text is None:
+        return dumps(result).decode()
+    sections = [text]
+    if speakers := extract_speakers(result):
+        sections.append(_listing("Speakers: ", speakers, ", "))
+    if sources := extract_sources(result):
+        sections.append(_listing("Sources:\n- ", sources, "\n- "))
+    # A lone answer is returned as is rather than copied
+    return sections[0] if len(sections) == 1 else "\n\n".join(sections)
+
+
+def _page_end(text: str, start: int, page_chars: int) -> int:
+    """End of the page starting at start, preferring a line or word break."""
+    end = start + page_chars
+    if end >= len(text):
+        return len(text)
+    floor = end - int(page_chars * BREAK_WINDOW)
+    for separator in ("\n", " "):
+        cut = text.rfind(separator, floor, end)
+        if cut > start:
+            return cut + 1
+    return end
+
+
+class ContinuationStore:
+    """Keeps oversize answers so they can be read one page at a time.
+
+    paginate returns the first page_chars of an answer followed by a
+    continuation token, and next_page returns the page a token points
+    to. Answers are held by reference, so a stored answer shares memory
+    with the answer caches. At most max_entries answers are kept, least
+    recently read first out, each for ttl_seconds after its last read.
+    """
+
+    def __init__(
+        self,
+        page_chars: int,
+        ttl_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.page_chars = page_chars
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._answers: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def paginate(self, text: str) -> str:
+        """Return text, or its first page plus a continuation note if longer.
+
+        Args:
+            text: Full answer text.
+
+        Returns:
+            Text to return from the tool.
+        """
+        if self.page_chars <= 0 or len(text) <= self.page_chars:
+            return text
+        answer_id = secrets.token_urlsafe(9)
+        self._save(answer_id, text)
+        return self._page(answer_id, text, 0)
+
+    async def paginate_async(self, text: str) -> str:
+        """Like paginate, without blocking the event loop."""
+        return self.paginate(text)
+
+    def next_page(self, token: str) -> str:
+        """Return the page a continuation token points to.
+
+        Args:
+            token: Token from a previous page's continuation note.
+
+        Returns:
+            The page, followed by a continuation note if more remains.
+
+        Raises:
+            ValueError: If the token is malformed.
+            RuntimeError: If the token is unknown or has expired.
+        """
+        answer_id, _, offset_text = token.strip().partition(":")
+        if not answer_id or not offset_text.isdigit():
+            raise ValueError(
+                "Invalid continuation token. Pass the token from the end of "
+                "the previous answer."
+            )
+        text = self._load(answer_id)
+        if text is None:
+            raise RuntimeError(
+                "This continuation token has expired. Please ask the question again."
+            )
+        offset = int(offset_text)
+        if offset >= len(text):
+            raise ValueError("Continuation token is past the end of the answer.")
+        return self._page(answer_id, text, offset)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._answers)
+
+    def _save(self, answer_id: str, text: str) -> None:
+        with self._lock:
+            self._answers[answer_id] = (text, self._clock() + self.ttl_seconds)
+            while len(self._answers) > self.max_entries:
+                self._answers.popitem(last=False)
+
+    def _load(self, answer_id: str) -> str | None:
+        """Return a stored answer and extend its lifetime, or None."""
+        with self._lock:
+            entry = self._answers.get(answer_id)
+            now = self._clock()
+            if entry is None or entry[1] <= now:
+                self._answers.pop(answer_id, None)
+                return None
+            self._answers[answer_id] = (entry[0], now + self.ttl_seconds)
+            self._answers.move_to_end(answer_id)
+            return entry[0]
+
+    def _page(self, answer_id: str, text: str, start: int) -> str:
+        end = _page_end(text, start, self.page_chars)
+        page = text[start:end]
+        if end >= len(text):
+            return page
+        return (
+            f"{page}\n\n[Answer truncated: {len(text) - end} more characters. "
+            f'Call query_continue with continuation_token "{answer_id}:{end}" '
+            "to read the rest.]"
+        )
+
+
+class SharedContinuationStore(ContinuationStore):
+    """ContinuationStore whose answers live in a SQLite file.
+
+    Every server process pointing at the same directory can serve any
+    token, so paging works when consecutive requests from one client
+    reach different HTTP workers. Answers are copied into the database
+    rather than held by reference. Token expiry is kept in wall-clock
+    time so that every process reads the same deadlines.
+    """
+
+    FILENAME = "continuations.sqlite3"
+
+    def __init__(
+        self,
+        directory: str | Path,
+        page_chars: int,
+        ttl_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__(page_chars, ttl_seconds, max_entries, clock=clock)
+        self.path = Path(directory).expanduser() / self.FILENAME
+        self._conn = open_shared_db(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS continuations ("
+            "id TEXT PRIMARY KEY, answer TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    async def paginate_async(self, text: str) -> str:
+        """Like paginate, storing long answers from a worker thread."""
+        if self.page_chars <= 0 or len(text) <= self.page_chars:
+            return text
+        return await asyncio.to_thread(self.paginate, text)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM continuations WHERE expires_at > ?",
+                (self._clock(),),
+            ).fetchone()
+            return int(count)
+
+    def _save(self, answer_id: str, text: str) -> None:
+        now = self._clock()
+        with self._lock, immediate_transaction(self._conn):
+            self._conn.execute(
+                "DELETE FROM continuations WHERE expires_at <= ?", (now,)
+            )
+            self._conn.execute(
+                "INSERT INTO continuations VALUES (?, ?, ?)",
+                (answer_id, text, now + self.ttl_seconds),
+            )
+            # Expiry follows the last read, so this drops the least
+            # recently read answers
+            self._conn.execute(
+                "DELETE FROM continuations WHERE id IN (SELECT id FROM "
+                "continuations ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def _load(self, answer_id: str) -> str | None:
+        now = self._clock()
+        # One transaction, so another process cannot drop the answer
+        # between reading it and extending its expiry
+        with self._lock, immediate_transaction(self._conn):
+            row = self._conn.execute(
+                "SELECT answer FROM continuations WHERE id = ? AND expires_at > ?",
+                (answer_id, now),
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE continuations SET expires_at = ? WHERE id = ?",
+                    (now + self.ttl_seconds, answer_id),
+                )
+        return None if row is None else str(row[0])
+
+
+_continuation_store: ContinuationStore | None = None
+_continuation_store_lock = threading.Lock()
+
+
+def get_continuation_store(settings: Settings) -> ContinuationStore:
+    """Get the process-wide ContinuationStore.
+
+    When CACHE_DIR is set (and paging is on) the store is a
+    SharedContinuationStore in that directory, so tokens issued by one
+    server process can be read through any other.
+
+    Args:
+        settings: Server settings holding the page size and token lifetime.
+
+    Returns:
+        ContinuationStore: Shared store
+    """
+    global _continuation_store
+    with _continuation_store_lock:
+        if (
+            _continuation_store is None
+            and settings.cache_dir
+            and settings.answer_page_chars > 0
+        ):
+            _continuation_store = SharedContinuationStore(
+                settings.cache_dir,
+                page_chars=settings.answer_page_chars,
+                ttl_seconds=settings.continuation_ttl_seconds,
+                max_entries=settings.continuation_max_entries,
+            )
+        elif _continuation_store is None:
+            _continuation_store = ContinuationStore(
+                page_chars=settings.answer_page_chars,
+                ttl_seconds=settings.continuation_ttl_seconds,
+                max_entries=settings.continuation_max_entries,
+            )
+        return _continuation_store
+
+
+def reset_continuation_store() -> None:
+    """Drop the process-wide ContinuationStore, closing a shared store."""
+    global _continuation_store
+    with _continuation_store_lock:
+        if isinstance(_continuation_store, SharedContinuationStore):
+            _continuation_store.close()
+        _continuation_store = None
+
+
+__all__ = [
+    "ContinuationStore",
+    "SharedContinuationStore",
+    "extract_sources",
+    "extract_speakers",
+    "get_continuation_store",
+    "render_answer",
+    "reset_continuation_store",
+]
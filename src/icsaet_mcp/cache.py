@@ -0,0 +1,403 @@
+"""Answer caching for repeated ICAET questions."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from icsaet_mcp.config import Settings
+from icsaet_mcp.storage import immediate_transaction, open_shared_db
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_question(question: str) -> str:
+    """Normalize a question so trivially different phrasings share a key.
+
+    Lowercases, collapses whitespace and drops trailing punctuation, so
+    "What did Leslie Miley talk about?" and "what did leslie miley talk
+    about" hit the same entry.
+
+    Args:
+        question: Raw question text.
+
+    Returns:
+        Normalized question text.
+    """
+    return " ".join(question.casefold().split()).rstrip("?!. ")
+
+
+def cache_key(user_email: str, question: str) -> str:
+    """Build a cache key scoped to the requesting user.
+
+    Args:
+        user_email: Email the question is asked on behalf of.
+        question: Raw question text.
+
+    Returns:
+        Cache key string.
+    """
+    return f"{user_email.casefold()}\x00{normalize_question(question)}"
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    stale_hits: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+
+@dataclass
+class _Entry:
+    answer: str
+    expires_at: float
+    size: int
+    refresh_at: float
+
+
+class AnswerCache:
+    """Thread-safe in-memory answer cache with TTL and LRU eviction.
+
+    Entries expire ttl_seconds after they are stored. Expired entries are
+    kept for another max_stale_seconds so get_stale can serve them as a
+    fallback when the API is unavailable. With soft_ttl_seconds set, an
+    entry older than that is still served but needs_refresh reports it,
+    so callers can refresh it before it expires. When either max_entries
+    or max_bytes is exceeded, least recently used entries are evicted
+    first.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        max_bytes: int,
+        max_stale_seconds: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+        soft_ttl_seconds: float | None = None,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.soft_ttl_seconds = soft_ttl_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._size_bytes = 0
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        """Return the cached answer for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            now = self._clock()
+            if entry.expires_at <= now:
+                if entry.expires_at + self.max_stale_seconds <= now:
+                    self._remove(key)
+                    self._stats.expirations += 1
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry.answer
+
+    def get_stale(self, key: str) -> str | None:
+        """Return the answer for key even if expired, within max_stale_seconds."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at + self.max_stale_seconds <= self._clock():
+                return None
+            self._stats.stale_hits += 1
+            return entry.answer
+
+    def needs_refresh(self, key: str) -> bool:
+        """Whether key holds an answer past its soft TTL that has not expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            return entry.refresh_at <= self._clock() < entry.expires_at
+
+    def set(self, key: str, answer: str) -> None:
+        """Store an answer, evicting least recently used entries if needed."""
+        size = len(key.encode()) + len(answer.encode())
+        if size > self.max_bytes:
+            logger.debug(f"Answer of {size} bytes exceeds cache size limit")
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            now = self._clock()
+            expires_at = now + self.ttl_seconds
+            refresh_at = (
+                expires_at
+                if self.soft_ttl_seconds is None
+                else min(now + self.soft_ttl_seconds, expires_at)
+            )
+            self._entries[key] = _Entry(answer, expires_at, size, refresh_at)
+            self._size_bytes += size
+            while (
+                len(self._entries) > self.max_entries
+                or self._size_bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                stale_hits=self._stats.stale_hits,
+                evictions=self._stats.evictions,
+                expirations=self._stats.expirations,
+                entries=len(self._entries),
+                size_bytes=self._size_bytes,
+            )
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._size_bytes -= entry.size
+
+
+class DiskAnswerCache:
+    """SQLite-backed answer cache shared by server processes on one host.
+
+    Survives restarts so a warm start can answer previously asked
+    questions without touching the network. The database runs in WAL mode
+    with a busy timeout, so several processes can read and write the same
+    file concurrently. Entries older than ttl_seconds plus
+    max_stale_seconds are purged and least recently used entries trimmed
+    on every write to keep the file within max_entries and max_bytes.
+    """
+
+    FILENAME = "answers.sqlite3"
+
+    def __init__(
+        self,
+        directory: str | Path,
+        ttl_seconds: float,
+        max_entries: int,
+        max_bytes: int,
+        max_stale_seconds: float = 0.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._hits = 0
+        self._misses = 0
+        self._stale_hits = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+        self.path = Path(directory).expanduser() / self.FILENAME
+        self._conn = open_shared_db(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            "key TEXT PRIMARY KEY, answer TEXT NOT NULL, size INTEGER NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS answers_accessed ON answers (accessed_at)"
+        )
+
+    def get(self, key: str) -> str | None:
+        """Return the cached answer for key, or None on a miss."""
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT answer FROM answers WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE answers SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._hits += 1
+            return str(row[0])
+
+    def get_stale(self, key: str) -> str | None:
+        """Return the answer for key even if expired, within max_stale_seconds."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT answer FROM answers WHERE key = ? AND expires_at > ?",
+                (key, self._clock() - self.max_stale_seconds),
+            ).fetchone()
+            if row is None:
+                return None
+            self._stale_hits += 1
+            return str(row[0])
+
+    def set(self, key: str, answer: str) -> None:
+        """Store an answer and compact the database."""
+        size = len(key.encode()) + len(answer.encode())
+        if size > self.max_bytes:
+            return
+        now = self._clock()
+        with self._lock, immediate_transaction(self._conn):
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?)",
+                (key, answer, size, now + self.ttl_seconds, now),
+            )
+            self._compact(now)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM answers")
+
+    def items(self) -> list[tuple[str, str]]:
+        """Return (key, answer) pairs of all entries, including stale ones."""
+        with self._lock:
+            return self._conn.execute("SELECT key, answer FROM answers").fetchall()
+
+    def stats(self) -> CacheStats:
+        """Return this process's counters plus the shared database size."""
+        with self._lock:
+            entries, size_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM answers"
+            ).fetchone()
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                stale_hits=self._stale_hits,
+                evictions=self._evictions,
+                entries=entries,
+                size_bytes=size_bytes,
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _compact(self, now: float) -> None:
+        self._conn.execute(
+            "DELETE FROM answers WHERE expires_at <= ?",
+            (now - self.max_stale_seconds,),
+        )
+        cursor = self._conn.execute(
+            "DELETE FROM answers WHERE key IN ("
+            "  SELECT key FROM ("
+            "    SELECT key,"
+            "      ROW_NUMBER() OVER (ORDER BY accessed_at DESC) AS position,"
+            "      SUM(size) OVER (ORDER BY accessed_at DESC) AS running_size"
+            "    FROM answers"
+            "  ) WHERE position > ? OR running_size > ?"
+            ")",
+            (self.max_entries, self.max_bytes),
+        )
+        self._evictions += max(cursor.rowcount, 0)
+
+
+_answer_cache: AnswerCache | None = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache(settings: Settings) -> AnswerCache | None:
+    """Get the process-wide AnswerCache, or None if caching is disabled.
+
+    Args:
+        settings: Server settings holding the cache configuration.
+
+    Returns:
+        AnswerCache | None: Shared cache instance
+    """
+    global _answer_cache
+    if not settings.cache_enabled:
+        return None
+    with _answer_cache_lock:
+        if _answer_cache is None:
+            _answer_cache = AnswerCache(
+                ttl_seconds=settings.cache_ttl_seconds,
+                max_entries=settings.cache_max_entries,
+                max_bytes=settings.cache_max_bytes,
+                max_stale_seconds=settings.cache_max_stale_seconds,
+                soft_ttl_seconds=settings.cache_soft_ttl_seconds,
+            )
+        return _answer_cache
+
+
+def reset_answer_cache() -> None:
+    """Drop the process-wide AnswerCache."""
+    global _answer_cache
+    with _answer_cache_lock:
+        _answer_cache = None
+
+
+_disk_cache: DiskAnswerCache | None = None
+
+
+def get_disk_cache(settings: Settings) -> DiskAnswerCache | None:
+    """Get the process-wide DiskAnswerCache, or None if CACHE_DIR is unset.
+
+    Args:
+        settings: Server settings holding the disk cache configuration.
+
+    Returns:
+        DiskAnswerCache | None: Shared disk cache instance
+    """
+    global _disk_cache
+    if not settings.cache_dir:
+        return None
+    with _answer_cache_lock:
+        if _disk_cache is None:
+            _disk_cache = DiskAnswerCache(
+                settings.cache_dir,
+                ttl_seconds=settings.disk_cache_ttl_seconds,
+                max_entries=settings.disk_cache_max_entries,
+                max_bytes=settings.disk_cache_max_bytes,
+                max_stale_seconds=settings.cache_max_stale_seconds,
+            )
+            logger.info(f"Opened disk answer cache at {_disk_cache.path}")
+        return _disk_cache
+
+
+def close_disk_cache() -> None:
+    """Close the process-wide DiskAnswerCache if one was opened."""
+    global _disk_cache
+    with _answer_cache_lock:
+        if _disk_cache is not None:
+            _disk_cache.close()
+            _disk_cache = None
+
+
+__all__ = [
+    "AnswerCache",
+    "CacheStats",
+    "DiskAnswerCache",
+    "cache_key",
+    "close_disk_cache",
+    "get_answer_cache",
+    "get_disk_cache",
+    "normalize_question",
+    "reset_answer_cache",
+]
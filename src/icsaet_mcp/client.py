@@ -0,0 +1,640 @@
+"""HTTP client for the ICAET API."""
+
+import importlib.util
+import logging
+import threading
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from types import TracebackType
+from typing import Any, Self, TypeVar, cast
+
+import httpx
+
+from icsaet_mcp.codec import dumps, loads
+from icsaet_mcp.config import DEFAULT_BASE_URL, Settings
+from icsaet_mcp.hedging import Commit, get_hedge_policy
+from icsaet_mcp.metrics import track_upstream
+from icsaet_mcp.ratelimit import get_rate_limiter
+from icsaet_mcp.resilience import (
+    RetryPolicy,
+    get_circuit_breaker,
+    get_retry_budget,
+)
+from icsaet_mcp.scheduler import time_left
+from icsaet_mcp.tracing import record_response, upstream_span
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+type ChunkCallback = Callable[[str], Awaitable[None]]
+
+STREAM_ACCEPT = "text/event-stream, text/plain;q=0.9, application/json;q=0.8"
+STREAM_TEXT_FIELDS = ("delta", "text", "content", "answer")
+
+# (coding, modules that can decode it, q-value), in order of preference
+CONTENT_CODINGS = (
+    ("zstd", ("zstandard",), "1.0"),
+    ("br", ("brotli", "brotlicffi"), "0.9"),
+    ("gzip", (), "0.8"),
+    ("deflate", (), "0.5"),
+)
+
+
+def build_limits(settings: Settings) -> httpx.Limits:
+    """Build connection pool limits from settings.
+
+    Args:
+        settings: Server settings holding the pool configuration.
+
+    Returns:
+        httpx.Limits for the shared connection pool.
+    """
+    return httpx.Limits(
+        max_connections=settings.icaet_max_connections,
+        max_keepalive_connections=settings.icaet_max_keepalive_connections,
+        keepalive_expiry=settings.icaet_keepalive_expiry,
+    )
+
+
+def build_timeout(settings: Settings) -> httpx.Timeout:
+    """Build split connect/read/write/pool timeouts from settings.
+
+    Args:
+        settings: Server settings holding the timeout configuration.
+
+    Returns:
+        httpx.Timeout for the shared clients.
+    """
+    return httpx.Timeout(
+        connect=settings.icaet_connect_timeout,
+        read=settings.icaet_read_timeout,
+        write=settings.icaet_write_timeout,
+        pool=settings.icaet_pool_timeout,
+    )
+
+
+def request_timeout(settings: Settings, deadline: float | None) -> httpx.Timeout:
+    """Build timeouts for one request, capped by the time left before deadline.
+
+    Args:
+        settings: Server settings holding the timeout configuration.
+        deadline: time.monotonic() deadline, or None for the configured
+            timeouts.
+
+    Returns:
+        httpx.Timeout for the request.
+
+    Raises:
+        DeadlineExceededError: If the deadline has passed.
+    """
+    left = time_left(deadline)
+    if left is None:
+        return build_timeout(settings)
+    return httpx.Timeout(
+        connect=min(settings.icaet_connect_timeout, left),
+        read=min(settings.icaet_read_timeout, left),
+        write=min(settings.icaet_write_timeout, left),
+        pool=min(settings.icaet_pool_timeout, left),
+    )
+
+
+def http2_enabled(settings: Settings) -> bool:
+    """Whether to negotiate HTTP/2, falling back if h2 is not installed."""
+    if not settings.icaet_http2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning(
+            "ICAET_HTTP2 is set but the h2 package is not installed; "
+            "using HTTP/1.1. Install with: pip install 'icsaet-mcp[http2]'"
+        )
+        return False
+    return True
+
+
+def accept_encoding(settings: Settings) -> str:
+    """Build the Accept-Encoding header, strongest installed coding first.
+
+    Brotli and zstd are only offered when their decoders are installed
+    (pip install 'icsaet-mcp[compression]'); gzip and deflate always are.
+
+    Args:
+        settings: Server settings holding the compression switch.
+
+    Returns:
+        Header value, or "identity" if ICAET_COMPRESSION is off.
+    """
+    if not settings.icaet_compression:
+        return "identity"
+    offered = [
+        f"{coding};q={quality}"
+        for coding, modules, quality in CONTENT_CODINGS
+        if not modules or any(importlib.util.find_spec(module) for module in modules)
+    ]
+    return ", ".join(offered)
+
+
+def build_client_options(settings: Settings) -> dict[str, Any]:
+    """Build the httpx client keyword arguments for the transport profile.
+
+    Args:
+        settings: Server settings holding the transport configuration.
+
+    Returns:
+        Keyword arguments shared by httpx.Client and httpx.AsyncClient.
+    """
+    return {
+        "base_url": settings.icaet_base_url,
+        "timeout": build_timeout(settings),
+        "limits": build_limits(settings),
+        "http2": http2_enabled(settings),
+        "headers": {"accept-encoding": accept_encoding(settings)},
+    }
+
+
+def build_request(settings: Settings, question: str) -> tuple[dict[str, str], bytes]:
+    """Build headers and encoded JSON body for a /query request.
+
+    Args:
+        settings: Server settings holding credentials.
+        question: Question to send.
+
+    Returns:
+        Tuple of (headers, body).
+    """
+    headers = {"x-api-key": settings.icaet_api_key, "content-type": "application/json"}
+    body = dumps({"email": settings.user_email, "question": question})
+    return headers, body
+
+
+class ResponseTooLargeError(RuntimeError):
+    """Raised when an answer exceeds ICAET_MAX_RESPONSE_BYTES."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        super().__init__(
+            f"The ICAET answer is larger than {limit} bytes and was not accepted. "
+            "Please ask a more specific question."
+        )
+
+
+def decode_answer(body: bytes | bytearray, limit: int) -> dict[str, Any]:
+    """Decode a JSON /query response body (already decompressed by httpx).
+
+    Raises:
+        ResponseTooLargeError: If body is longer than limit bytes.
+    """
+    if len(body) > limit:
+        raise ResponseTooLargeError(limit)
+    return cast(dict[str, Any], loads(body))
+
+
+async def aread_bounded(response: httpx.Response, limit: int) -> bytearray:
+    """Read a streamed response body, stopping once it exceeds limit bytes.
+
+    The limit applies to the declared Content-Length and to the body
+    after decompression, so neither an oversize answer nor a compression
+    bomb is held in memory.
+
+    Args:
+        response: Open streaming response.
+        limit: Maximum body size in bytes.
+
+    Returns:
+        The decompressed body.
+
+    Raises:
+        ResponseTooLargeError: If the body is longer than limit.
+    """
+    declared = response.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise ResponseTooLargeError(limit)
+    body = bytearray()
+    async for chunk in response.aiter_bytes():
+        body += chunk
+        if len(body) > limit:
+            raise ResponseTooLargeError(limit)
+    return body
+
+
+def map_http_error(e: httpx.HTTPError) -> RuntimeError:
+    """Translate an httpx error into a user-facing RuntimeError.
+
+    Args:
+        e: Error raised by httpx.
+
+    Returns:
+        RuntimeError with a helpful message, to be raised by the caller.
+    """
+    if isinstance(e, httpx.TimeoutException):
+        logger.error(f"Request timeout: {e}")
+        return RuntimeError(
+            "Request timed out. The ICAET API is taking too long to respond."
+        )
+    if isinstance(e, httpx.HTTPStatusError):
+        logger.error(f"HTTP error {e.response.status_code}: {e}")
+        if e.response.status_code == 401:
+            return RuntimeError(
+                "Authentication failed. Please check your ICAET_API_KEY."
+            )
+        elif e.response.status_code == 429:
+            return RuntimeError(
+                "Rate limit exceeded. The ICAET API quota for this API key "
+                "is used up; please try again later."
+            )
+        elif e.response.status_code == 400:
+            return RuntimeError(
+                "Invalid request. Please check your question format and email."
+            )
+        else:
+            return RuntimeError(
+                f"API error: {e.response.status_code}. Please try again later."
+            )
+    logger.error(f"Network error: {e}")
+    return RuntimeError("Network error. Please check your internet connection.")
+
+
+@contextmanager
+def instrument_request(
+    url: httpx.URL, headers: dict[str, str]
+) -> Iterator[Callable[[httpx.Response], None]]:
+    """Trace and meter one POST attempt to the ICAET API.
+
+    Opens a client span (injecting trace-context headers into headers)
+    and records latency, status and sizes in the upstream metrics.
+
+    Args:
+        url: Full request URL.
+        headers: Outgoing request headers, updated in place.
+
+    Yields:
+        Callback to hand the response to once it arrives.
+    """
+    responses: list[httpx.Response] = []
+    with upstream_span("POST", url, headers) as span, track_upstream() as observe:
+        try:
+            yield responses.append
+        finally:
+            if responses:
+                observe(responses[0])
+                record_response(span, responses[0])
+
+
+def _sse_event_text(data: str) -> str | None:
+    """Extract answer text from one SSE event's data, None at end of stream."""
+    if data == "[DONE]":
+        return None
+    try:
+        event = loads(data)
+    except ValueError:
+        return data
+    if isinstance(event, dict):
+        for field in STREAM_TEXT_FIELDS:
+            if isinstance(event.get(field), str):
+                return cast(str, event[field])
+        return ""
+    return data
+
+
+async def iter_sse_text(response: httpx.Response) -> AsyncIterator[str]:
+    """Yield answer text from a text/event-stream response.
+
+    Each event's data is either plain text or a JSON object whose first
+    string field among STREAM_TEXT_FIELDS is taken. A "[DONE]" event ends
+    the stream.
+
+    Args:
+        response: Open streaming response.
+
+    Yields:
+        Answer text fragments in arrival order.
+    """
+    data: list[str] = []
+    async for line in response.aiter_lines():
+        if line.startswith("data:"):
+            data.append(line[5:].removeprefix(" "))
+        elif not line and data:
+            text = _sse_event_text("\n".join(data))
+            data = []
+            if text is None:
+                return
+            yield text
+    if data and (text := _sse_event_text("\n".join(data))) is not None:
+        yield text
+
+
+class ICAETClient:
+    """Client for interacting with ICAET API."""
+
+    BASE_URL = DEFAULT_BASE_URL
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self._client = httpx.Client(**build_client_options(settings))
+        self._query_url = httpx.URL(f"{settings.icaet_base_url}/query")
+        self._retry = RetryPolicy.from_settings(settings, get_retry_budget(settings))
+        self._breaker = get_circuit_breaker(settings)
+        self._limiter = get_rate_limiter(settings)
+
+    def query(self, question: str) -> dict[str, Any]:
+        """Query the ICAET knowledge base.
+
+        Transient failures (timeouts, connection resets, 429/502/503/504)
+        are retried according to the retry policy before being reported.
+        While the circuit breaker is open the call fails fast with
+        CircuitOpenError. Each attempt first waits for a slot from the
+        shared rate limiter, which raises RateLimitExceededError if the
+        queue is longer than RATE_LIMIT_MAX_WAIT_SECONDS. Answers larger
+        than ICAET_MAX_RESPONSE_BYTES raise ResponseTooLargeError; unlike
+        AsyncICAETClient, which serves the MCP tools, the body is read
+        before the check.
+        """
+        headers, body = build_request(self.settings, question)
+
+        def post() -> httpx.Response:
+            self._limiter.acquire()
+            with instrument_request(self._query_url, headers) as observe:
+                response = self._client.post("/query", content=body, headers=headers)
+                observe(response)
+            self._limiter.observe(response)
+            response.raise_for_status()
+            return response
+
+        try:
+            with self._breaker.guard():
+                response = self._retry.call(post)
+            return decode_answer(
+                response.content, self.settings.icaet_max_response_bytes
+            )
+        except httpx.HTTPError as e:
+            raise map_http_error(e) from e
+
+    def close(self) -> None:
+        """Close the underlying connection pool."""
+        self._client.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class AsyncICAETClient:
+    """Async client for interacting with ICAET API.
+
+    Uses httpx.AsyncClient so slow upstream answers never block the
+    FastMCP event loop and several questions can be in flight at once.
+    """
+
+    BASE_URL = DEFAULT_BASE_URL
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self._client = httpx.AsyncClient(**build_client_options(settings))
+        self._query_url = httpx.URL(f"{settings.icaet_base_url}/query")
+        self._retry = RetryPolicy.from_settings(settings, get_retry_budget(settings))
+        self._breaker = get_circuit_breaker(settings)
+        self._limiter = get_rate_limiter(settings)
+        self._hedge = get_hedge_policy(settings)
+
+    async def _send(self, post: Callable[[Commit], Awaitable[T]]) -> T:
+        """Make one request attempt, racing a duplicate if HEDGE_ENABLED."""
+        if self._hedge is None:
+            return await post(lambda: None)
+        return await self._hedge.call(post)
+
+    async def query(
+        self, question: str, deadline: float | None = None
+    ) -> dict[str, Any]:
+        """Query the ICAET knowledge base, retrying transient failures.
+
+        The body is streamed and rejected with ResponseTooLargeError as
+        soon as it exceeds ICAET_MAX_RESPONSE_BYTES. With a deadline (a
+        time.monotonic() value), each attempt's timeouts are capped by the
+        time left and no retry is started that would end after it. With
+        HEDGE_ENABLED, an attempt slower than usual is raced against a
+        duplicate and the slower of the two is cancelled.
+        """
+        headers, body = build_request(self.settings, question)
+        limit = self.settings.icaet_max_response_bytes
+
+        async def post(commit: Commit) -> bytearray:
+            await self._limiter.acquire_async()
+            timeout = request_timeout(self.settings, deadline)
+            # Each attempt gets its own trace headers, even when hedged
+            sent = dict(headers)
+            with instrument_request(self._query_url, sent) as observe:
+                async with self._client.stream(
+                    "POST", "/query", content=body, headers=sent, timeout=timeout
+                ) as response:
+                    observe(response)
+                    await self._limiter.observe_async(response)
+                    response.raise_for_status()
+                    return await aread_bounded(response, limit)
+
+        try:
+            with self._breaker.guard():
+                answer = await self._retry.call_async(
+                    lambda: self._send(post), deadline=deadline
+                )
+            return decode_answer(answer, limit)
+        except httpx.HTTPError as e:
+            raise map_http_error(e) from e
+
+    async def query_stream(
+        self, question: str, on_chunk: ChunkCallback, deadline: float | None = None
+    ) -> dict[str, Any]:
+        """Query the ICAET knowledge base, relaying the answer as it arrives.
+
+        Server-sent events and chunked text/plain responses are read
+        incrementally and each fragment is passed to on_chunk. Any other
+        response (e.g. plain JSON) is read whole, as in query. Failures
+        before the first fragment are retried (and hedged) like query; once
+        text has been relayed, errors are reported without retrying.
+
+        Args:
+            question: Question to send.
+            on_chunk: Awaited with each answer fragment.
+            deadline: time.monotonic() deadline capping timeouts and
+                retries, as in query.
+
+        Returns:
+            {"answer": full text} for streamed responses, otherwise the
+            parsed JSON body.
+        """
+        headers, body = build_request(self.settings, question)
+        headers["accept"] = STREAM_ACCEPT
+        limit = self.settings.icaet_max_response_bytes
+
+        async def read(response: httpx.Response, commit: Commit) -> dict[str, Any]:
+            await self._limiter.observe_async(response)
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "")
+            if content_type.startswith("text/event-stream"):
+                chunks = iter_sse_text(response)
+            elif content_type.startswith("text/plain"):
+                chunks = response.aiter_text()
+            else:
+                return decode_answer(await aread_bounded(response, limit), limit)
+
+            parts: list[str] = []
+            size = 0
+            try:
+                async for chunk in chunks:
+                    if chunk:
+                        size += len(chunk.encode())
+                        if size > limit:
+                            raise ResponseTooLargeError(limit)
+                        if not parts:
+                            # Only one hedged attempt may relay the answer
+                            commit()
+                        parts.append(chunk)
+                        await on_chunk(chunk)
+            except httpx.HTTPError as e:
+                if parts:
+                    raise map_http_error(e) from e
+                raise
+            return {"answer": "".join(parts)}
+
+        async def post(commit: Commit) -> dict[str, Any]:
+            await self._limiter.acquire_async()
+            timeout = request_timeout(self.settings, deadline)
+            sent = dict(headers)
+            with instrument_request(self._query_url, sent) as observe:
+                async with self._client.stream(
+                    "POST", "/query", content=body, headers=sent, timeout=timeout
+                ) as response:
+                    observe(response)
+                    return await read(response, commit)
+
+        try:
+            with self._breaker.guard():
+                return await self._retry.call_async(
+                    lambda: self._send(post), deadline=deadline
+                )
+        except httpx.HTTPError as e:
+            raise map_http_error(e) from e
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+
+_shared_client: ICAETClient | None = None
+_shared_client_lock = threading.Lock()
+
+
+def get_client(settings: Settings) -> ICAETClient:
+    """Get the process-wide ICAETClient, creating it on first use.
+
+    All tool calls share one pooled client so keep-alive connections are
+    reused instead of paying a TCP+TLS handshake per question. The client
+    is rebuilt (and the old pool closed) if a different Settings instance
+    is passed, e.g. after get_settings.cache_clear().
+
+    Args:
+        settings: Server settings used to build the client.
+
+    Returns:
+        ICAETClient: Shared client instance
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None or _shared_client.settings is not settings:
+            if _shared_client is not None:
+                _shared_client.close()
+            _shared_client = ICAETClient(settings)
+            logger.info("Created pooled ICAET HTTP client")
+        return _shared_client
+
+
+def close_client() -> None:
+    """Close the process-wide ICAETClient if one was created."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is not None:
+            _shared_client.close()
+            _shared_client = None
+            logger.info("Closed pooled ICAET HTTP client")
+
+
+_shared_async_client: AsyncICAETClient | None = None
+_retired_async_clients: list[AsyncICAETClient] = []
+
+
+def get_async_client(settings: Settings) -> AsyncICAETClient:
+    """Get the process-wide AsyncICAETClient, creating it on first use.
+
+    Must be called from the event loop that will use the client. Like
+    get_client, the client is rebuilt if a different Settings instance
+    is passed; the replaced client is closed by close_async_client.
+
+    Args:
+        settings: Server settings used to build the client.
+
+    Returns:
+        AsyncICAETClient: Shared client instance
+    """
+    global _shared_async_client
+    if _shared_async_client is None or _shared_async_client.settings is not settings:
+        if _shared_async_client is not None:
+            _retired_async_clients.append(_shared_async_client)
+        _shared_async_client = AsyncICAETClient(settings)
+        logger.info("Created pooled async ICAET HTTP client")
+    return _shared_async_client
+
+
+async def close_async_client() -> None:
+    """Close the process-wide AsyncICAETClient if one was created."""
+    global _shared_async_client
+    clients = list(_retired_async_clients)
+    _retired_async_clients.clear()
+    if _shared_async_client is not None:
+        clients.append(_shared_async_client)
+        _shared_async_client = None
+    for client in clients:
+        await client.aclose()
+    if clients:
+        logger.info("Closed pooled async ICAET HTTP client")
+
+
+__all__ = [
+    "STREAM_ACCEPT",
+    "AsyncICAETClient",
+    "ChunkCallback",
+    "ICAETClient",
+    "ResponseTooLargeError",
+    "accept_encoding",
+    "aread_bounded",
+    "build_client_options",
+    "build_limits",
+    "build_request",
+    "build_timeout",
+    "close_async_client",
+    "close_client",
+    "decode_answer",
+    "get_async_client",
+    "get_client",
+    "http2_enabled",
+    "instrument_request",
+    "iter_sse_text",
+    "map_http_error",
+    "request_timeout",
+]
@@ -0,0 +1,48 @@
+"""JSON encoding for ICAET API payloads, using orjson when installed."""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the fastjson extra
+    orjson = None
+
+
+def orjson_available() -> bool:
+    """Whether the orjson codec is in use."""
+    return orjson is not None
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode obj as compact UTF-8 JSON.
+
+    Args:
+        obj: JSON-serializable value.
+
+    Returns:
+        Encoded bytes, identical for both codecs.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode JSON text.
+
+    Args:
+        data: UTF-8 bytes or text.
+
+    Returns:
+        Decoded value.
+
+    Raises:
+        ValueError: If data is not valid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+__all__ = ["dumps", "loads", "orjson_available"]
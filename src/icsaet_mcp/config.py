@@ -1,10 +1,16 @@
 """Configuration management for ICSAET MCP server."""
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+DEFAULT_BASE_URL = "https://icaet-dev.wesleyreisz.com"
+
+# MCP_TRANSPORT values served over HTTP rather than stdio
+HTTP_TRANSPORTS = ("http", "sse")
+
 
 class Settings(BaseSettings):
     """Settings for ICSAET MCP server.
@@ -12,6 +18,81 @@ class Settings(BaseSettings):
     Loads configuration from environment variables:
         ICAET_API_KEY: API key for ICAET authentication
         USER_EMAIL: User email for API requests
+        ICAET_BASE_URL: ICAET API base URL (e.g. a local stand-in for load tests)
+        ICAET_CONNECT_TIMEOUT: Seconds to establish a connection
+        ICAET_READ_TIMEOUT: Seconds to wait for response data
+        ICAET_WRITE_TIMEOUT: Seconds to send request data
+        ICAET_POOL_TIMEOUT: Seconds to wait for a free pooled connection
+        ICAET_HTTP2: Use HTTP/2 multiplexing (requires the http2 extra)
+        ICAET_COMPRESSION: Negotiate compressed responses (brotli and zstd
+            require the compression extra)
+        ICAET_MAX_RESPONSE_BYTES: Largest answer accepted from the API
+        ICAET_MAX_CONNECTIONS: Maximum open connections in the HTTP pool
+        ICAET_MAX_KEEPALIVE_CONNECTIONS: Maximum idle keep-alive connections
+        ICAET_KEEPALIVE_EXPIRY: Seconds an idle connection is kept open
+        CACHE_ENABLED: Cache answers to repeated questions in memory
+        CACHE_TTL_SECONDS: Seconds a cached answer stays valid
+        CACHE_SOFT_TTL_SECONDS: Seconds before an answer in the memory cache
+            is refreshed in the background while still being served
+        CACHE_REFRESH_CONCURRENCY: Maximum background refreshes in flight
+            (0 disables refreshing)
+        CACHE_MAX_ENTRIES: Maximum number of cached answers
+        CACHE_MAX_BYTES: Maximum total size of cached answers
+        CACHE_MAX_STALE_SECONDS: Seconds an expired answer may still be served
+            while the ICAET API is unavailable
+        CACHE_DIR: Directory for the answer cache and rate limit state shared
+            by all server processes on the host (disabled if unset)
+        DISK_CACHE_TTL_SECONDS: Seconds a persisted answer stays valid
+        DISK_CACHE_MAX_ENTRIES: Maximum number of persisted answers
+        DISK_CACHE_MAX_BYTES: Maximum total size of persisted answers
+        SEMANTIC_CACHE_ENABLED: Serve cached answers to paraphrased questions
+        SEMANTIC_CACHE_THRESHOLD: Cosine similarity needed for a semantic hit
+        SEMANTIC_CACHE_MAX_ENTRIES: Questions indexed per user
+        SEMANTIC_CACHE_DIMENSIONS: Size of the hashed question vectors
+        SNAPSHOT_PATH: SQLite full-text snapshot for offline lookups (optional)
+        SNAPSHOT_FAST_PATH: Answer from the snapshot before calling the API
+        SNAPSHOT_RECORD_ANSWERS: Add every upstream answer to the snapshot
+        PREWARM_ENABLED: Fetch example question answers in the background
+        PREWARM_FILE: Extra questions to prewarm, one per line (optional)
+        PREWARM_CONCURRENCY: Maximum prewarm requests in flight
+        ANSWER_PAGE_CHARS: Longest answer returned at once; longer answers are
+            paged through query_continue (0 disables paging)
+        CONTINUATION_TTL_SECONDS: Seconds a continuation token stays valid
+        CONTINUATION_MAX_ENTRIES: Oversize answers kept for query_continue
+        BATCH_CONCURRENCY: Maximum upstream requests in flight per batch
+        UPSTREAM_MAX_CONCURRENCY: Maximum upstream requests in flight; further
+            requests queue by priority (interactive, batch, background)
+        QUERY_DEADLINE_SECONDS: Seconds a query tool call may take, including
+            queueing; also caps upstream timeouts and retries
+        STREAM_ANSWERS: Relay streamed answers as MCP progress notifications
+        RETRY_MAX_ATTEMPTS: Total attempts per request, including the first
+        RETRY_BACKOFF_BASE: Initial retry backoff in seconds (doubles per retry)
+        RETRY_BACKOFF_MAX: Maximum retry backoff in seconds
+        RETRY_DEADLINE_SECONDS: No retry is started after this many seconds
+        RETRY_BUDGET_RATIO: Retries allowed per request across the process
+        RETRY_BUDGET_MAX_TOKENS: Retry burst allowance across the process
+        HEDGE_ENABLED: Send a duplicate request when the API is slower than usual
+        HEDGE_PERCENTILE: Percentile of recent response times to wait before
+            hedging
+        HEDGE_MIN_DELAY_SECONDS: Shortest wait before hedging
+        HEDGE_BUDGET_RATIO: Hedged requests allowed per request
+        HEDGE_BUDGET_MAX_TOKENS: Hedge burst allowance across the process
+        BREAKER_FAILURE_THRESHOLD: Consecutive failures that open the circuit
+        BREAKER_RESET_TIMEOUT_SECONDS: Seconds the circuit stays open
+        BREAKER_HALF_OPEN_MAX_CALLS: Probe requests allowed while half-open
+        RATE_LIMIT_PER_SECOND: Client-side request rate limit; 0 disables
+        RATE_LIMIT_BURST: Requests allowed back to back before throttling
+        RATE_LIMIT_MAX_WAIT_SECONDS: Longest a request may queue for a slot
+        METRICS_PORT: Serve Prometheus metrics on this port (optional)
+        METRICS_HOST: Interface the metrics listener binds to
+        TRACE_EXPORTER: OpenTelemetry span exporter: none, console or file
+        TRACE_FILE: JSON-lines file spans are appended to by the file exporter
+        MCP_TRANSPORT: stdio for one client, or http/sse to serve many
+        HTTP_HOST: Interface the HTTP transport binds to
+        HTTP_PORT: Port the HTTP transport listens on
+        HTTP_WORKERS: Server processes sharing the HTTP port
+        CLIENT_MAX_CONCURRENCY: Tool calls in flight per HTTP client; 0 disables
+        SHUTDOWN_TIMEOUT_SECONDS: Seconds in-flight HTTP requests get on shutdown
     """
 
     model_config = SettingsConfigDict(case_sensitive=False, extra="ignore")
@@ -22,6 +103,239 @@ class Settings(BaseSettings):
     user_email: str = Field(
         ..., min_length=5, description="User email for API requests"
     )
+    icaet_base_url: str = Field(
+        default=DEFAULT_BASE_URL, description="ICAET API base URL"
+    )
+    icaet_connect_timeout: float = Field(
+        default=5.0, gt=0, description="Seconds to establish a connection"
+    )
+    icaet_read_timeout: float = Field(
+        default=30.0, gt=0, description="Seconds to wait for response data"
+    )
+    icaet_write_timeout: float = Field(
+        default=10.0, gt=0, description="Seconds to send request data"
+    )
+    icaet_pool_timeout: float = Field(
+        default=5.0, gt=0, description="Seconds to wait for a free pooled connection"
+    )
+    icaet_http2: bool = Field(
+        default=False, description="Use HTTP/2 multiplexing (requires h2)"
+    )
+    icaet_compression: bool = Field(
+        default=True, description="Negotiate gzip, brotli or zstd responses"
+    )
+    icaet_max_response_bytes: int = Field(
+        default=4 * 1024 * 1024,
+        ge=1024,
+        description="Largest answer accepted from the API, after decompression",
+    )
+    icaet_max_connections: int = Field(
+        default=10, ge=1, description="Maximum open connections in the HTTP pool"
+    )
+    icaet_max_keepalive_connections: int = Field(
+        default=5, ge=0, description="Maximum idle keep-alive connections"
+    )
+    icaet_keepalive_expiry: float = Field(
+        default=30.0, gt=0, description="Seconds an idle connection is kept open"
+    )
+    cache_enabled: bool = Field(
+        default=True, description="Cache answers to repeated questions in memory"
+    )
+    cache_ttl_seconds: float = Field(
+        default=3600.0, gt=0, description="Seconds a cached answer stays valid"
+    )
+    cache_soft_ttl_seconds: float = Field(
+        default=1800.0,
+        gt=0,
+        description="Seconds before a cached answer is refreshed in the background",
+    )
+    cache_refresh_concurrency: int = Field(
+        default=2, ge=0, description="Maximum background refreshes in flight"
+    )
+    cache_max_entries: int = Field(
+        default=1024, ge=1, description="Maximum number of cached answers"
+    )
+    cache_max_bytes: int = Field(
+        default=16 * 1024 * 1024,
+        ge=1,
+        description="Maximum total size of cached answers",
+    )
+    cache_max_stale_seconds: float = Field(
+        default=86400.0,
+        ge=0,
+        description="Seconds an expired answer may be served while the API is down",
+    )
+    cache_dir: str | None = Field(
+        default=None,
+        description=(
+            "Directory for the answer cache and rate limit state shared by all "
+            "server processes on the host (disabled if unset)"
+        ),
+    )
+    disk_cache_ttl_seconds: float = Field(
+        default=86400.0, gt=0, description="Seconds a persisted answer stays valid"
+    )
+    disk_cache_max_entries: int = Field(
+        default=10000, ge=1, description="Maximum number of persisted answers"
+    )
+    disk_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        ge=1,
+        description="Maximum total size of persisted answers",
+    )
+    semantic_cache_enabled: bool = Field(
+        default=False, description="Serve cached answers to paraphrased questions"
+    )
+    semantic_cache_threshold: float = Field(
+        default=0.85,
+        gt=0,
+        le=1,
+        description="Cosine similarity needed for a semantic hit",
+    )
+    semantic_cache_max_entries: int = Field(
+        default=100_000, ge=1, description="Questions indexed per user"
+    )
+    semantic_cache_dimensions: int = Field(
+        default=256, ge=16, description="Size of the hashed question vectors"
+    )
+    snapshot_path: str | None = Field(
+        default=None,
+        description="SQLite full-text snapshot for offline lookups (disabled if unset)",
+    )
+    snapshot_fast_path: bool = Field(
+        default=False, description="Answer from the snapshot before calling the API"
+    )
+    snapshot_record_answers: bool = Field(
+        default=True, description="Add every upstream answer to the snapshot"
+    )
+    prewarm_enabled: bool = Field(
+        default=False,
+        description="Fetch example question answers in the background at startup",
+    )
+    prewarm_file: str | None = Field(
+        default=None, description="Extra questions to prewarm, one per line"
+    )
+    prewarm_concurrency: int = Field(
+        default=2, ge=1, description="Maximum prewarm requests in flight"
+    )
+    answer_page_chars: int = Field(
+        default=20000, ge=0, description="Longest answer returned at once"
+    )
+    continuation_ttl_seconds: float = Field(
+        default=3600.0, gt=0, description="Seconds a continuation token stays valid"
+    )
+    continuation_max_entries: int = Field(
+        default=256, ge=1, description="Oversize answers kept for query_continue"
+    )
+    batch_concurrency: int = Field(
+        default=5, ge=1, description="Maximum upstream requests in flight per batch"
+    )
+    upstream_max_concurrency: int | None = Field(
+        default=None,
+        ge=1,
+        description="Maximum upstream requests in flight; ICAET_MAX_CONNECTIONS "
+        "if unset",
+    )
+    query_deadline_seconds: float = Field(
+        default=60.0, gt=0, description="Seconds a query tool call may take"
+    )
+    stream_answers: bool = Field(
+        default=True,
+        description="Relay streamed answers as MCP progress notifications",
+    )
+    retry_max_attempts: int = Field(
+        default=3, ge=1, description="Total attempts per request, including the first"
+    )
+    retry_backoff_base: float = Field(
+        default=0.2, ge=0, description="Initial retry backoff in seconds"
+    )
+    retry_backoff_max: float = Field(
+        default=5.0, ge=0, description="Maximum retry backoff in seconds"
+    )
+    retry_deadline_seconds: float = Field(
+        default=60.0, gt=0, description="No retry is started after this many seconds"
+    )
+    retry_budget_ratio: float = Field(
+        default=0.2, ge=0, description="Retries allowed per request across the process"
+    )
+    retry_budget_max_tokens: float = Field(
+        default=10.0, ge=0, description="Retry burst allowance across the process"
+    )
+    hedge_enabled: bool = Field(
+        default=False,
+        description="Send a duplicate request when the API is slower than usual",
+    )
+    hedge_percentile: float = Field(
+        default=95.0,
+        gt=0,
+        lt=100,
+        description="Percentile of recent response times to wait before hedging",
+    )
+    hedge_min_delay_seconds: float = Field(
+        default=0.1, ge=0, description="Shortest wait before hedging"
+    )
+    hedge_budget_ratio: float = Field(
+        default=0.05, ge=0, description="Hedged requests allowed per request"
+    )
+    hedge_budget_max_tokens: float = Field(
+        default=5.0, ge=0, description="Hedge burst allowance across the process"
+    )
+    breaker_failure_threshold: int = Field(
+        default=5, ge=1, description="Consecutive failures that open the circuit"
+    )
+    breaker_reset_timeout_seconds: float = Field(
+        default=30.0, gt=0, description="Seconds the circuit stays open"
+    )
+    breaker_half_open_max_calls: int = Field(
+        default=1, ge=1, description="Probe requests allowed while half-open"
+    )
+    rate_limit_per_second: float = Field(
+        default=0.0,
+        ge=0,
+        description="Client-side request rate limit per API key; 0 disables",
+    )
+    rate_limit_burst: int = Field(
+        default=5, ge=1, description="Requests allowed back to back before throttling"
+    )
+    rate_limit_max_wait_seconds: float = Field(
+        default=30.0, ge=0, description="Longest a request may queue for a slot"
+    )
+    metrics_port: int | None = Field(
+        default=None,
+        ge=0,
+        le=65535,
+        description="Serve Prometheus metrics on this port; disabled if unset",
+    )
+    metrics_host: str = Field(
+        default="127.0.0.1", description="Interface the metrics listener binds to"
+    )
+    trace_exporter: Literal["none", "console", "file"] = Field(
+        default="none", description="OpenTelemetry span exporter"
+    )
+    trace_file: str = Field(
+        default="icsaet-traces.jsonl",
+        description="JSON-lines file spans are appended to by the file exporter",
+    )
+    mcp_transport: Literal["stdio", "http", "sse"] = Field(
+        default="stdio", description="stdio for one client, or http/sse to serve many"
+    )
+    http_host: str = Field(
+        default="127.0.0.1", description="Interface the HTTP transport binds to"
+    )
+    http_port: int = Field(
+        default=8000, ge=0, le=65535, description="Port the HTTP transport listens on"
+    )
+    http_workers: int = Field(
+        default=1, ge=1, description="Server processes sharing the HTTP port"
+    )
+    client_max_concurrency: int = Field(
+        default=4, ge=0, description="Tool calls in flight per HTTP client"
+    )
+    shutdown_timeout_seconds: int = Field(
+        default=30,
+        ge=0,
+        description="Seconds in-flight HTTP requests get to finish on shutdown",
+    )
 
     @field_validator("icaet_api_key")
     @classmethod
@@ -31,6 +345,14 @@ class Settings(BaseSettings):
             raise ValueError("ICAET_API_KEY cannot be empty")
         return v
 
+    @field_validator("icaet_base_url")
+    @classmethod
+    def validate_base_url(cls, v: str) -> str:
+        """Validate base URL uses http or https."""
+        if not v.startswith(("http://", "https://")):
+            raise ValueError("ICAET_BASE_URL must start with http:// or https://")
+        return v.rstrip("/")
+
     @field_validator("user_email")
     @classmethod
     def validate_email_format(cls, v: str) -> str:
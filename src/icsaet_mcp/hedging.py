@@ -0,0 +1,225 @@
+"""Hedged ICAET API requests to cut tail latency."""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from icsaet_mcp.config import Settings
+from icsaet_mcp.metrics import UPSTREAM_HEDGES
+from icsaet_mcp.resilience import RetryBudget
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Recent response times kept for the hedge delay percentile
+LATENCY_WINDOW = 512
+# Responses needed before the percentile is trusted enough to hedge
+MIN_SAMPLES = 20
+
+# Called by an attempt before it has side effects (e.g. relaying a chunk)
+Commit = Callable[[], None]
+
+
+class LatencyTracker:
+    """Sliding window of recent upstream response times."""
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Add one response time."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> float | None:
+        """The q-th percentile (0-100) of the window, or None if too few samples."""
+        with self._lock:
+            if len(self._samples) < MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(math.ceil(q / 100 * len(ordered)), len(ordered)) - 1]
+
+
+class HedgePolicy:
+    """Send a duplicate request when the first is slower than usual.
+
+    The hedge delay is the percentile-th percentile of recent response
+    times (until success, or until a streamed answer starts), but at least
+    min_delay; nothing is hedged until MIN_SAMPLES responses have been
+    seen. Every call deposits ratio tokens in the budget and every hedge
+    withdraws one, so hedges add at most about ratio extra requests per
+    request.
+    """
+
+    def __init__(
+        self,
+        percentile: float,
+        min_delay: float,
+        budget: RetryBudget,
+        tracker: LatencyTracker | None = None,
+    ) -> None:
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.budget = budget
+        self.tracker = tracker or LatencyTracker()
+
+    def delay(self) -> float | None:
+        """Seconds to wait before hedging, or None to not hedge."""
+        observed = self.tracker.percentile(self.percentile)
+        return None if observed is None else max(observed, self.min_delay)
+
+    async def call(self, attempt: Callable[[Commit], Awaitable[T]]) -> T:
+        """Run attempt, racing a duplicate if it is slow.
+
+        The first attempt to succeed, or to call its commit callback,
+        wins and the other is cancelled. If one attempt fails while the
+        other is still running, the other's outcome is awaited; if both
+        fail, the first attempt's error is raised, so callers see the
+        same errors as without hedging.
+
+        Args:
+            attempt: Coroutine function making one request. It is passed
+                a commit callback to call before doing anything that must
+                not happen twice; commit raises CancelledError in the
+                attempt that lost the race.
+
+        Returns:
+            The winning attempt's result.
+        """
+        self.budget.deposit()
+        attempt = self._timed(attempt)
+        delay = self.delay()
+        if delay is None:
+            return await attempt(lambda: None)
+
+        tasks: list[asyncio.Task[T]] = []
+        committed: list[asyncio.Task[T]] = []
+
+        def start() -> None:
+            task: asyncio.Task[T]
+
+            def commit() -> None:
+                if committed and committed[0] is not task:
+                    raise asyncio.CancelledError()
+                if not committed:
+                    committed.append(task)
+                    for other in tasks:
+                        if other is not task:
+                            other.cancel()
+
+            task = asyncio.ensure_future(attempt(commit))
+            tasks.append(task)
+
+        start()
+        try:
+            await asyncio.wait(tasks, timeout=delay)
+            if not tasks[0].done() and not committed:
+                if self.budget.try_withdraw():
+                    logger.debug(f"Hedging ICAET request after {delay:.2f}s")
+                    UPSTREAM_HEDGES.inc(outcome="sent")
+                    start()
+                else:
+                    UPSTREAM_HEDGES.inc(outcome="skipped")
+            return await self._first_success(tasks, committed)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _timed(
+        self, attempt: Callable[[Commit], Awaitable[T]]
+    ) -> Callable[[Commit], Awaitable[T]]:
+        """Wrap attempt to record the time until it commits or succeeds."""
+
+        async def timed(commit: Commit) -> T:
+            start = time.monotonic()
+            recorded = False
+
+            def record() -> None:
+                nonlocal recorded
+                if not recorded:
+                    recorded = True
+                    self.tracker.record(time.monotonic() - start)
+
+            def timed_commit() -> None:
+                commit()
+                record()
+
+            result = await attempt(timed_commit)
+            record()
+            return result
+
+        return timed
+
+    async def _first_success(
+        self, tasks: list[asyncio.Task[T]], committed: list[asyncio.Task[T]]
+    ) -> T:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.cancelled():
+                    continue
+                error = task.exception()
+                if error is None:
+                    if task is not tasks[0]:
+                        UPSTREAM_HEDGES.inc(outcome="won")
+                    return task.result()
+                if committed and committed[0] is task:
+                    raise error
+        # Every attempt failed or lost; report the primary's outcome
+        return tasks[0].result()
+
+
+_hedge_policy: HedgePolicy | None = None
+_hedge_policy_lock = threading.Lock()
+
+
+def get_hedge_policy(settings: Settings) -> HedgePolicy | None:
+    """Get the process-wide HedgePolicy, or None if hedging is disabled.
+
+    Args:
+        settings: Server settings holding the hedging configuration.
+
+    Returns:
+        HedgePolicy | None: Shared policy with its latency window and budget
+    """
+    global _hedge_policy
+    if not settings.hedge_enabled:
+        return None
+    with _hedge_policy_lock:
+        if _hedge_policy is None:
+            _hedge_policy = HedgePolicy(
+                percentile=settings.hedge_percentile,
+                min_delay=settings.hedge_min_delay_seconds,
+                budget=RetryBudget(
+                    ratio=settings.hedge_budget_ratio,
+                    max_tokens=settings.hedge_budget_max_tokens,
+                ),
+            )
+        return _hedge_policy
+
+
+def reset_hedge_policy() -> None:
+    """Drop the process-wide HedgePolicy."""
+    global _hedge_policy
+    with _hedge_policy_lock:
+        _hedge_policy = None
+
+
+__all__ = [
+    "Commit",
+    "HedgePolicy",
+    "LatencyTracker",
+    "get_hedge_policy",
+    "reset_hedge_policy",
+]
@@ -0,0 +1,409 @@
+"""Prometheus-style metrics for the ICAET MCP server."""
+
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any
+
+from icsaet_mcp.config import Settings
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+LabelKey = tuple[tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)  # fmt: skip
+
+
+def _label_key(labels: dict[str, str]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: tuple[tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    body = ",".join(f'{name}="{value}"' for name, value in pairs)
+    return f"{{{body}}}"
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str) -> None:
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+
+    def render(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self._samples(),
+        ]
+
+    @abstractmethod
+    def _samples(self) -> list[str]:
+        """Sample lines in the Prometheus text format."""
+
+    @abstractmethod
+    def snapshot(self) -> dict[str, Any]:
+        """Current values keyed by rendered label set."""
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Drop all recorded values."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str) -> None:
+        super().__init__(name, documentation)
+        self._values: dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            return [
+                f"{self.name}{_format_labels(key)} {value:g}"
+                for key, value in sorted(self._values.items())
+            ]
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                _format_labels(key) or "total": value
+                for key, value in sorted(self._values.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_in_progress(self, **labels: str) -> Iterator[None]:
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket distribution of observed values per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts: dict[LabelKey, list[int]] = {}
+        self._sums: dict[LabelKey, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            return sum(self._counts.get(_label_key(labels), []))
+
+    def quantile(self, q: float, **labels: str) -> float:
+        """Estimate a quantile as the upper bound of the bucket holding it."""
+        with self._lock:
+            return self._quantile(self._counts.get(_label_key(labels), []), q)
+
+    def _quantile(self, counts: list[int], q: float) -> float:
+        total = sum(counts)
+        if total == 0:
+            return 0.0
+        running = 0
+        for bound, bucket_count in zip(self.buckets, counts, strict=True):
+            running += bucket_count
+            if running >= q * total:
+                return bound
+        return math.inf
+
+    def _samples(self) -> list[str]:
+        lines = []
+        with self._lock:
+            for key, counts in sorted(self._counts.items()):
+                running = 0
+                for bound, bucket_count in zip(self.buckets, counts, strict=True):
+                    running += bucket_count
+                    le = "+Inf" if math.isinf(bound) else f"{bound:g}"
+                    labels = _format_labels(key, (("le", le),))
+                    lines.append(f"{self.name}_bucket{labels} {running}")
+                lines.append(
+                    f"{self.name}_sum{_format_labels(key)} {self._sums[key]:g}"
+                )
+                lines.append(f"{self.name}_count{_format_labels(key)} {running}")
+        return lines
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            result = {}
+            for key, counts in sorted(self._counts.items()):
+                total = sum(counts)
+                result[_format_labels(key) or "total"] = {
+                    "count": total,
+                    "sum": round(self._sums[key], 6),
+                    "mean": round(self._sums[key] / total, 6),
+                    "p50": self._quantile(counts, 0.5),
+                    "p95": self._quantile(counts, 0.95),
+                    "p99": self._quantile(counts, 0.99),
+                }
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> dict[str, Any]:
+        """All metrics as a JSON-friendly dict, skipping empty ones."""
+        return {
+            metric.name: values
+            for metric in self._metrics
+            if (values := metric.snapshot())
+        }
+
+    def reset(self) -> None:
+        for metric in self._metrics:
+            metric.reset()
+
+
+REGISTRY = Registry()
+
+QUERY_SECONDS: Histogram = REGISTRY.register(
+    Histogram("icaet_query_seconds", "End-to-end query latency including cache")
+)
+QUERIES_IN_FLIGHT: Gauge = REGISTRY.register(
+    Gauge("icaet_queries_in_flight", "Queries currently being answered")
+)
+CACHE_LOOKUPS: Counter = REGISTRY.register(
+    Counter("icaet_cache_lookups_total", "Answer cache lookups by layer and result")
+)
+CACHE_REFRESHES: Counter = REGISTRY.register(
+    Counter("icaet_cache_refreshes_total", "Background answer refreshes by outcome")
+)
+UPSTREAM_SECONDS: Histogram = REGISTRY.register(
+    Histogram("icaet_upstream_request_seconds", "ICAET API request latency")
+)
+UPSTREAM_REQUESTS: Counter = REGISTRY.register(
+    Counter("icaet_upstream_requests_total", "ICAET API requests by status code")
+)
+UPSTREAM_IN_FLIGHT: Gauge = REGISTRY.register(
+    Gauge("icaet_upstream_in_flight", "ICAET API requests currently in flight")
+)
+UPSTREAM_BYTES_SENT: Counter = REGISTRY.register(
+    Counter("icaet_upstream_sent_bytes_total", "Request body bytes sent to ICAET")
+)
+UPSTREAM_BYTES_RECEIVED: Counter = REGISTRY.register(
+    Counter("icaet_upstream_received_bytes_total", "Response bytes from ICAET")
+)
+UPSTREAM_RETRIES: Counter = REGISTRY.register(
+    Counter("icaet_upstream_retries_total", "ICAET API retries by reason")
+)
+UPSTREAM_HEDGES: Counter = REGISTRY.register(
+    Counter("icaet_upstream_hedges_total", "Hedged ICAET API requests by outcome")
+)
+RATE_LIMIT_WAIT_SECONDS: Histogram = REGISTRY.register(
+    Histogram("icaet_rate_limit_wait_seconds", "Time queued by the rate limiter")
+)
+RATE_LIMIT_RATE: Gauge = REGISTRY.register(
+    Gauge("icaet_rate_limit_rate", "Current rate limit in requests per second")
+)
+
+
+@contextmanager
+def track_query(path: str) -> Iterator[None]:
+    """Time one query and count it as in flight.
+
+    Args:
+        path: "sync" or "async" query path, used as a label.
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        with QUERIES_IN_FLIGHT.track_in_progress(path=path):
+            yield
+        outcome = "ok"
+    finally:
+        QUERY_SECONDS.observe(time.perf_counter() - start, path=path, outcome=outcome)
+
+
+@contextmanager
+def track_upstream() -> Iterator[Callable[["httpx.Response"], None]]:
+    """Time one ICAET API request and record its status and sizes.
+
+    Yields a callback that must be given the response once it arrives;
+    requests that fail before a response are recorded with status "error".
+    """
+    responses: list[httpx.Response] = []
+    start = time.perf_counter()
+    try:
+        with UPSTREAM_IN_FLIGHT.track_in_progress():
+            yield responses.append
+    finally:
+        status = str(responses[0].status_code) if responses else "error"
+        UPSTREAM_SECONDS.observe(time.perf_counter() - start, status=status)
+        UPSTREAM_REQUESTS.inc(status=status)
+        if responses:
+            response = responses[0]
+            UPSTREAM_BYTES_SENT.inc(len(response.request.content))
+            UPSTREAM_BYTES_RECEIVED.inc(response.num_bytes_downloaded)
+
+
+class MetricsServer:
+    """Background HTTP listener serving GET /metrics."""
+
+    def __init__(self, host: str, port: int, registry: Registry = REGISTRY) -> None:
+        handler = _metrics_handler(registry)
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics", daemon=True
+        )
+
+    @property
+    def port(self) -> int:
+        return int(self._server.server_address[1])
+
+    def start(self) -> "MetricsServer":
+        self._thread.start()
+        logger.info(f"Serving metrics on port {self.port}")
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _metrics_handler(registry: Registry) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("content-type", "text/plain; version=0.0.4")
+            self.send_header("content-length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    return Handler
+
+
+_metrics_server: MetricsServer | None = None
+_metrics_server_lock = threading.Lock()
+
+
+def start_metrics_server(settings: Settings) -> MetricsServer | None:
+    """Start the process-wide metrics listener, or None if METRICS_PORT is unset.
+
+    Args:
+        settings: Server settings holding the listener configuration.
+
+    Returns:
+        MetricsServer | None: Running listener
+    """
+    global _metrics_server
+    if settings.metrics_port is None:
+        return None
+    with _metrics_server_lock:
+        if _metrics_server is None:
+            _metrics_server = MetricsServer(
+                settings.metrics_host, settings.metrics_port
+            ).start()
+        return _metrics_server
+
+
+def stop_metrics_server() -> None:
+    """Stop the process-wide metrics listener if one was started."""
+    global _metrics_server
+    with _metrics_server_lock:
+        if _metrics_server is not None:
+            _metrics_server.stop()
+            _metrics_server = None
+
+
+__all__ = [
+    "REGISTRY",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsServer",
+    "Registry",
+    "start_metrics_server",
+    "stop_metrics_server",
+    "track_query",
+    "track_upstream",
+]
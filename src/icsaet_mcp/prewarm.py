@@ -0,0 +1,212 @@
+"""Cache prewarming from the curated example questions."""
+
+import argparse
+import asyncio
+import logging
+import re
+import sys
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from icsaet_mcp.cache import close_disk_cache, normalize_question
+from icsaet_mcp.config import Settings, get_settings
+from icsaet_mcp.prompts import EXAMPLE_QUESTIONS, FORMATTING_GUIDANCE
+
+logger = logging.getLogger(__name__)
+
+# List items whose text is a quoted question, optionally after a check mark
+_QUOTED_ITEM = re.compile(r'^\s*-\s*(?:✓\s*)?"([^"]+)"', re.MULTILINE)
+
+
+def example_questions() -> list[str]:
+    """Extract the quoted example questions from the prompt texts.
+
+    Templates with placeholders such as "[Speaker Name]" are skipped.
+
+    Returns:
+        Questions from EXAMPLE_QUESTIONS and FORMATTING_GUIDANCE.
+    """
+    return [
+        question
+        for text in (EXAMPLE_QUESTIONS, FORMATTING_GUIDANCE)
+        for question in _QUOTED_ITEM.findall(text)
+        if "[" not in question
+    ]
+
+
+def read_question_file(path: str | Path) -> list[str]:
+    """Read one question per line, skipping blank lines and # comments.
+
+    Args:
+        path: Question list file.
+
+    Returns:
+        Questions in file order.
+    """
+    lines = Path(path).expanduser().read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+
+
+def unique_questions(questions: Iterable[str]) -> list[str]:
+    """Drop questions that normalize to one already seen, keeping order."""
+    seen: set[str] = set()
+    unique = []
+    for question in questions:
+        if (normalized := normalize_question(question)) not in seen:
+            seen.add(normalized)
+            unique.append(question)
+    return unique
+
+
+def prewarm_questions(settings: Settings, include_examples: bool = True) -> list[str]:
+    """Questions to prewarm: the examples plus PREWARM_FILE, deduplicated.
+
+    Args:
+        settings: Server settings holding the prewarm configuration.
+        include_examples: Whether to include the built-in examples.
+
+    Returns:
+        Unique questions in order.
+    """
+    questions = example_questions() if include_examples else []
+    if settings.prewarm_file:
+        questions += read_question_file(settings.prewarm_file)
+    return unique_questions(questions)
+
+
+@dataclass
+class PrewarmResult:
+    """Outcome of a prewarm run."""
+
+    warmed: int = 0
+    failed: dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+async def prewarm(
+    questions: list[str],
+    ask: Callable[[str], Awaitable[str]],
+    concurrency: int,
+) -> PrewarmResult:
+    """Ask questions concurrently so their answers land in the caches.
+
+    Failures are recorded, not raised, so one bad question never stops
+    the rest.
+
+    Args:
+        questions: Questions to ask.
+        ask: Coroutine function answering one question, e.g. query_icaet_async.
+        concurrency: Maximum questions in flight at once.
+
+    Returns:
+        Counts of warmed and failed questions and the elapsed time.
+    """
+    result = PrewarmResult()
+    semaphore = asyncio.Semaphore(concurrency)
+    start = time.monotonic()
+
+    async def warm(question: str) -> None:
+        async with semaphore:
+            try:
+                await ask(question)
+                result.warmed += 1
+            except (ValueError, RuntimeError) as e:
+                result.failed[question] = str(e)
+
+    await asyncio.gather(*(warm(question) for question in questions))
+    result.seconds = time.monotonic() - start
+    logger.info(
+        f"Prewarmed {result.warmed}/{len(questions)} answers in {result.seconds:.1f}s"
+    )
+    return result
+
+
+def start_prewarm(
+    settings: Settings, ask: Callable[[str], Awaitable[str]]
+) -> asyncio.Task[PrewarmResult] | None:
+    """Start prewarming in the background if PREWARM_ENABLED is set.
+
+    Args:
+        settings: Server settings holding the prewarm configuration.
+        ask: Coroutine function answering one question.
+
+    Returns:
+        The running task, to be cancelled at shutdown, or None.
+    """
+    if not settings.prewarm_enabled:
+        return None
+    try:
+        questions = prewarm_questions(settings)
+    except OSError as e:
+        logger.warning(f"Cannot read PREWARM_FILE: {e}")
+        return None
+    logger.info(f"Prewarming {len(questions)} answers in the background")
+    return asyncio.create_task(
+        prewarm(questions, ask, settings.prewarm_concurrency), name="prewarm"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Prewarm the answer caches from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m icsaet_mcp.prewarm",
+        description="Fetch answers to the example questions (and PREWARM_FILE) "
+        "so they are cached; set CACHE_DIR to keep them for the server.",
+    )
+    parser.add_argument("files", nargs="*", type=Path, help="question list files")
+    parser.add_argument(
+        "--no-examples", action="store_true", help="skip the built-in examples"
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    try:
+        settings = get_settings()
+    except ValidationError:
+        print("Error: set ICAET_API_KEY and USER_EMAIL", file=sys.stderr)
+        return 1
+
+    # Imported here because tools imports this module for its lifespan
+    from icsaet_mcp.client import close_async_client
+    from icsaet_mcp.scheduler import Priority
+    from icsaet_mcp.tools import query_icaet_async
+
+    questions = prewarm_questions(settings, include_examples=not args.no_examples)
+    for path in args.files:
+        questions += read_question_file(path)
+
+    async def run() -> PrewarmResult:
+        try:
+            return await prewarm(
+                unique_questions(questions),
+                partial(query_icaet_async, priority=Priority.BACKGROUND),
+                settings.prewarm_concurrency,
+            )
+        finally:
+            await close_async_client()
+            close_disk_cache()
+
+    result = asyncio.run(run())
+    for question, error in result.failed.items():
+        print(f"Failed: {question}: {error}", file=sys.stderr)
+    return 1 if result.failed else 0
+
+
+__all__ = [
+    "PrewarmResult",
+    "example_questions",
+    "prewarm",
+    "prewarm_questions",
+    "read_question_file",
+    "start_prewarm",
+    "unique_questions",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
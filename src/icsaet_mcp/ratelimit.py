@@ -0,0 +1,350 @@
+"""Client-side rate limiting for the shared ICAET API key."""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, TypeVar
+
+from icsaet_mcp.config import Settings
+from icsaet_mcp.metrics import RATE_LIMIT_RATE, RATE_LIMIT_WAIT_SECONDS
+from icsaet_mcp.resilience import parse_retry_after
+from icsaet_mcp.storage import immediate_transaction, open_shared_db
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Epoch timestamps are far larger than any plausible reset delay
+_EPOCH_THRESHOLD = 1_000_000_000
+
+
+class RateLimitExceededError(RuntimeError):
+    """Raised when a request would queue longer than the allowed wait."""
+
+    def __init__(self, retry_in: float) -> None:
+        self.retry_in = retry_in
+        super().__init__(
+            "The ICAET API rate limit for this API key has been reached. "
+            f"Please try again in {math.ceil(retry_in)} seconds."
+        )
+
+
+def parse_rate_limit_headers(
+    response: "httpx.Response",
+) -> tuple[int | None, float | None]:
+    """Parse remaining-request and reset headers.
+
+    Understands both RateLimit-Remaining/RateLimit-Reset and the
+    X-RateLimit-* variants; reset may be a delay in seconds or a Unix
+    timestamp.
+
+    Args:
+        response: Response that may carry rate limit headers.
+
+    Returns:
+        Tuple of (remaining requests, seconds until the window resets);
+        either is None if missing or invalid.
+    """
+    headers = response.headers
+    remaining_value = headers.get("ratelimit-remaining") or headers.get(
+        "x-ratelimit-remaining"
+    )
+    reset_value = headers.get("ratelimit-reset") or headers.get("x-ratelimit-reset")
+    remaining: int | None = None
+    reset: float | None = None
+    try:
+        remaining = int(remaining_value) if remaining_value is not None else None
+    except ValueError:
+        pass
+    try:
+        reset = float(reset_value) if reset_value is not None else None
+    except ValueError:
+        pass
+    if reset is not None and reset > _EPOCH_THRESHOLD:
+        reset -= time.time()
+    if reset is not None:
+        reset = max(reset, 0.0)
+    return remaining, reset
+
+
+class TokenBucket:
+    """Token bucket that queues requests until a slot is free.
+
+    Tokens refill at rate per second up to burst. Each request reserves
+    one token; when none are available the caller sleeps until its turn,
+    so waiting callers are released in order at the bucket's rate
+    instead of failing. A rate of 0 means unlimited, but the bucket still
+    pauses all requests while the API asks clients to back off.
+
+    The rate adapts to the API: a 429 halves it (down to min_rate_ratio
+    of the configured rate) and pauses requests for Retry-After, rate
+    limit headers cap it at the remaining quota for the current window,
+    and each unthrottled response recovers it by recovery_ratio of the
+    configured rate.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        max_wait: float,
+        min_rate_ratio: float = 0.1,
+        recovery_ratio: float = 0.05,
+        default_backoff: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.configured_rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.min_rate_ratio = min_rate_ratio
+        self.recovery_ratio = recovery_ratio
+        self.default_backoff = default_backoff
+        self._clock = clock
+        self._rate = rate
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Current requests per second; 0 means unlimited."""
+        with self._state():
+            return self._rate
+
+    def reserve(self) -> float:
+        """Claim the next request slot.
+
+        Returns:
+            Seconds to wait before sending the request.
+
+        Raises:
+            RateLimitExceededError: If the wait would exceed max_wait; no
+                slot is claimed in that case.
+        """
+        with self._state():
+            now = self._clock()
+            self._refill(now)
+            wait = max(self._blocked_until - now, 0.0)
+            if self._rate > 0 and self._tokens < 1.0:
+                wait += (1.0 - self._tokens) / self._rate
+            if wait > self.max_wait:
+                raise RateLimitExceededError(wait)
+            if self._rate > 0:
+                self._tokens -= 1.0
+        RATE_LIMIT_WAIT_SECONDS.observe(wait)
+        return wait
+
+    def acquire(self, sleep: Callable[[float], None] = time.sleep) -> None:
+        """Wait for a request slot."""
+        if (wait := self.reserve()) > 0:
+            sleep(wait)
+
+    async def acquire_async(
+        self, sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ) -> None:
+        """Wait for a request slot without blocking the event loop."""
+        if (wait := await self._run_async(self.reserve)) > 0:
+            await sleep(wait)
+
+    def observe(self, response: "httpx.Response") -> None:
+        """Adapt the rate to a response's status and rate limit headers."""
+        if response.status_code == 429:
+            delay = parse_retry_after(response)
+            with self._state():
+                if delay is None:
+                    delay = 1.0 / self._rate if self._rate > 0 else self.default_backoff
+                self._block(self._clock() + delay)
+                if self.configured_rate > 0:
+                    floor = self.configured_rate * self.min_rate_ratio
+                    self._rate = max(self._rate / 2, floor)
+                rate = self._rate
+            logger.warning(
+                f"ICAET API rate limited; pausing {delay:.1f}s at {rate:g} req/s"
+            )
+            RATE_LIMIT_RATE.set(rate)
+            return
+
+        remaining, reset = parse_rate_limit_headers(response)
+        with self._state():
+            if remaining is not None and reset is not None:
+                if remaining <= 0:
+                    self._block(self._clock() + reset)
+                elif self.configured_rate > 0 and reset > 0:
+                    self._rate = min(self.configured_rate, remaining / reset)
+            elif self._rate < self.configured_rate:
+                self._rate = min(
+                    self.configured_rate,
+                    self._rate + self.configured_rate * self.recovery_ratio,
+                )
+            rate = self._rate
+        RATE_LIMIT_RATE.set(rate)
+
+    async def observe_async(self, response: "httpx.Response") -> None:
+        """Like observe, without blocking the event loop."""
+        await self._run_async(self.observe, response)
+
+    async def _run_async(self, function: Callable[..., T], *args: object) -> T:
+        # In-memory updates are quick enough to run on the event loop
+        return function(*args)
+
+    @contextmanager
+    def _state(self) -> Iterator[None]:
+        with self._lock:
+            yield
+
+    def _refill(self, now: float) -> None:
+        start = max(self._updated, self._blocked_until)
+        if self._rate > 0 and now > start:
+            self._tokens = min(self.burst, self._tokens + (now - start) * self._rate)
+        self._updated = max(self._updated, now)
+
+    def _block(self, until: float) -> None:
+        self._refill(self._clock())
+        self._blocked_until = max(self._blocked_until, until)
+        self._tokens = min(self._tokens, 0.0)
+
+
+class SharedTokenBucket(TokenBucket):
+    """TokenBucket whose state lives in a SQLite file shared across processes.
+
+    Every server process on the host that points at the same directory
+    draws from one bucket, so together they stay within the API key's
+    quota, and a 429 seen by one process pauses all of them. Each update
+    runs in an IMMEDIATE transaction on a WAL database, which serializes
+    processes without blocking readers. Uses wall-clock time, since
+    monotonic clocks are not comparable between processes.
+    """
+
+    FILENAME = "ratelimit.sqlite3"
+
+    def __init__(
+        self,
+        directory: str | Path,
+        rate: float,
+        burst: int,
+        max_wait: float,
+        min_rate_ratio: float = 0.1,
+        recovery_ratio: float = 0.05,
+        default_backoff: float = 1.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__(
+            rate,
+            burst,
+            max_wait,
+            min_rate_ratio=min_rate_ratio,
+            recovery_ratio=recovery_ratio,
+            default_backoff=default_backoff,
+            clock=clock,
+        )
+        self.path = Path(directory).expanduser() / self.FILENAME
+        self._conn = open_shared_db(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS bucket ("
+            "id INTEGER PRIMARY KEY CHECK (id = 1), tokens REAL NOT NULL, "
+            "updated REAL NOT NULL, blocked_until REAL NOT NULL, rate REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "INSERT OR IGNORE INTO bucket VALUES (1, ?, ?, 0, ?)",
+            (self._tokens, self._updated, self._rate),
+        )
+        # A rate adapted under an older configuration must not exceed this one
+        self._conn.execute(
+            "UPDATE bucket SET rate = CASE WHEN ? = 0 OR rate = 0 THEN ? "
+            "ELSE MIN(rate, ?) END WHERE id = 1",
+            (rate, rate, rate),
+        )
+
+    async def _run_async(self, function: Callable[..., T], *args: object) -> T:
+        # Transactions can wait up to the busy timeout on other processes
+        return await asyncio.to_thread(function, *args)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _state(self) -> Iterator[None]:
+        with self._lock, immediate_transaction(self._conn):
+            self._tokens, self._updated, self._blocked_until, self._rate = (
+                self._conn.execute(
+                    "SELECT tokens, updated, blocked_until, rate "
+                    "FROM bucket WHERE id = 1"
+                ).fetchone()
+            )
+            yield
+            self._conn.execute(
+                "UPDATE bucket SET tokens = ?, updated = ?, blocked_until = ?, "
+                "rate = ? WHERE id = 1",
+                (self._tokens, self._updated, self._blocked_until, self._rate),
+            )
+
+
+_rate_limiter: TokenBucket | None = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter(settings: Settings) -> TokenBucket:
+    """Get the process-wide TokenBucket shared by all clients.
+
+    When CACHE_DIR and RATE_LIMIT_PER_SECOND are both set the bucket is
+    a SharedTokenBucket in that directory, shared with every other server
+    process using it. Without a rate there is nothing to share, so each
+    process keeps its own in-memory bucket to honor 429 back-off.
+
+    Args:
+        settings: Server settings holding the rate limit configuration.
+
+    Returns:
+        TokenBucket: Shared rate limiter
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if (
+            _rate_limiter is None
+            and settings.cache_dir
+            and settings.rate_limit_per_second > 0
+        ):
+            _rate_limiter = SharedTokenBucket(
+                settings.cache_dir,
+                rate=settings.rate_limit_per_second,
+                burst=settings.rate_limit_burst,
+                max_wait=settings.rate_limit_max_wait_seconds,
+            )
+            logger.info(f"Sharing rate limit state via {_rate_limiter.path}")
+        elif _rate_limiter is None:
+            _rate_limiter = TokenBucket(
+                rate=settings.rate_limit_per_second,
+                burst=settings.rate_limit_burst,
+                max_wait=settings.rate_limit_max_wait_seconds,
+            )
+        return _rate_limiter
+
+
+def reset_rate_limiter() -> None:
+    """Drop the process-wide TokenBucket, closing a shared bucket's database."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if isinstance(_rate_limiter, SharedTokenBucket):
+            _rate_limiter.close()
+        _rate_limiter = None
+
+
+__all__ = [
+    "RateLimitExceededError",
+    "SharedTokenBucket",
+    "TokenBucket",
+    "get_rate_limiter",
+    "parse_rate_limit_headers",
+    "reset_rate_limiter",
+]
@@ -0,0 +1,156 @@
+"""Background refresh of cached answers past their soft TTL."""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from icsaet_mcp.config import Settings
+from icsaet_mcp.metrics import CACHE_REFRESHES
+
+logger = logging.getLogger(__name__)
+
+# What a refresh fails with when the API or the disk cache does: the
+# clients report upstream failures, httpx errors included, as RuntimeError
+_REFRESH_ERRORS = (RuntimeError, sqlite3.Error)
+
+
+class BackgroundRefresher:
+    """Run cache refreshes off the request path, at most max_concurrency at once.
+
+    A refresh is skipped rather than queued when one is already running
+    for the same key or max_concurrency refreshes are in flight; the
+    cached answer keeps being served and the next hit tries again.
+    API and disk cache failures are logged and counted, never raised to
+    the caller.
+
+    Only the memory cache tracks the soft TTL. Answers read from the disk
+    cache are copied into memory and refreshed once that copy passes it,
+    so without the memory cache disk hits are never refreshed early.
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        self.max_concurrency = max_concurrency
+        self._keys: set[str] = set()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._lock = threading.Lock()
+
+    def in_flight(self) -> int:
+        """Number of refreshes currently running."""
+        with self._lock:
+            return len(self._keys)
+
+    def submit(self, key: str, refresh: Callable[[], Any]) -> bool:
+        """Run refresh in a background thread.
+
+        Args:
+            key: Cache key being refreshed.
+            refresh: Function fetching and storing a new answer.
+
+        Returns:
+            True if the refresh was started.
+        """
+        if not self._claim(key):
+            return False
+        threading.Thread(
+            target=self._run, args=(key, refresh), name="icsaet-refresh", daemon=True
+        ).start()
+        return True
+
+    def submit_async(self, key: str, refresh: Callable[[], Awaitable[Any]]) -> bool:
+        """Run refresh as a task on the running event loop.
+
+        Args:
+            key: Cache key being refreshed.
+            refresh: Coroutine function fetching and storing a new answer.
+
+        Returns:
+            True if the refresh was started.
+        """
+        if not self._claim(key):
+            return False
+        task = asyncio.create_task(self._run_async(key, refresh))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def aclose(self) -> None:
+        """Cancel refreshes running on the current event loop."""
+        tasks = [task for task in self._tasks if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _claim(self, key: str) -> bool:
+        with self._lock:
+            if key in self._keys or len(self._keys) >= self.max_concurrency:
+                CACHE_REFRESHES.inc(outcome="skipped")
+                return False
+            self._keys.add(key)
+            return True
+
+    def _release(self, key: str) -> None:
+        with self._lock:
+            self._keys.discard(key)
+
+    def _run(self, key: str, refresh: Callable[[], Any]) -> None:
+        try:
+            refresh()
+        except _REFRESH_ERRORS as e:
+            logger.warning(f"Background answer refresh failed: {e}")
+            CACHE_REFRESHES.inc(outcome="error")
+        else:
+            CACHE_REFRESHES.inc(outcome="ok")
+        finally:
+            self._release(key)
+
+    async def _run_async(self, key: str, refresh: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await refresh()
+        except _REFRESH_ERRORS as e:
+            logger.warning(f"Background answer refresh failed: {e}")
+            CACHE_REFRESHES.inc(outcome="error")
+        else:
+            CACHE_REFRESHES.inc(outcome="ok")
+        finally:
+            self._release(key)
+
+
+_refresher: BackgroundRefresher | None = None
+_refresher_lock = threading.Lock()
+
+
+def get_refresher(settings: Settings) -> BackgroundRefresher | None:
+    """Get the process-wide BackgroundRefresher, or None if refreshing is off.
+
+    Args:
+        settings: Server settings holding CACHE_REFRESH_CONCURRENCY.
+
+    Returns:
+        BackgroundRefresher | None: Shared refresher
+    """
+    global _refresher
+    if settings.cache_refresh_concurrency <= 0:
+        return None
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = BackgroundRefresher(settings.cache_refresh_concurrency)
+        return _refresher
+
+
+async def close_refresher() -> None:
+    """Cancel running refreshes and drop the process-wide refresher."""
+    global _refresher
+    with _refresher_lock:
+        refresher, _refresher = _refresher, None
+    if refresher is not None:
+        await refresher.aclose()
+
+
+__all__ = [
+    "BackgroundRefresher",
+    "close_refresher",
+    "get_refresher",
+]
@@ -0,0 +1,468 @@
+"""Retry policy, retry budget and circuit breaker for the ICAET API."""
+
+import asyncio
+import logging
+import math
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from typing import Any, TypeVar
+
+import httpx
+
+from icsaet_mcp.config import Settings
+from icsaet_mcp.metrics import UPSTREAM_RETRIES
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+def is_retryable(error: httpx.HTTPError) -> bool:
+    """Whether an httpx error is a transient failure worth retrying.
+
+    Timeouts, connection errors/resets and 429/502/503/504 responses are
+    retryable; other status codes (e.g. 400, 401, 500) are not.
+
+    Args:
+        error: Error raised by httpx.
+
+    Returns:
+        True if the request may be retried.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(
+        error,
+        httpx.TimeoutException | httpx.NetworkError | httpx.RemoteProtocolError,
+    )
+
+
+def parse_retry_after(response: httpx.Response) -> float | None:
+    """Parse a Retry-After header given in seconds or as an HTTP date.
+
+    Args:
+        response: Response that may carry a Retry-After header.
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid.
+    """
+    value = response.headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - datetime.now(UTC)).total_seconds(), 0.0)
+
+
+class RetryBudget:
+    """Process-wide cap on retries so failures are never amplified.
+
+    Every first attempt deposits ratio tokens and every retry withdraws
+    one, so during an outage retries stay at roughly ratio times the
+    request rate. The balance starts at, and is capped by, max_tokens.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float) -> None:
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        """Record a first attempt."""
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, self.max_tokens)
+
+    def try_withdraw(self) -> bool:
+        """Take one retry token, returning False if the budget is spent."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def tokens(self) -> float:
+        """Current balance."""
+        with self._lock:
+            return self._tokens
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by a per-call deadline."""
+
+    max_attempts: int
+    backoff_base: float
+    backoff_max: float
+    deadline: float
+    budget: RetryBudget
+
+    @classmethod
+    def from_settings(cls, settings: Settings, budget: RetryBudget) -> "RetryPolicy":
+        """Build a policy from settings, sharing the given retry budget."""
+        return cls(
+            max_attempts=settings.retry_max_attempts,
+            backoff_base=settings.retry_backoff_base,
+            backoff_max=settings.retry_backoff_max,
+            deadline=settings.retry_deadline_seconds,
+            budget=budget,
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered delay before retry number attempt (1-based)."""
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def next_delay(
+        self,
+        error: httpx.HTTPError,
+        attempt: int,
+        elapsed: float,
+        remaining: float | None = None,
+    ) -> float | None:
+        """Decide whether to retry after a failed attempt.
+
+        Args:
+            error: Error raised by the failed attempt.
+            attempt: Number of attempts made so far.
+            elapsed: Seconds since the first attempt started.
+            remaining: Seconds left before the request's own deadline, if any.
+
+        Returns:
+            Seconds to sleep before retrying, or None to give up.
+        """
+        if attempt >= self.max_attempts or not is_retryable(error):
+            return None
+        delay = self.backoff(attempt)
+        if isinstance(error, httpx.HTTPStatusError):
+            retry_after = parse_retry_after(error.response)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+        if elapsed + delay >= self.deadline:
+            logger.warning("Not retrying: per-call deadline would be exceeded")
+            return None
+        if remaining is not None and delay >= remaining:
+            logger.warning("Not retrying: request deadline would be exceeded")
+            return None
+        if not self.budget.try_withdraw():
+            logger.warning("Not retrying: retry budget exhausted")
+            return None
+        if isinstance(error, httpx.HTTPStatusError):
+            UPSTREAM_RETRIES.inc(reason=str(error.response.status_code))
+        else:
+            UPSTREAM_RETRIES.inc(reason=type(error).__name__)
+        return delay
+
+    def call(
+        self,
+        fn: Callable[[], T],
+        sleep: Callable[[float], None] = time.sleep,
+        deadline: float | None = None,
+    ) -> T:
+        """Call fn, retrying transient httpx errors.
+
+        No retry is started that would end after deadline, a
+        time.monotonic() value.
+
+        Raises:
+            httpx.HTTPError: The last error once retries are exhausted.
+        """
+        self.budget.deposit()
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return fn()
+            except httpx.HTTPError as e:
+                now = time.monotonic()
+                remaining = None if deadline is None else deadline - now
+                delay = self.next_delay(e, attempt, now - start, remaining)
+                if delay is None:
+                    raise
+                logger.warning(
+                    f"Retrying ICAET request in {delay:.2f}s "
+                    f"(attempt {attempt + 1}/{self.max_attempts}): {e!r}"
+                )
+                sleep(delay)
+
+    async def call_async(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        deadline: float | None = None,
+    ) -> T:
+        """Async variant of call."""
+        self.budget.deposit()
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await fn()
+            except httpx.HTTPError as e:
+                now = time.monotonic()
+                remaining = None if deadline is None else deadline - now
+                delay = self.next_delay(e, attempt, now - start, remaining)
+                if delay is None:
+                    raise
+                logger.warning(
+                    f"Retrying ICAET request in {delay:.2f}s "
+                    f"(attempt {attempt + 1}/{self.max_attempts}): {e!r}"
+                )
+                await sleep(delay)
+
+
+def is_outage(error: httpx.HTTPError) -> bool:
+    """Whether an error suggests the API itself is unhealthy.
+
+    Transport failures and 5xx responses count against the circuit
+    breaker; 4xx responses (bad input, auth, rate limiting) prove the API
+    is reachable and do not.
+
+    Args:
+        error: Error raised by httpx.
+
+    Returns:
+        True if the error should count as a breaker failure.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return True
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the API while the circuit breaker is open."""
+
+    def __init__(self, retry_in: float) -> None:
+        self.retry_in = retry_in
+        super().__init__(
+            "The ICAET API is temporarily unavailable. "
+            f"Please try again in {math.ceil(retry_in)} seconds."
+        )
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail fast while the ICAET API is down.
+
+    After failure_threshold consecutive outage failures the circuit opens
+    and calls fail immediately with CircuitOpenError. Once reset_timeout
+    seconds have passed it turns half-open and lets up to
+    half_open_max_calls probe requests through: a successful probe closes
+    the circuit, a failed one opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half-open once due."""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def snapshot(self) -> dict[str, Any]:
+        """Breaker state for status reporting."""
+        with self._lock:
+            self._maybe_half_open()
+            retry_in = 0.0
+            if self._state is CircuitState.OPEN:
+                retry_in = self._opened_at + self.reset_timeout - self._clock()
+            return {
+                "state": self._state.value,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "retry_in_seconds": round(max(retry_in, 0.0), 1),
+            }
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """Run one API call under the breaker.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or all half-open probe
+                slots are taken.
+        """
+        self._acquire()
+        try:
+            yield
+        except httpx.HTTPError as e:
+            if is_outage(e):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        except BaseException:
+            self._release_probe()
+            raise
+        else:
+            self.record_success()
+
+    def record_success(self) -> None:
+        """Record a call that reached a healthy API."""
+        with self._lock:
+            if self._state is not CircuitState.CLOSED:
+                logger.info("Circuit breaker closed: ICAET API recovered")
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self) -> None:
+        """Record an outage failure, opening the circuit if needed."""
+        with self._lock:
+            self._failures += 1
+            if (
+                self._state is CircuitState.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                if self._state is not CircuitState.OPEN:
+                    logger.warning(
+                        f"Circuit breaker opened after {self._failures} "
+                        f"consecutive failures; failing fast for "
+                        f"{self.reset_timeout:.0f}s"
+                    )
+                self._state = CircuitState.OPEN
+                self._opened_at = self._clock()
+                self._probes = 0
+
+    def _acquire(self) -> None:
+        with self._lock:
+            self._maybe_half_open()
+            if self._state is CircuitState.OPEN:
+                raise CircuitOpenError(
+                    self._opened_at + self.reset_timeout - self._clock()
+                )
+            if self._state is CircuitState.HALF_OPEN:
+                if self._probes >= self.half_open_max_calls:
+                    raise CircuitOpenError(0.0)
+                self._probes += 1
+
+    def _release_probe(self) -> None:
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def _maybe_half_open(self) -> None:
+        if (
+            self._state is CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._probes = 0
+            logger.info("Circuit breaker half-open: probing ICAET API")
+
+
+_retry_budget: RetryBudget | None = None
+_shared_lock = threading.Lock()
+
+
+def get_retry_budget(settings: Settings) -> RetryBudget:
+    """Get the process-wide RetryBudget shared by all clients.
+
+    Args:
+        settings: Server settings holding the budget configuration.
+
+    Returns:
+        RetryBudget: Shared budget instance
+    """
+    global _retry_budget
+    with _shared_lock:
+        if _retry_budget is None:
+            _retry_budget = RetryBudget(
+                ratio=settings.retry_budget_ratio,
+                max_tokens=settings.retry_budget_max_tokens,
+            )
+        return _retry_budget
+
+
+def reset_retry_budget() -> None:
+    """Drop the process-wide RetryBudget."""
+    global _retry_budget
+    with _shared_lock:
+        _retry_budget = None
+
+
+_circuit_breaker: CircuitBreaker | None = None
+
+
+def get_circuit_breaker(settings: Settings) -> CircuitBreaker:
+    """Get the process-wide CircuitBreaker shared by all clients.
+
+    Args:
+        settings: Server settings holding the breaker configuration.
+
+    Returns:
+        CircuitBreaker: Shared breaker instance
+    """
+    global _circuit_breaker
+    with _shared_lock:
+        if _circuit_breaker is None:
+            _circuit_breaker = CircuitBreaker(
+                failure_threshold=settings.breaker_failure_threshold,
+                reset_timeout=settings.breaker_reset_timeout_seconds,
+                half_open_max_calls=settings.breaker_half_open_max_calls,
+            )
+        return _circuit_breaker
+
+
+def reset_circuit_breaker() -> None:
+    """Drop the process-wide CircuitBreaker."""
+    global _circuit_breaker
+    with _shared_lock:
+        _circuit_breaker = None
+
+
+__all__ = [
+    "RETRYABLE_STATUS_CODES",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "CircuitState",
+    "RetryBudget",
+    "RetryPolicy",
+    "get_circuit_breaker",
+    "get_retry_budget",
+    "is_outage",
+    "is_retryable",
+    "parse_retry_after",
+    "reset_circuit_breaker",
+    "reset_retry_budget",
+]
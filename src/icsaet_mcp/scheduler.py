@@ -0,0 +1,179 @@
+"""Priority scheduling and deadlines for upstream ICAET requests."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import threading
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from enum import IntEnum
+
+from icsaet_mcp.config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Request classes, admitted lowest value first."""
+
+    INTERACTIVE = 0
+    BATCH = 1
+    BACKGROUND = 2
+
+
+class DeadlineExceededError(RuntimeError):
+    """Raised when a query does not finish before its deadline."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            "The ICAET query did not finish in time. Please try again or ask "
+            "a more specific question."
+        )
+
+
+def deadline_after(seconds: float | None) -> float | None:
+    """Absolute time.monotonic() deadline seconds from now, or None."""
+    return None if seconds is None else time.monotonic() + seconds
+
+
+def time_left(deadline: float | None) -> float | None:
+    """Seconds until deadline, or None if there is none.
+
+    Raises:
+        DeadlineExceededError: If the deadline has passed.
+    """
+    if deadline is None:
+        return None
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceededError()
+    return left
+
+
+@asynccontextmanager
+async def deadline_scope(deadline: float | None) -> AsyncIterator[None]:
+    """Cancel the enclosed block at deadline, raising DeadlineExceededError.
+
+    Cancelling the block aborts the upstream request it is awaiting.
+    """
+    if deadline is None:
+        yield
+        return
+    try:
+        async with asyncio.timeout(time_left(deadline)):
+            yield
+    except TimeoutError as e:
+        raise DeadlineExceededError() from e
+
+
+class RequestScheduler:
+    """Admit upstream requests max_concurrency at a time, by priority.
+
+    When every slot is taken, requests wait in a queue ordered by
+    priority class, then earliest deadline, then arrival. A waiter that
+    is cancelled (e.g. the MCP client gave up) or times out leaves the
+    queue without taking a slot. Slots belong to one event loop.
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        self.max_concurrency = max_concurrency
+        self._active = 0
+        self._waiters: list[tuple[int, float, int, asyncio.Future[None]]] = []
+        self._order = itertools.count()
+
+    def active(self) -> int:
+        """Number of admitted requests holding a slot."""
+        return self._active
+
+    def queued(self) -> int:
+        """Number of requests waiting for a slot."""
+        return sum(1 for *_, waiter in self._waiters if not waiter.done())
+
+    @asynccontextmanager
+    async def slot(
+        self, priority: Priority, deadline: float | None = None
+    ) -> AsyncIterator[None]:
+        """Hold a slot for the enclosed upstream request.
+
+        Args:
+            priority: Request class.
+            deadline: time.monotonic() deadline, used to order waiters of
+                the same class.
+        """
+        await self._acquire(priority, deadline)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: Priority, deadline: float | None) -> None:
+        if self._active < self.max_concurrency and not self.queued():
+            self._active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        order = (int(priority), math.inf if deadline is None else deadline)
+        heapq.heappush(self._waiters, (*order, next(self._order), waiter))
+        logger.debug(f"Queued {priority.name.lower()} request behind {self._active}")
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # Handed a slot just as the wait was cancelled
+                self._release()
+            else:
+                waiter.cancel()
+            raise
+
+    def _release(self) -> None:
+        while self._waiters:
+            *_, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                # The slot passes straight to the next waiter
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+
+_scheduler: RequestScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler(settings: Settings) -> RequestScheduler:
+    """Get the process-wide RequestScheduler.
+
+    Args:
+        settings: Server settings holding UPSTREAM_MAX_CONCURRENCY, which
+            defaults to the connection pool size ICAET_MAX_CONNECTIONS.
+
+    Returns:
+        RequestScheduler: Shared scheduler
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler(
+                settings.upstream_max_concurrency or settings.icaet_max_connections
+            )
+        return _scheduler
+
+
+def reset_scheduler() -> None:
+    """Drop the process-wide RequestScheduler."""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = None
+
+
+__all__ = [
+    "DeadlineExceededError",
+    "Priority",
+    "RequestScheduler",
+    "deadline_after",
+    "deadline_scope",
+    "get_scheduler",
+    "reset_scheduler",
+    "time_left",
+]
@@ -0,0 +1,376 @@
+"""Semantic near-duplicate answer cache for paraphrased questions."""
+
+import importlib.util
+import logging
+import re
+import threading
+import time
+import zlib
+from collections.abc import Callable
+from typing import Any
+
+from icsaet_mcp.cache import normalize_question
+from icsaet_mcp.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Words that carry no topic, so "What did X talk about" and "X's talk
+# topics" are compared on what they are actually about. Includes
+# conference filler ("talk", "session", ...) that nearly every question uses.
+# Question words are compared separately, by question_intent.
+STOPWORDS = frozenset({
+    "a", "about", "an", "and", "any", "are", "as", "at", "be", "by", "can", "could",
+    "did", "do", "does", "for", "from", "give", "how", "i", "in", "is", "it", "me",
+    "of", "on", "or", "please", "tell", "than", "that", "the", "their", "there",
+    "these", "this", "to", "was", "were", "what", "when", "where", "which", "who",
+    "whom", "why", "with", "would", "you",
+    "cover", "covered", "covers", "discuss", "discussed", "present", "presentation",
+    "presentations", "presented", "session", "sessions", "speak", "speaker",
+    "speakers", "spoke", "talk", "talked", "talks", "topic", "topics",
+})  # fmt: skip
+CHAR_NGRAM = 3
+CHAR_NGRAM_WEIGHT = 0.5
+
+# Question words that ask for a different kind of answer than "what";
+# "which" and questions without a question word ask about content too
+INTENTS = ("", "who", "when", "where", "why", "how")
+_INTENT_WORDS = {
+    "what": "",
+    "which": "",
+    "who": "who",
+    "whom": "who",
+    "whose": "who",
+    "when": "when",
+    "where": "where",
+    "why": "why",
+    "how": "how",
+}
+
+# Stored vectors are fixed point: components scaled by FIXED_POINT_SCALE
+# and rounded to int16. Components are at most FIXED_POINT_SCALE, so the
+# product of two fits int16 exactly; scores are summed in int32 and are
+# within about 0.02 of the float similarity, at half the memory of float32.
+FIXED_POINT_SCALE = 127
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def content_words(question: str) -> list[str]:
+    """Words of a question that carry its topic, without stopwords or "'s"."""
+    normalized = normalize_question(question).replace("'s", "")
+    return [word for word in _WORD.findall(normalized) if word not in STOPWORDS]
+
+
+def question_intent(question: str) -> str:
+    """The kind of answer a question asks for, from its first question word.
+
+    Returns:
+        One of INTENTS: "who", "when", "where", "why" or "how", or "" for
+        "what"/"which" and questions without a question word.
+    """
+    for word in _WORD.findall(normalize_question(question)):
+        if word in _INTENT_WORDS:
+            return _INTENT_WORDS[word]
+    return ""
+
+
+def question_features(question: str) -> list[tuple[str, float]]:
+    """Split a question into weighted word and character n-gram features.
+
+    Each content word contributes itself plus its character trigrams at
+    a lower weight, so inflections such as "talk"/"talks" still overlap.
+
+    Args:
+        question: Raw question text.
+
+    Returns:
+        (feature, weight) pairs.
+    """
+    features: list[tuple[str, float]] = []
+    for word in content_words(question):
+        features.append((f"w:{word}", 1.0))
+        padded = f"<{word}>"
+        for start in range(len(padded) - CHAR_NGRAM + 1):
+            gram = padded[start : start + CHAR_NGRAM]
+            features.append((f"c:{gram}", CHAR_NGRAM_WEIGHT))
+    return features
+
+
+def numpy_available() -> bool:
+    """Whether NumPy is installed for the semantic cache."""
+    return importlib.util.find_spec("numpy") is not None
+
+
+class HashingVectorizer:
+    """Embed questions as L2-normalized hashed n-gram vectors.
+
+    Needs no model download or fitting: each feature is hashed with
+    CRC32 into one of dimensions buckets, with a hash bit choosing the
+    sign so collisions tend to cancel out.
+    """
+
+    def __init__(self, dimensions: int) -> None:
+        import numpy as np
+
+        self.dimensions = dimensions
+        self._np = np
+
+    def embed(self, question: str) -> Any:
+        """Return the unit-length float32 vector for question."""
+        np = self._np
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature, weight in question_features(question):
+            digest = zlib.crc32(feature.encode())
+            sign = 1.0 if digest & 0x80000000 else -1.0
+            vector[digest % self.dimensions] += sign * weight
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector /= norm
+        return vector
+
+
+class _UserIndex:
+    """Ring buffer of question vectors and answers for one user.
+
+    Vectors are stored column-major in fixed point, so the few dimensions
+    a question actually uses can be read as contiguous int16 columns.
+    Intents and expiry times are arrays too, so lookups can mask out
+    entries without a Python loop.
+    """
+
+    def __init__(self, np: Any, dimensions: int, capacity: int) -> None:
+        self.vectors = np.zeros(
+            (min(capacity, 64), dimensions), dtype=np.int16, order="F"
+        )
+        self.intents = np.zeros(min(capacity, 64), dtype=np.int8)
+        self.expires_at = np.zeros(min(capacity, 64), dtype=np.float64)
+        self.answers: list[str] = []
+        self.questions: list[str] = []
+        self.capacity = capacity
+        self.next_slot = 0
+        self._np = np
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    def add(
+        self, vector: Any, intent: int, question: str, answer: str, expires_at: float
+    ) -> None:
+        np = self._np
+        if len(self) < self.capacity:
+            if len(self) == len(self.vectors):
+                rows = min(self.capacity, 2 * len(self.vectors))
+                grown = np.zeros(
+                    (rows, self.vectors.shape[1]), dtype=np.int16, order="F"
+                )
+                grown[: len(self)] = self.vectors
+                self.vectors = grown
+                intents = np.zeros(rows, dtype=np.int8)
+                intents[: len(self)] = self.intents
+                self.intents = intents
+                expiry = np.zeros(rows, dtype=np.float64)
+                expiry[: len(self)] = self.expires_at
+                self.expires_at = expiry
+            slot = len(self)
+            self.answers.append(answer)
+            self.questions.append(question)
+        else:
+            slot = self.next_slot
+            self.answers[slot] = answer
+            self.questions[slot] = question
+            self.next_slot = (slot + 1) % self.capacity
+        self.vectors[slot] = vector
+        self.intents[slot] = intent
+        self.expires_at[slot] = expires_at
+
+
+class SemanticCache:
+    """Answer cache that matches paraphrases by cosine similarity.
+
+    Questions are embedded with HashingVectorizer and kept in one NumPy
+    matrix per user. Question vectors are sparse, so a lookup scores all
+    cached questions at once by summing only the matrix columns the
+    question uses, instead of a full matrix-vector product. Only cached
+    questions with the same question_intent are candidates, so "Who is X?"
+    never reuses the answer to "What did X talk about?". An answer is
+    served when the best match reaches threshold. Each user keeps at most
+    max_entries questions; when full the oldest entry is overwritten.
+    Requires NumPy.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        ttl_seconds: float,
+        max_entries: int,
+        dimensions: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        import numpy as np
+
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.vectorizer = HashingVectorizer(dimensions)
+        self._np = np
+        self._clock = clock
+        self._indexes: dict[str, _UserIndex] = {}
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def nearest(
+        self, user_email: str, question: str, k: int = 1
+    ) -> list[tuple[float, str, str]]:
+        """Return the k most similar unexpired cached questions.
+
+        Args:
+            user_email: Email the question is asked on behalf of.
+            question: Raw question text.
+            k: Number of matches to return.
+
+        Returns:
+            (similarity, cached question, answer) tuples, best first.
+        """
+        np = self._np
+        vector = self._embed(question)
+        dimensions = np.flatnonzero(vector)
+        if not len(dimensions):
+            return []
+        intent = INTENTS.index(question_intent(question))
+        with self._lock:
+            index = self._indexes.get(user_email.casefold())
+            if index is None or not len(index):
+                return []
+            rows = index.vectors[: len(index)]
+            # Each int16 product is exact, but their sum is accumulated
+            # in int32 so it can never wrap around
+            scores = np.zeros(len(index), dtype=np.int32)
+            for dimension in dimensions:
+                scores += rows[:, dimension] * vector[dimension]
+            # Other intents and expired entries must never win the argmax
+            now = self._clock()
+            excluded = (index.intents[: len(index)] != intent) | (
+                index.expires_at[: len(index)] <= now
+            )
+            np.putmask(scores, excluded, np.iinfo(scores.dtype).min)
+            if k == 1:
+                top = [int(np.argmax(scores))]
+            else:
+                k = min(k, len(scores))
+                top = np.argpartition(scores, -k)[-k:]
+                top = top[np.argsort(scores[top])[::-1]]
+            return [
+                (
+                    float(scores[slot]) / FIXED_POINT_SCALE**2,
+                    index.questions[slot],
+                    index.answers[slot],
+                )
+                for slot in top
+                if not excluded[slot]
+            ]
+
+    def get(self, user_email: str, question: str) -> str | None:
+        """Return the answer to a cached paraphrase of question, or None."""
+        matches = self.nearest(user_email, question)
+        with self._lock:
+            if matches and matches[0][0] >= self.threshold:
+                self._hits += 1
+                score, cached_question, answer = matches[0]
+                logger.debug(
+                    f"Semantic cache hit ({score:.2f}): {question!r} ~ "
+                    f"{cached_question!r}"
+                )
+                return answer
+            self._misses += 1
+            return None
+
+    def set(self, user_email: str, question: str, answer: str) -> None:
+        """Index question and its answer for user_email."""
+        vector = self._embed(question)
+        if not vector.any():
+            return
+        intent = INTENTS.index(question_intent(question))
+        with self._lock:
+            index = self._indexes.get(user_email.casefold())
+            if index is None:
+                index = _UserIndex(
+                    self._np, self.vectorizer.dimensions, self.max_entries
+                )
+                self._indexes[user_email.casefold()] = index
+            index.add(
+                vector, intent, question, answer, self._clock() + self.ttl_seconds
+            )
+
+    def _embed(self, question: str) -> Any:
+        vector = self.vectorizer.embed(question) * FIXED_POINT_SCALE
+        return self._np.rint(vector).astype(self._np.int16)
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and the number of indexed questions."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "entries": sum(len(index) for index in self._indexes.values()),
+            }
+
+
+_semantic_cache: SemanticCache | None = None
+_semantic_cache_lock = threading.Lock()
+_warned_missing_numpy = False
+
+
+def get_semantic_cache(settings: Settings) -> SemanticCache | None:
+    """Get the process-wide SemanticCache, or None if disabled.
+
+    The cache is disabled unless SEMANTIC_CACHE_ENABLED is set, and
+    with a warning if NumPy is not installed.
+
+    Args:
+        settings: Server settings holding the semantic cache configuration.
+
+    Returns:
+        SemanticCache | None: Shared semantic cache instance
+    """
+    global _semantic_cache, _warned_missing_numpy
+    if not settings.semantic_cache_enabled:
+        return None
+    with _semantic_cache_lock:
+        if _semantic_cache is None:
+            if not numpy_available():
+                if not _warned_missing_numpy:
+                    logger.warning(
+                        "SEMANTIC_CACHE_ENABLED is set but numpy is not installed; "
+                        "semantic cache disabled. Install with: "
+                        "pip install 'icsaet-mcp[semantic]'"
+                    )
+                    _warned_missing_numpy = True
+                return None
+            _semantic_cache = SemanticCache(
+                threshold=settings.semantic_cache_threshold,
+                ttl_seconds=settings.cache_ttl_seconds,
+                max_entries=settings.semantic_cache_max_entries,
+                dimensions=settings.semantic_cache_dimensions,
+            )
+        return _semantic_cache
+
+
+def reset_semantic_cache() -> None:
+    """Drop the process-wide SemanticCache."""
+    global _semantic_cache, _warned_missing_numpy
+    with _semantic_cache_lock:
+        _semantic_cache = None
+        _warned_missing_numpy = False
+
+
+__all__ = [
+    "HashingVectorizer",
+    "SemanticCache",
+    "content_words",
+    "get_semantic_cache",
+    "numpy_available",
+    "question_features",
+    "question_intent",
+    "reset_semantic_cache",
+]
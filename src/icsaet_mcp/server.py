@@ -45,7 +45,7 @@ def formatting_guidance() -> str:
     return get_formatting_guidance()
 
 
-logger.info("ICAET MCP server configured with 1 tool and 3 prompts")
+logger.info("ICAET MCP server configured with 7 tools and 3 prompts")
 
 
 __all__ = ["mcp", "get_icaet_overview", "get_example_questions", "get_formatting_guidance"]
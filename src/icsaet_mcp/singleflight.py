@@ -0,0 +1,123 @@
+"""Coalescing of identical in-flight requests."""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable
+from typing import Any, cast
+
+
+class _Call[T]:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Run at most one call per key at a time across threads.
+
+    Callers that arrive while a call for the same key is running wait for
+    it and share its result or its exception instead of starting their own.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, _Call[Any]] = {}
+        self._lock = threading.Lock()
+
+    def do[T](self, key: str, fn: Callable[[], T]) -> T:
+        """Run fn for key, or wait for the call already in flight.
+
+        Args:
+            key: Identity of the call; equal keys are coalesced.
+            fn: Function performing the call.
+
+        Returns:
+            The result of fn.
+
+        Raises:
+            Exception: Whatever fn raised, re-raised in every waiting caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:  # noqa: BLE001
+                # Anything fn raises, KeyboardInterrupt included, is re-raised
+                # below in the leader and in every waiter
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result  # type: ignore[return-value]
+
+    def in_flight(self) -> int:
+        """Number of distinct keys currently being fetched."""
+        with self._lock:
+            return len(self._calls)
+
+
+class _Flight:
+    def __init__(self, task: "asyncio.Future[Any]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class AsyncSingleFlight:
+    """Run at most one coroutine per key at a time on the event loop.
+
+    The shared call runs as its own task. A waiter that is cancelled does
+    not cancel the call for the others; the call is only cancelled once
+    every waiter has gone away.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[str, _Flight] = {}
+
+    async def do[T](self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await fn for key, or join the call already in flight.
+
+        Args:
+            key: Identity of the call; equal keys are coalesced.
+            fn: Coroutine function performing the call.
+
+        Returns:
+            The result of fn.
+
+        Raises:
+            Exception: Whatever fn raised, re-raised in every waiting caller.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+
+        flight.waiters += 1
+        try:
+            return cast(T, await asyncio.shield(flight.task))
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+    def in_flight(self) -> int:
+        """Number of distinct keys currently being fetched."""
+        return len(self._flights)
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+
+__all__ = ["AsyncSingleFlight", "SingleFlight"]
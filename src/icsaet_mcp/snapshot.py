@@ -0,0 +1,386 @@
+"""Local full-text snapshot of ICAET conference knowledge."""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from icsaet_mcp.cache import DiskAnswerCache, normalize_question
+from icsaet_mcp.config import Settings
+from icsaet_mcp.semantic import content_words
+from icsaet_mcp.storage import immediate_transaction, open_shared_db
+
+logger = logging.getLogger(__name__)
+
+ANSWER_SOURCE = "answer"
+
+
+def _match_expression(terms: Iterable[str], operator: str, column: str = "") -> str:
+    # Quote every term so user text can never be parsed as FTS5 syntax
+    quoted = f" {operator} ".join(f'"{term}"' for term in terms)
+    return f"{column}: ({quoted})" if column else quoted
+
+
+@dataclass
+class SearchResult:
+    """One full-text search hit."""
+
+    title: str
+    snippet: str
+    source: str
+    score: float
+
+
+class KnowledgeSnapshot:
+    """SQLite FTS5 index of conference knowledge for offline lookups.
+
+    Documents are (title, body, source) triples: answered questions
+    recorded as the server runs (source "answer") or records imported
+    from a dump. Recorded answers belong to the user who asked, like the
+    answer caches, while imported records are shared by everyone. Titles
+    and bodies are indexed with the porter stemmer, so "talks" matches
+    "talk". Re-adding a title from the same source and user replaces the
+    earlier document.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path).expanduser()
+        self._lock = threading.Lock()
+        self._conn = open_shared_db(self.path)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL UNIQUE,
+                title TEXT NOT NULL,
+                body TEXT NOT NULL,
+                source TEXT NOT NULL,
+                user TEXT NOT NULL DEFAULT '',
+                terms INTEGER NOT NULL,
+                added_at REAL NOT NULL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+                title, body, content='documents', content_rowid='id',
+                tokenize='porter unicode61'
+            );
+            CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents
+            BEGIN
+                INSERT INTO documents_fts (rowid, title, body)
+                VALUES (new.id, new.title, new.body);
+            END;
+            CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents
+            BEGIN
+                INSERT INTO documents_fts (documents_fts, rowid, title, body)
+                VALUES ('delete', old.id, old.title, old.body);
+            END;
+            """)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(documents)")}
+        if "user" in columns:
+            return
+        with self._lock, immediate_transaction(self._conn):
+            self._conn.execute(
+                "ALTER TABLE documents ADD COLUMN user TEXT NOT NULL DEFAULT ''"
+            )
+            # Answers recorded before per-user scoping have no known owner
+            self._conn.execute(
+                "DELETE FROM documents WHERE source = ?", (ANSWER_SOURCE,)
+            )
+            # Imported records become shared: an empty user before the key
+            self._conn.executemany(
+                "UPDATE documents SET key = ? WHERE id = ?",
+                [
+                    (f"\x00{key}", row_id)
+                    for row_id, key in self._conn.execute(
+                        "SELECT id, key FROM documents"
+                    ).fetchall()
+                ],
+            )
+        logger.info(f"Dropped unscoped recorded answers from {self.path}")
+
+    def add(
+        self,
+        title: str,
+        body: str,
+        source: str = ANSWER_SOURCE,
+        user_email: str = "",
+    ) -> None:
+        """Index one document, replacing any earlier one with the same title.
+
+        Args:
+            title: Document title, or the question for a recorded answer.
+            body: Document text, or the answer.
+            source: Where the document came from.
+            user_email: Owner of a recorded answer; empty for shared records.
+        """
+        self.add_many([(title, body, source, user_email)])
+
+    def add_many(
+        self, documents: Iterable[tuple[str, str, str] | tuple[str, str, str, str]]
+    ) -> int:
+        """Index documents in one transaction.
+
+        Args:
+            documents: (title, body, source) triples of shared records, or
+                (title, body, source, user_email) for answers owned by a
+                user.
+
+        Returns:
+            Number of documents indexed.
+        """
+        now = time.time()
+        rows = []
+        for title, body, source, *owner in documents:
+            if not title.strip() or not body.strip():
+                continue
+            user = owner[0].casefold() if owner else ""
+            rows.append(
+                (
+                    f"{user}\x00{source}\x00{normalize_question(title)}",
+                    title,
+                    body,
+                    source,
+                    user,
+                    len(set(content_words(title))),
+                    now,
+                )
+            )
+        with self._lock, immediate_transaction(self._conn):
+            self._conn.executemany(
+                "DELETE FROM documents WHERE key = ?", [(row[0],) for row in rows]
+            )
+            self._conn.executemany(
+                "INSERT INTO documents "
+                "(key, title, body, source, user, terms, added_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def search(
+        self, query: str, limit: int = 5, user_email: str | None = None
+    ) -> list[SearchResult]:
+        """Rank documents matching any meaningful word of query by BM25.
+
+        Args:
+            query: Free-text query.
+            limit: Maximum number of results.
+            user_email: Search shared records and only this user's recorded
+                answers; None searches every document.
+
+        Returns:
+            Best matches first; empty if query has no meaningful words.
+        """
+        terms = content_words(query)
+        if not terms:
+            return []
+        user = None if user_email is None else user_email.casefold()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT d.title, "
+                "snippet(documents_fts, 1, '**', '**', '...', 24), "
+                "d.source, bm25(documents_fts, 4.0, 1.0) AS rank "
+                "FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid "
+                "WHERE documents_fts MATCH ? AND (? IS NULL OR d.user IN ('', ?)) "
+                "ORDER BY rank LIMIT ?",
+                (_match_expression(terms, "OR"), user, user, limit),
+            ).fetchall()
+        return [
+            SearchResult(title, snippet, source, round(-rank, 4))
+            for title, snippet, source, rank in rows
+        ]
+
+    def answer(self, question: str, user_email: str) -> str | None:
+        """Return a recorded answer to question, if one matches confidently.
+
+        Only answers recorded for user_email are considered. A recorded
+        question matches when its title contains every meaningful word of
+        question (up to stemming) and no others, so "Leslie Miley's talk
+        topics?" matches "What did Leslie Miley talk about?" but not "What
+        did Leslie Miley say about hiring?".
+
+        Args:
+            question: Question to answer.
+            user_email: Email the question is asked on behalf of.
+
+        Returns:
+            The recorded answer, or None.
+        """
+        terms = set(content_words(question))
+        if not terms:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT d.body FROM documents_fts "
+                "JOIN documents d ON d.id = documents_fts.rowid "
+                "WHERE documents_fts MATCH ? AND d.source = ? AND d.user = ? "
+                "AND d.terms = ? ORDER BY d.added_at DESC LIMIT 1",
+                (
+                    _match_expression(terms, "AND", "title"),
+                    ANSWER_SOURCE,
+                    user_email.casefold(),
+                    len(terms),
+                ),
+            ).fetchone()
+        return None if row is None else str(row[0])
+
+    def count(self) -> int:
+        """Number of indexed documents."""
+        with self._lock:
+            return int(
+                self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def read_dump(path: str | Path) -> Iterator[tuple[str, str, str]]:
+    """Read documents from a JSON array or JSON-lines dump.
+
+    Each record is an object with a "title" or "question" and a "body",
+    "answer" or "text"; "source" defaults to the file name.
+
+    Args:
+        path: Dump file.
+
+    Yields:
+        (title, body, source) triples.
+
+    Raises:
+        ValueError: If a record lacks a title or body.
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        records = json.loads(text)
+    else:
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    for number, record in enumerate(records, start=1):
+        title = record.get("title") or record.get("question")
+        body = record.get("body") or record.get("answer") or record.get("text")
+        if not title or not body:
+            raise ValueError(f"{path}: record {number} needs a title and a body")
+        yield str(title), str(body), str(record.get("source") or path.name)
+
+
+def read_disk_cache(cache: DiskAnswerCache) -> Iterator[tuple[str, str, str]]:
+    """Read answered questions from the disk answer cache.
+
+    Args:
+        cache: Disk cache to export.
+
+    Yields:
+        (question, answer, "answer", user_email) tuples, keeping each
+        answer scoped to the user it was cached for.
+    """
+    for key, answer in cache.items():
+        user_email, _, question = key.partition("\x00")
+        yield question, answer, ANSWER_SOURCE, user_email
+
+
+_snapshot: KnowledgeSnapshot | None = None
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot(settings: Settings) -> KnowledgeSnapshot | None:
+    """Get the process-wide KnowledgeSnapshot, or None if SNAPSHOT_PATH is unset.
+
+    Args:
+        settings: Server settings holding the snapshot configuration.
+
+    Returns:
+        KnowledgeSnapshot | None: Shared snapshot instance
+    """
+    global _snapshot
+    if not settings.snapshot_path:
+        return None
+    with _snapshot_lock:
+        if _snapshot is None:
+            _snapshot = KnowledgeSnapshot(settings.snapshot_path)
+            logger.info(f"Opened knowledge snapshot at {_snapshot.path}")
+        return _snapshot
+
+
+def close_snapshot() -> None:
+    """Close the process-wide KnowledgeSnapshot if one was opened."""
+    global _snapshot
+    with _snapshot_lock:
+        if _snapshot is not None:
+            _snapshot.close()
+            _snapshot = None
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Build or search a knowledge snapshot from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m icsaet_mcp.snapshot", description=__doc__
+    )
+    parser.add_argument(
+        "--path",
+        default=os.getenv("SNAPSHOT_PATH"),
+        help="snapshot file (default: SNAPSHOT_PATH)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    dump = commands.add_parser("import", help="index a JSON or JSON-lines dump")
+    dump.add_argument("dump", type=Path)
+    cached = commands.add_parser("import-cache", help="index answers in CACHE_DIR")
+    cached.add_argument(
+        "--cache-dir",
+        default=os.getenv("CACHE_DIR"),
+        help="disk answer cache directory (default: CACHE_DIR)",
+    )
+    search = commands.add_parser("search", help="full-text search the snapshot")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if not args.path:
+        parser.error("set SNAPSHOT_PATH or pass --path")
+    if args.command == "import-cache" and not args.cache_dir:
+        parser.error("set CACHE_DIR or pass --cache-dir")
+
+    snapshot = KnowledgeSnapshot(args.path)
+    try:
+        if args.command == "import":
+            count = snapshot.add_many(read_dump(args.dump))
+            print(f"Indexed {count} documents from {args.dump}")
+        elif args.command == "import-cache":
+            cache = DiskAnswerCache(
+                args.cache_dir, ttl_seconds=0, max_entries=0, max_bytes=0
+            )
+            try:
+                count = snapshot.add_many(read_disk_cache(cache))
+            finally:
+                cache.close()
+            print(f"Indexed {count} cached answers")
+        else:
+            for result in snapshot.search(args.query, args.limit):
+                print(f"[{result.score:.2f}] {result.title} ({result.source})")
+                print(f"    {result.snippet}")
+    finally:
+        snapshot.close()
+    return 0
+
+
+__all__ = [
+    "KnowledgeSnapshot",
+    "SearchResult",
+    "close_snapshot",
+    "get_snapshot",
+    "read_disk_cache",
+    "read_dump",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
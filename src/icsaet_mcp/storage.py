@@ -0,0 +1,51 @@
+"""SQLite databases shared between server processes."""
+
+import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def open_shared_db(path: Path) -> sqlite3.Connection:
+    """Open a SQLite database that several processes can use at once.
+
+    The database is in WAL mode, so readers never block the single
+    writer, and the connection waits up to 5 seconds for a write lock
+    held by another process. It runs in autocommit mode and may be used
+    from any thread; callers serialize access with their own lock and
+    group writes with immediate_transaction.
+
+    Args:
+        path: Database file, created along with its directory if missing.
+
+    Returns:
+        sqlite3.Connection: Open connection
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(
+        path, timeout=5.0, check_same_thread=False, isolation_level=None
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+@contextmanager
+def immediate_transaction(conn: sqlite3.Connection) -> Iterator[None]:
+    """Run the enclosed statements in one IMMEDIATE transaction.
+
+    The write lock is taken up front, so concurrent read-modify-write
+    sequences from other processes are serialized instead of failing
+    with SQLITE_BUSY on upgrade. The transaction is rolled back if the
+    block raises.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+__all__ = ["immediate_transaction", "open_shared_db"]
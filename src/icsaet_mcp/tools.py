@@ -1,81 +1,126 @@
 """MCP tool definitions for ICAET queries."""
 
+import asyncio
 import logging
-from typing import Any, cast
+import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
-import httpx
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
 from pydantic import ValidationError
 
+from icsaet_mcp.answers import (
+    get_continuation_store,
+    render_answer,
+    reset_continuation_store,
+)
+from icsaet_mcp.cache import (
+    cache_key,
+    close_disk_cache,
+    get_answer_cache,
+    get_disk_cache,
+    normalize_question,
+)
 from icsaet_mcp.config import Settings, get_settings
+from icsaet_mcp.metrics import (
+    CACHE_LOOKUPS,
+    REGISTRY,
+    start_metrics_server,
+    stop_metrics_server,
+    track_query,
+)
+from icsaet_mcp.prewarm import start_prewarm
+from icsaet_mcp.refresh import close_refresher, get_refresher
+from icsaet_mcp.scheduler import (
+    Priority,
+    deadline_after,
+    deadline_scope,
+    get_scheduler,
+)
+from icsaet_mcp.semantic import get_semantic_cache
+from icsaet_mcp.singleflight import AsyncSingleFlight, SingleFlight
+from icsaet_mcp.snapshot import close_snapshot, get_snapshot
+from icsaet_mcp.tracing import configure_tracing, shutdown_tracing, start_span
+
+if TYPE_CHECKING:
+    from icsaet_mcp.client import AsyncICAETClient, ChunkCallback, ICAETClient
 
 logger = logging.getLogger(__name__)
-mcp = FastMCP("icsaet")
 
+# The HTTP client modules (and httpx) load on the first upstream request,
+# keeping them off the stdio server's cold start
+_CLIENT_MODULE = "icsaet_mcp.client"
 
-class ICAETClient:
-    """Client for interacting with ICAET API."""
 
-    BASE_URL = "https://icaet-dev.wesleyreisz.com"
+def __getattr__(name: str) -> Any:
+    if name in ("AsyncICAETClient", "ICAETClient"):
+        from icsaet_mcp import client
 
-    def __init__(self, settings: Settings) -> None:
-        self.settings = settings
-        self._client = httpx.Client(timeout=30.0, base_url=self.BASE_URL)
+        return getattr(client, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    def query(self, question: str) -> dict[str, Any]:
-        """Query the ICAET knowledge base."""
-        headers = {"x-api-key": self.settings.icaet_api_key}
-        payload = {"email": self.settings.user_email, "question": question}
 
-        try:
-            response = self._client.post("/query", json=payload, headers=headers)
-            response.raise_for_status()
-            return cast(dict[str, Any], response.json())
-        except httpx.TimeoutException as e:
-            logger.error(f"Request timeout: {e}")
-            raise RuntimeError(
-                "Request timed out. The ICAET API is taking too long to respond."
-            ) from e
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error {e.response.status_code}: {e}")
-            if e.response.status_code == 401:
-                raise RuntimeError(
-                    "Authentication failed. Please check your ICAET_API_KEY."
-                ) from e
-            elif e.response.status_code == 400:
-                raise RuntimeError(
-                    "Invalid request. Please check your question format and email."
-                ) from e
-            else:
-                raise RuntimeError(
-                    f"API error: {e.response.status_code}. Please try again later."
-                ) from e
-        except httpx.RequestError as e:
-            logger.error(f"Network error: {e}")
-            raise RuntimeError(
-                "Network error. Please check your internet connection."
-            ) from e
+async def _close_upstream() -> None:
+    """Close the HTTP clients and rate limiter if a request loaded them."""
+    if _CLIENT_MODULE not in sys.modules:
+        return
+    from icsaet_mcp.client import close_async_client, close_client
+    from icsaet_mcp.ratelimit import reset_rate_limiter
 
+    close_client()
+    await close_async_client()
+    reset_rate_limiter()
 
-def query_icaet(question: str) -> str:
-    """Query the ICAET knowledge base.
 
-    Args:
-        question: A natural language question about ICAET conference content,
-                 speakers, topics, or sessions.
+@asynccontextmanager
+async def lifespan(server: FastMCP[Any]) -> AsyncIterator[None]:
+    """Start metrics, tracing and prewarming; release shared resources on exit."""
+    prewarm_task = None
+    try:
+        settings = get_settings()
+        start_metrics_server(settings)
+        configure_tracing(settings)
+        prewarm_task = start_prewarm(
+            settings, partial(query_icaet_async, priority=Priority.BACKGROUND)
+        )
+    except ValidationError:
+        pass
+    try:
+        yield
+    finally:
+        if prewarm_task is not None and not prewarm_task.done():
+            prewarm_task.cancel()
+            await asyncio.gather(prewarm_task, return_exceptions=True)
+        await close_refresher()
+        await _close_upstream()
+        close_disk_cache()
+        close_snapshot()
+        reset_continuation_store()
+        stop_metrics_server()
+        shutdown_tracing()
 
-    Returns:
-        Answer from the ICAET knowledge base.
 
-    Raises:
-        ValueError: If question is empty or invalid.
-        RuntimeError: If API call fails or configuration is invalid.
-    """
+mcp = FastMCP("icsaet", lifespan=lifespan)
+
+# Concurrent callers asking the same question share one upstream request
+_flights = SingleFlight()
+_async_flights = AsyncSingleFlight()
+
+
+def _validate_question(question: str) -> str:
+    """Reject empty questions and return the stripped question."""
     if not question or not question.strip():
         raise ValueError("Question cannot be empty. Please provide a valid question.")
+    return question.strip()
+
 
+def _load_settings() -> Settings:
+    """Load settings, turning validation errors into configuration guidance."""
     try:
-        settings = get_settings()
+        return get_settings()
     except ValidationError as e:
         logger.error(f"Configuration error: {e}")
         raise RuntimeError(
@@ -83,38 +128,540 @@ def query_icaet(question: str) -> str:
             "environment variables in your Cursor MCP settings."
         ) from e
 
+
+def _record_lookup(layer: str, answer: str | None) -> None:
+    CACHE_LOOKUPS.inc(layer=layer, result="miss" if answer is None else "hit")
+
+
+def _similar_answer(settings: Settings, question: str) -> str | None:
+    """Look up the answer to a paraphrase of question in the semantic cache."""
+    semantic = get_semantic_cache(settings)
+    if semantic is None:
+        return None
+    answer = semantic.get(settings.user_email, question)
+    _record_lookup("semantic", answer)
+    return answer
+
+
+def _snapshot_answer(settings: Settings, question: str) -> str | None:
+    """Look up a recorded answer in the snapshot if SNAPSHOT_FAST_PATH is on."""
+    snapshot = get_snapshot(settings)
+    if snapshot is None or not settings.snapshot_fast_path:
+        return None
+    answer = snapshot.answer(question, settings.user_email)
+    _record_lookup("snapshot", answer)
+    return answer
+
+
+def _cached_answer(settings: Settings, key: str, question: str) -> str | None:
+    """Look up an answer in the memory and disk caches, then by similarity."""
+    memory = get_answer_cache(settings)
+    if memory is not None:
+        answer = memory.get(key)
+        _record_lookup("memory", answer)
+        if answer is not None:
+            return answer
+    answer = None
+    disk = get_disk_cache(settings)
+    if disk is not None:
+        answer = disk.get(key)
+        _record_lookup("disk", answer)
+    if answer is None:
+        answer = _similar_answer(settings, question)
+    if answer is None:
+        answer = _snapshot_answer(settings, question)
+    if answer is not None and memory is not None:
+        memory.set(key, answer)
+    return answer
+
+
+def _stale_answer(settings: Settings, key: str) -> str | None:
+    """Look up an answer in any cache layer, accepting expired entries."""
+    memory = get_answer_cache(settings)
+    if memory is not None and (answer := memory.get_stale(key)) is not None:
+        return answer
+    disk = get_disk_cache(settings)
+    if disk is not None:
+        return disk.get_stale(key)
+    return None
+
+
+def _store_answer(settings: Settings, key: str, question: str, answer: str) -> None:
+    """Store an answer in every enabled cache layer."""
+    memory = get_answer_cache(settings)
+    if memory is not None:
+        memory.set(key, answer)
+    disk = get_disk_cache(settings)
+    if disk is not None:
+        disk.set(key, answer)
+    semantic = get_semantic_cache(settings)
+    if semantic is not None:
+        semantic.set(settings.user_email, question, answer)
+    snapshot = get_snapshot(settings)
+    if snapshot is not None and settings.snapshot_record_answers:
+        snapshot.add(question, answer, user_email=settings.user_email)
+
+
+async def _cached_answer_async(
+    settings: Settings, key: str, question: str
+) -> str | None:
+    """Async variant of _cached_answer; disk I/O runs in a worker thread."""
+    memory = get_answer_cache(settings)
+    if memory is not None:
+        answer = memory.get(key)
+        _record_lookup("memory", answer)
+        if answer is not None:
+            return answer
+    answer = None
+    disk = get_disk_cache(settings)
+    if disk is not None:
+        answer = await asyncio.to_thread(disk.get, key)
+        _record_lookup("disk", answer)
+    if answer is None:
+        answer = _similar_answer(settings, question)
+    if answer is None:
+        answer = await asyncio.to_thread(_snapshot_answer, settings, question)
+    if answer is not None and memory is not None:
+        memory.set(key, answer)
+    return answer
+
+
+async def _stale_answer_async(settings: Settings, key: str) -> str | None:
+    """Async variant of _stale_answer; disk I/O runs in a worker thread."""
+    memory = get_answer_cache(settings)
+    if memory is not None and (answer := memory.get_stale(key)) is not None:
+        return answer
+    disk = get_disk_cache(settings)
+    if disk is not None:
+        return await asyncio.to_thread(disk.get_stale, key)
+    return None
+
+
+async def _store_answer_async(
+    settings: Settings, key: str, question: str, answer: str
+) -> None:
+    """Async variant of _store_answer; disk I/O runs in a worker thread."""
+    memory = get_answer_cache(settings)
+    if memory is not None:
+        memory.set(key, answer)
+    disk = get_disk_cache(settings)
+    if disk is not None:
+        await asyncio.to_thread(disk.set, key, answer)
+    semantic = get_semantic_cache(settings)
+    if semantic is not None:
+        semantic.set(settings.user_email, question, answer)
+    snapshot = get_snapshot(settings)
+    if snapshot is not None and settings.snapshot_record_answers:
+        await asyncio.to_thread(
+            snapshot.add, question, answer, user_email=settings.user_email
+        )
+
+
+def _refresh_due(settings: Settings, key: str) -> bool:
+    """Whether the memory cache holds key past CACHE_SOFT_TTL_SECONDS."""
+    memory = get_answer_cache(settings)
+    return memory is not None and memory.needs_refresh(key)
+
+
+def _set_cache_hit(span: Any, answer: str | None) -> None:
+    if span is not None:
+        span.set_attribute("icsaet.cache.hit", answer is not None)
+
+
+def _fetch_answer(settings: Settings, key: str, question: str) -> str:
+    """Fetch an answer upstream and cache it.
+
+    While the circuit breaker is open or the rate limit queue is full, a
+    stale cached answer is served instead if one is available.
+    """
+    from icsaet_mcp.client import get_client
+    from icsaet_mcp.ratelimit import RateLimitExceededError
+    from icsaet_mcp.resilience import CircuitOpenError
+
     try:
-        client = ICAETClient(settings)
-        result = client.query(question.strip())
+        with start_span("icsaet.client"):
+            client = get_client(settings)
+        result = client.query(question)
+        answer = render_answer(result)
 
-        if isinstance(result, dict) and "answer" in result:
-            return cast(str, result["answer"])
-        elif isinstance(result, dict):
-            return str(result)
+    except (CircuitOpenError, RateLimitExceededError) as e:
+        if (stale := _stale_answer(settings, key)) is not None:
+            logger.warning(f"Serving stale cached answer: {e}")
+            CACHE_LOOKUPS.inc(layer="any", result="stale")
+            return stale
+        raise
+    except RuntimeError:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        raise RuntimeError(
+            f"An unexpected error occurred: {e}. Please try again."
+        ) from e
+
+    _store_answer(settings, key, question, answer)
+    return answer
+
+
+async def _fetch_answer_async(
+    settings: Settings,
+    key: str,
+    question: str,
+    on_chunk: "ChunkCallback | None" = None,
+    deadline: float | None = None,
+) -> str:
+    """Async variant of _fetch_answer; streams the answer if on_chunk is set."""
+    from icsaet_mcp.client import get_async_client
+    from icsaet_mcp.ratelimit import RateLimitExceededError
+    from icsaet_mcp.resilience import CircuitOpenError
+
+    try:
+        with start_span("icsaet.client"):
+            client = get_async_client(settings)
+        if on_chunk is not None and settings.stream_answers:
+            result = await client.query_stream(question, on_chunk, deadline)
         else:
-            return str(result)
+            result = await client.query(question, deadline)
+        answer = render_answer(result)
 
+    except (CircuitOpenError, RateLimitExceededError) as e:
+        if (stale := await _stale_answer_async(settings, key)) is not None:
+            logger.warning(f"Serving stale cached answer: {e}")
+            CACHE_LOOKUPS.inc(layer="any", result="stale")
+            return stale
+        raise
     except RuntimeError:
         raise
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         raise RuntimeError(
-            f"An unexpected error occurred: {str(e)}. Please try again."
+            f"An unexpected error occurred: {e}. Please try again."
         ) from e
 
+    await _store_answer_async(settings, key, question, answer)
+    return answer
 
-@mcp.tool()
-def query(question: str) -> str:
+
+async def _fetch_scheduled(
+    settings: Settings,
+    key: str,
+    question: str,
+    priority: Priority,
+    deadline: float | None,
+    on_chunk: "ChunkCallback | None" = None,
+) -> str:
+    """Fetch an answer upstream once the scheduler admits the request.
+
+    The scheduler slot is held by the shared upstream request, so callers
+    joining it for the same question wait without taking a slot of their
+    own. Everything, queueing included, is cut off at deadline; a caller
+    that is cancelled or runs out of time aborts the upstream request
+    unless another caller still waits for it.
+    """
+
+    async def fetch() -> str:
+        async with get_scheduler(settings).slot(priority, deadline):
+            return await _fetch_answer_async(
+                settings, key, question, on_chunk, deadline
+            )
+
+    async with deadline_scope(deadline):
+        return await _async_flights.do(key, fetch)
+
+
+def query_icaet(question: str) -> str:
     """Query the ICAET knowledge base.
 
+    Cached answers past CACHE_SOFT_TTL_SECONDS are returned at once and
+    refreshed in a background thread.
+
+    Args:
+        question: A natural language question about ICAET conference content,
+                 speakers, topics, or sessions.
+
+    Returns:
+        Answer from the ICAET knowledge base.
+
+    Raises:
+        ValueError: If question is empty or invalid.
+        RuntimeError: If API call fails or configuration is invalid.
+    """
+    question = _validate_question(question)
+    with start_span("icsaet.settings"):
+        settings = _load_settings()
+
+    key = cache_key(settings.user_email, question)
+    with track_query("sync"):
+        with start_span("icsaet.cache_lookup") as span:
+            cached = _cached_answer(settings, key, question)
+            _set_cache_hit(span, cached)
+        if cached is not None:
+            if _refresh_due(settings, key) and (refresher := get_refresher(settings)):
+                refresher.submit(
+                    key,
+                    lambda: _flights.do(
+                        key, lambda: _fetch_answer(settings, key, question)
+                    ),
+                )
+            return cached
+        return _flights.do(key, lambda: _fetch_answer(settings, key, question))
+
+
+async def query_icaet_async(
+    question: str,
+    on_chunk: "ChunkCallback | None" = None,
+    priority: Priority = Priority.INTERACTIVE,
+    deadline: float | None = None,
+) -> str:
+    """Query the ICAET knowledge base without blocking the event loop.
+
+    Cache misses wait for one of UPSTREAM_MAX_CONCURRENCY slots, which
+    are handed out by priority. Cached answers past CACHE_SOFT_TTL_SECONDS
+    are returned at once and refreshed in a background task.
+
     Args:
         question: A natural language question about ICAET conference content,
                  speakers, topics, or sessions.
+        on_chunk: Optional callback awaited with each answer fragment when
+                 the upstream streams its response (see STREAM_ANSWERS).
+        priority: Scheduling class of the request.
+        deadline: time.monotonic() time by which the answer is needed; it
+                 also caps upstream timeouts and retries.
 
     Returns:
         Answer from the ICAET knowledge base.
+
+    Raises:
+        ValueError: If question is empty or invalid.
+        RuntimeError: If API call fails, the deadline passes or
+            configuration is invalid.
+    """
+    question = _validate_question(question)
+    with start_span("icsaet.settings"):
+        settings = _load_settings()
+
+    key = cache_key(settings.user_email, question)
+    with track_query("async"):
+        with start_span("icsaet.cache_lookup") as span:
+            cached = await _cached_answer_async(settings, key, question)
+            _set_cache_hit(span, cached)
+        if cached is not None:
+            if _refresh_due(settings, key) and (refresher := get_refresher(settings)):
+                refresher.submit_async(
+                    key,
+                    lambda: _fetch_scheduled(
+                        settings, key, question, Priority.BACKGROUND, None
+                    ),
+                )
+            return cached
+        return await _fetch_scheduled(
+            settings, key, question, priority, deadline, on_chunk
+        )
+
+
+@mcp.tool()
+async def query(question: str, ctx: Context | None = None) -> str:
+    """Query the ICAET knowledge base.
+
+    Args:
+        question: A natural language question about ICAET conference content,
+                 speakers, topics, or sessions.
+
+    Returns:
+        Answer from the ICAET knowledge base. Answers longer than
+        ANSWER_PAGE_CHARS end with a continuation token for query_continue.
+    """
+    with start_span("icsaet.query"):
+        question = _validate_question(question)
+        settings = _load_settings()
+        deadline = deadline_after(settings.query_deadline_seconds)
+        if ctx is None:
+            answer = await query_icaet_async(question, deadline=deadline)
+        else:
+            received = 0
+
+            async def relay(chunk: str) -> None:
+                nonlocal received
+                received += len(chunk)
+                await ctx.report_progress(progress=received, message=chunk)
+
+            answer = await query_icaet_async(
+                question, on_chunk=relay, deadline=deadline
+            )
+        return await get_continuation_store(settings).paginate_async(answer)
+
+
+@mcp.tool()
+def query_continue(continuation_token: str) -> str:
+    """Read the next page of a long ICAET answer.
+
+    Args:
+        continuation_token: Token from the end of a truncated answer.
+
+    Returns:
+        The next page of the answer, ending with another continuation
+        token if more remains.
+    """
+    with start_span("icsaet.query_continue"):
+        return get_continuation_store(_load_settings()).next_page(continuation_token)
+
+
+async def query_batch_icaet(questions: list[str]) -> list[dict[str, str]]:
+    """Answer many questions concurrently.
+
+    Questions that normalize to the same text are sent upstream once, at
+    most BATCH_CONCURRENCY requests are in flight at a time, and results
+    are returned in input order.
+
+    Args:
+        questions: Natural language questions about ICAET conference content.
+
+    Returns:
+        One dict per input question with "question" and either "answer"
+        or "error".
+
+    Raises:
+        ValueError: If no questions are given.
+        RuntimeError: If configuration is invalid.
+    """
+    if not questions:
+        raise ValueError("Questions cannot be empty. Please provide at least one.")
+    settings = _load_settings()
+    semaphore = asyncio.Semaphore(settings.batch_concurrency)
+
+    async def answer(question: str) -> dict[str, str]:
+        async with semaphore:
+            try:
+                answer = await query_icaet_async(
+                    question,
+                    priority=Priority.BATCH,
+                    deadline=deadline_after(settings.query_deadline_seconds),
+                )
+                return {"answer": answer}
+            except (ValueError, RuntimeError) as e:
+                return {"error": str(e)}
+
+    first_asked: dict[str, str] = {}
+    for question in questions:
+        first_asked.setdefault(normalize_question(question), question)
+    outcomes = await asyncio.gather(*(answer(q) for q in first_asked.values()))
+    by_question = dict(zip(first_asked, outcomes, strict=True))
+
+    return [
+        {"question": question, **by_question[normalize_question(question)]}
+        for question in questions
+    ]
+
+
+@mcp.tool()
+async def query_batch(questions: list[str]) -> list[dict[str, str]]:
+    """Answer several ICAET questions at once.
+
+    Args:
+        questions: Natural language questions about ICAET conference content,
+                  speakers, topics, or sessions.
+
+    Returns:
+        One result per question, in input order, each with "question" and
+        either "answer" or "error". Long answers end with a continuation
+        token for query_continue.
+    """
+    with start_span("icsaet.query_batch", {"icsaet.batch.size": len(questions)}):
+        results = await query_batch_icaet(questions)
+        store = get_continuation_store(_load_settings())
+        for result in results:
+            if "answer" in result:
+                result["answer"] = await store.paginate_async(result["answer"])
+        return results
+
+
+@mcp.tool()
+def cache_stats() -> dict[str, dict[str, int]]:
+    """Report answer cache hit/miss counters and current size.
+
+    Returns:
+        Counters keyed by cache layer ("memory", "disk", "semantic");
+        disabled layers are omitted.
+    """
+    with start_span("icsaet.cache_stats"):
+        settings = _load_settings()
+        stats: dict[str, dict[str, int]] = {}
+        if (memory := get_answer_cache(settings)) is not None:
+            stats["memory"] = asdict(memory.stats())
+        if (disk := get_disk_cache(settings)) is not None:
+            stats["disk"] = asdict(disk.stats())
+        if (semantic := get_semantic_cache(settings)) is not None:
+            stats["semantic"] = semantic.stats()
+        return stats
+
+
+@mcp.tool()
+def search_local(query: str, limit: int = 5) -> list[dict[str, Any]]:
+    """Search the local ICAET knowledge snapshot without calling the API.
+
+    Works offline and returns in about a millisecond, but only covers
+    questions answered before or imported from a dump.
+
+    Args:
+        query: Keywords or a question about speakers, sessions or topics.
+        limit: Maximum number of results.
+
+    Returns:
+        Matches, best first, each with "title", "snippet", "source" and
+        "score".
+    """
+    with start_span("icsaet.search_local"):
+        settings = _load_settings()
+        snapshot = get_snapshot(settings)
+        if snapshot is None:
+            raise RuntimeError(
+                "Local search is disabled. Set SNAPSHOT_PATH to build a "
+                "local knowledge snapshot."
+            )
+        results = snapshot.search(query, limit, user_email=settings.user_email)
+        return [asdict(result) for result in results]
+
+
+@mcp.tool()
+def circuit_status() -> dict[str, Any]:
+    """Report the ICAET API circuit breaker state.
+
+    Returns:
+        State ("closed", "open" or "half_open"), consecutive failures,
+        failure threshold and seconds until the next probe.
+    """
+    from icsaet_mcp.resilience import get_circuit_breaker
+
+    with start_span("icsaet.circuit_status"):
+        return get_circuit_breaker(_load_settings()).snapshot()
+
+
+@mcp.tool()
+def server_stats() -> dict[str, Any]:
+    """Report request latency, upstream traffic and cache metrics.
+
+    The same metrics are served in Prometheus format when METRICS_PORT
+    is set.
+
+    Returns:
+        Metrics keyed by name, then by label set; latency histograms are
+        summarized as count, sum, mean and p50/p95/p99 bucket bounds.
     """
-    return query_icaet(question)
+    with start_span("icsaet.server_stats"):
+        return REGISTRY.snapshot()
 
 
-__all__ = ["mcp", "query", "query_icaet", "ICAETClient"]
+__all__ = [
+    "mcp",
+    "cache_stats",
+    "circuit_status",
+    "query",
+    "query_batch",
+    "query_batch_icaet",
+    "query_continue",
+    "query_icaet",
+    "query_icaet_async",
+    "search_local",
+    "server_stats",
+    "AsyncICAETClient",
+    "ICAETClient",
+]
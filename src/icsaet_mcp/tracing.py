@@ -0,0 +1,182 @@
+"""Optional OpenTelemetry tracing for tool calls and ICAET API requests."""
+
+import importlib.util
+import logging
+import sys
+import threading
+from collections.abc import Iterator, MutableMapping
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from icsaet_mcp.config import Settings
+
+if TYPE_CHECKING:
+    import httpx
+
+try:
+    from opentelemetry import propagate, trace
+    from opentelemetry.trace import Span, SpanKind, StatusCode
+except ImportError:  # pragma: no cover - opentelemetry-api ships with fastmcp
+    trace = None
+
+logger = logging.getLogger(__name__)
+
+TRACER_NAME = "icsaet_mcp"
+SERVICE_NAME = "icsaet-mcp"
+
+
+@contextmanager
+def start_span(
+    name: str, attributes: dict[str, Any] | None = None
+) -> Iterator["Span | None"]:
+    """Open a span as a child of the current one.
+
+    Spans are only recorded once configure_tracing has installed an
+    exporter (or the host process configured OpenTelemetry itself);
+    otherwise this is a no-op.
+
+    Args:
+        name: Span name.
+        attributes: Span attributes.
+
+    Yields:
+        The span, or None if opentelemetry-api is not installed.
+    """
+    if trace is None:
+        yield None
+        return
+    tracer = trace.get_tracer(TRACER_NAME)
+    with tracer.start_as_current_span(name, attributes=attributes) as span:
+        yield span
+
+
+@contextmanager
+def upstream_span(
+    method: str, url: "httpx.URL", headers: MutableMapping[str, str]
+) -> Iterator["Span | None"]:
+    """Open a client span for one ICAET API request.
+
+    Injects W3C trace-context headers (traceparent, tracestate) into
+    headers so the upstream can join the trace.
+
+    Args:
+        method: HTTP method.
+        url: Full request URL.
+        headers: Outgoing request headers, updated in place.
+
+    Yields:
+        The span, or None if opentelemetry-api is not installed.
+    """
+    if trace is None:
+        yield None
+        return
+    tracer = trace.get_tracer(TRACER_NAME)
+    with tracer.start_as_current_span(
+        f"{method} {url.path}",
+        kind=SpanKind.CLIENT,
+        attributes={
+            "http.request.method": method,
+            "url.full": str(url),
+            "server.address": url.host,
+        },
+    ) as span:
+        propagate.inject(headers)
+        yield span
+
+
+def record_response(span: "Span | None", response: "httpx.Response") -> None:
+    """Set status code and body size attributes on an upstream span."""
+    if span is None or not span.is_recording():
+        return
+    span.set_attribute("http.response.status_code", response.status_code)
+    span.set_attribute("http.response.body.size", response.num_bytes_downloaded)
+    if response.status_code >= 400:
+        span.set_status(StatusCode.ERROR, f"HTTP {response.status_code}")
+
+
+_provider: Any = None
+_trace_file: Any = None
+_provider_lock = threading.Lock()
+
+
+def configure_tracing(settings: Settings) -> bool:
+    """Install a tracer provider exporting spans per TRACE_EXPORTER.
+
+    "console" prints spans to stderr and "file" appends them as JSON lines
+    to TRACE_FILE. Requires opentelemetry-sdk; without it a warning is
+    logged and tracing stays disabled.
+
+    Args:
+        settings: Server settings holding the tracing configuration.
+
+    Returns:
+        True if an exporter was installed.
+    """
+    global _provider, _trace_file
+    if settings.trace_exporter == "none":
+        return False
+    if trace is None or importlib.util.find_spec("opentelemetry.sdk") is None:
+        logger.warning(
+            "TRACE_EXPORTER is set but opentelemetry-sdk is not installed; "
+            "tracing disabled. Install with: pip install 'icsaet-mcp[tracing]'"
+        )
+        return False
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        ConsoleSpanExporter,
+    )
+
+    with _provider_lock:
+        if _provider is not None:
+            return True
+        trace_file = None
+        if settings.trace_exporter == "file":
+            # Stays open for the provider's lifetime; shutdown_tracing closes it
+            trace_file = open(  # noqa: SIM115
+                settings.trace_file, "a", encoding="utf-8"
+            )
+            exporter = ConsoleSpanExporter(
+                out=trace_file, formatter=lambda span: span.to_json(indent=None) + "\n"
+            )
+        else:
+            # stdout carries the MCP protocol on the stdio transport
+            exporter = ConsoleSpanExporter(out=sys.stderr)
+        try:
+            provider = TracerProvider(
+                resource=Resource.create({"service.name": SERVICE_NAME})
+            )
+            provider.add_span_processor(BatchSpanProcessor(exporter))
+            trace.set_tracer_provider(provider)
+        except BaseException:
+            if trace_file is not None:
+                trace_file.close()
+            raise
+        _provider, _trace_file = provider, trace_file
+        logger.info(f"Tracing enabled with {settings.trace_exporter} exporter")
+        return True
+
+
+def shutdown_tracing() -> None:
+    """Flush and shut down the tracer provider installed by configure_tracing."""
+    global _provider, _trace_file
+    with _provider_lock:
+        try:
+            if _provider is not None:
+                _provider.shutdown()
+        finally:
+            _provider = None
+            if _trace_file is not None:
+                _trace_file.close()
+                _trace_file = None
+
+
+__all__ = [
+    "configure_tracing",
+    "record_response",
+    "shutdown_tracing",
+    "start_span",
+    "upstream_span",
+]
@@ -0,0 +1,175 @@
+"""HTTP and SSE transports for serving many MCP clients from one server."""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+from fastmcp.server.dependencies import get_http_request
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+from icsaet_mcp.config import HTTP_TRANSPORTS, Settings, get_settings
+
+if TYPE_CHECKING:
+    from fastmcp import FastMCP
+    from starlette.applications import Starlette
+
+logger = logging.getLogger(__name__)
+
+
+def client_address() -> str | None:
+    """Address of the HTTP client behind the current request.
+
+    Returns:
+        The peer host, or None outside an HTTP request (e.g. on stdio).
+    """
+    try:
+        request = get_http_request()
+    except RuntimeError:
+        return None
+    return request.client.host if request.client is not None else None
+
+
+class ClientConcurrencyMiddleware(Middleware):
+    """Limit how many tool calls each HTTP client has in flight.
+
+    Calls beyond the limit wait for one of the client's own calls to
+    finish, so a client firing many queries at once queues behind itself
+    instead of taking the shared connection pool and rate limit from
+    everyone else. Clients are identified by peer address; calls outside
+    HTTP requests are not limited.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._calls: dict[str, int] = {}
+
+    def in_flight(self, client: str) -> int:
+        """Tool calls from client that are running or waiting for a slot."""
+        return self._calls.get(client, 0)
+
+    async def on_call_tool(
+        self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]
+    ) -> Any:
+        client = client_address()
+        if client is None:
+            return await call_next(context)
+
+        slots = self._slots.setdefault(client, asyncio.Semaphore(self.limit))
+        self._calls[client] = self._calls.get(client, 0) + 1
+        if slots.locked():
+            logger.info(f"Client {client} has {self.limit} calls in flight; queueing")
+        try:
+            async with slots:
+                return await call_next(context)
+        finally:
+            self._calls[client] -= 1
+            if not self._calls[client]:
+                del self._calls[client]
+                del self._slots[client]
+
+
+def configure_http(server: "FastMCP[Any]", settings: Settings) -> None:
+    """Install the middleware used when serving clients over HTTP.
+
+    Args:
+        server: FastMCP server to configure.
+        settings: Server settings holding the per-client limit.
+    """
+    if settings.client_max_concurrency > 0:
+        server.add_middleware(
+            ClientConcurrencyMiddleware(settings.client_max_concurrency)
+        )
+
+
+def create_app() -> "Starlette":
+    """Build the stateless streamable HTTP app run by each worker process.
+
+    Used as a uvicorn factory when HTTP_WORKERS is above 1. Sessions are
+    stateless because consecutive requests from one client may reach
+    different workers.
+
+    Returns:
+        Starlette: ASGI app serving the MCP endpoint
+    """
+    from icsaet_mcp.server import mcp
+
+    configure_http(mcp, get_settings())
+    return mcp.http_app(transport="http", stateless_http=True)
+
+
+def serve_http(
+    server: "FastMCP[Any]",
+    settings: Settings,
+    transport: str,
+    host: str,
+    port: int,
+    workers: int = 1,
+) -> None:
+    """Serve MCP clients over streamable HTTP or SSE until shut down.
+
+    On SIGINT or SIGTERM the server stops accepting connections, gives
+    in-flight requests SHUTDOWN_TIMEOUT_SECONDS to finish, then runs the
+    server lifespan to close the connection pool and caches.
+
+    Args:
+        server: FastMCP server with tools and prompts registered.
+        settings: Server settings.
+        transport: "http" for streamable HTTP, or "sse".
+        host: Interface to bind to.
+        port: Port to listen on.
+        workers: Server processes sharing the port; above 1 requires the
+            http transport.
+
+    Raises:
+        RuntimeError: If the worker count is incompatible with the
+            transport or metrics listener.
+    """
+    uvicorn_config = {"timeout_graceful_shutdown": settings.shutdown_timeout_seconds}
+    if workers > 1:
+        if transport == "sse":
+            raise RuntimeError(
+                "SSE sessions cannot be shared by multiple workers. "
+                "Use --transport http or a single worker."
+            )
+        if settings.metrics_port is not None:
+            raise RuntimeError(
+                "METRICS_PORT cannot be bound by multiple workers. "
+                "Unset it or use a single worker."
+            )
+        if settings.answer_page_chars > 0 and not settings.cache_dir:
+            logger.warning(
+                "query_continue tokens are only known to the worker that issued "
+                "them; set CACHE_DIR to share them between workers"
+            )
+        import uvicorn
+
+        logger.info(f"Serving MCP over http on {host}:{port} with {workers} workers")
+        uvicorn.run(
+            f"{__name__}:create_app",
+            factory=True,
+            host=host,
+            port=port,
+            workers=workers,
+            **uvicorn_config,
+        )
+        return
+
+    configure_http(server, settings)
+    server.run(
+        transport=transport,
+        show_banner=False,
+        host=host,
+        port=port,
+        uvicorn_config=uvicorn_config,
+    )
+
+
+__all__ = [
+    "HTTP_TRANSPORTS",
+    "ClientConcurrencyMiddleware",
+    "client_address",
+    "configure_http",
+    "create_app",
+    "serve_http",
+]
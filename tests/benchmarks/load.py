@@ -0,0 +1,175 @@
+"""Load driver for the query tool, run through a real FastMCP client.
+
+Usage:
+    PYTHONPATH=src python -m tests.benchmarks.load --concurrency 1,8,32
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass
+from itertools import count
+
+from fastmcp import Client
+
+from icsaet_mcp.cache import close_disk_cache, reset_answer_cache
+from icsaet_mcp.client import close_async_client, close_client
+from icsaet_mcp.config import get_settings
+from icsaet_mcp.resilience import reset_circuit_breaker, reset_retry_budget
+
+from .mock_server import MockICAETServer
+
+_question_ids = count()
+
+
+@dataclass
+class LoadReport:
+    """Latency and throughput for one concurrency level."""
+
+    concurrency: int
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    requests_per_second: float
+    peak_traced_mb: float | None
+    max_rss_mb: float
+
+    def row(self) -> str:
+        traced = "-" if self.peak_traced_mb is None else f"{self.peak_traced_mb:.2f}"
+        return (
+            f"{self.concurrency:>11} {self.requests:>8} {self.errors:>6} "
+            f"{self.p50_ms:>8.1f} {self.p95_ms:>8.1f} {self.p99_ms:>8.1f} "
+            f"{self.requests_per_second:>8.1f} {traced:>9} {self.max_rss_mb:>8.1f}"
+        )
+
+
+HEADER = (
+    f"{'concurrency':>11} {'requests':>8} {'errors':>6} {'p50 ms':>8} "
+    f"{'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'traced MB':>9} {'rss MB':>8}"
+)
+
+
+def configure(server: MockICAETServer, max_connections: int) -> None:
+    """Point the in-process server at the mock and reset shared state."""
+    os.environ.update(
+        {
+            "ICAET_API_KEY": "benchmark-api-key",
+            "USER_EMAIL": "bench@example.com",
+            "ICAET_BASE_URL": server.base_url,
+            "ICAET_MAX_CONNECTIONS": str(max_connections),
+            "ICAET_MAX_KEEPALIVE_CONNECTIONS": str(max_connections),
+            "CACHE_ENABLED": "false",
+            "STREAM_ANSWERS": "false",
+        }
+    )
+    get_settings.cache_clear()
+    reset_answer_cache()
+    close_disk_cache()
+    reset_retry_budget()
+    reset_circuit_breaker()
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of samples."""
+    ordered = sorted(samples)
+    index = max(round(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+async def run_level(
+    concurrency: int, requests: int, trace_memory: bool = False
+) -> LoadReport:
+    """Send requests query tool calls with concurrency callers in flight.
+
+    tracemalloc slows Python down considerably, so peak traced memory is
+    only measured when trace_memory is set; max RSS is always reported.
+    """
+    from icsaet_mcp.server import mcp
+
+    latencies: list[float] = []
+    errors = 0
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(next(_question_ids))
+
+    async def worker(client: Client) -> None:
+        nonlocal errors
+        while not queue.empty():
+            question_id = queue.get_nowait()
+            start = time.perf_counter()
+            result = await client.call_tool(
+                "query",
+                {"question": f"Benchmark question {question_id}"},
+                raise_on_error=False,
+            )
+            latencies.append(time.perf_counter() - start)
+            errors += int(result.is_error)
+
+    if trace_memory:
+        tracemalloc.start()
+    async with Client(mcp) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    peak_traced_mb = None
+    if trace_memory:
+        peak_traced_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+    close_client()
+    await close_async_client()
+
+    return LoadReport(
+        concurrency=concurrency,
+        requests=requests,
+        errors=errors,
+        p50_ms=statistics.median(latencies) * 1000,
+        p95_ms=percentile(latencies, 95) * 1000,
+        p99_ms=percentile(latencies, 99) * 1000,
+        requests_per_second=requests / elapsed,
+        peak_traced_mb=peak_traced_mb,
+        max_rss_mb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    )
+
+
+async def run_benchmark(
+    server: MockICAETServer,
+    levels: list[int],
+    requests_per_level: int,
+    trace_memory: bool = False,
+) -> list[LoadReport]:
+    """Run each concurrency level against server and return the reports."""
+    configure(server, max_connections=max(levels))
+    return [
+        await run_level(level, requests_per_level, trace_memory) for level in levels
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", default="1,4,16,64")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--payload-size", type=int, default=2048)
+    parser.add_argument("--trace-memory", action="store_true")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    with MockICAETServer(args.latency, args.error_rate, args.payload_size) as server:
+        reports = asyncio.run(
+            run_benchmark(server, levels, args.requests, args.trace_memory)
+        )
+
+    print(HEADER)
+    for report in reports:
+        print(report.row())
+
+
+if __name__ == "__main__":
+    main()
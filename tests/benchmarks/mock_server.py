@@ -0,0 +1,92 @@
+"""Local stand-in for the ICAET /query endpoint used by benchmarks."""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Self
+
+
+class MockICAETServer:
+    """Threaded HTTP server answering POST /query.
+
+    Args:
+        latency: Seconds each answer takes.
+        error_rate: Fraction of requests answered with a 503.
+        payload_size: Length of the answer text in characters.
+    """
+
+    def __init__(
+        self, latency: float = 0.05, error_rate: float = 0.0, payload_size: int = 512
+    ) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.payload_size = payload_size
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> Self:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; avoid delayed-ACK stalls
+            disable_nagle_algorithm = True
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("content-length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                with server._lock:
+                    server.requests += 1
+                time.sleep(server.latency)
+
+                if self.path != "/query":
+                    self._send(404, {"detail": "not found"})
+                elif random.random() < server.error_rate:
+                    self._send(503, {"detail": "unavailable"})
+                else:
+                    question = str(payload.get("question", ""))
+                    filler = "x" * max(server.payload_size - len(question), 0)
+                    self._send(200, {"answer": f"{question}{filler}"})
+
+            def _send(self, status: int, body: dict[str, str]) -> None:
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        return Handler
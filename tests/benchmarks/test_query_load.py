@@ -0,0 +1,69 @@
+"""Load benchmarks for the query tool against a local mock ICAET server.
+
+These tests are skipped by default. Run them with:
+    RUN_BENCHMARKS=1 pytest -m benchmark tests/benchmarks -s
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from .load import HEADER, run_benchmark
+from .mock_server import MockICAETServer
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not os.getenv("RUN_BENCHMARKS"),
+        reason="Set RUN_BENCHMARKS=1 to run load benchmarks",
+    ),
+]
+
+
+@pytest.fixture
+def restore_env():
+    saved = dict(os.environ)
+    yield
+    os.environ.clear()
+    os.environ.update(saved)
+
+
+def test_throughput_scales_with_concurrency(restore_env):
+    """Arrange: Mock server answering in 50ms
+    Act: Drive the query tool at concurrency 1, 8 and 32
+    Assert: Throughput scales, proving calls are not serialized"""
+    with MockICAETServer(latency=0.05) as server:
+        reports = asyncio.run(run_benchmark(server, [1, 8, 32], 96))
+
+    print(f"\n{HEADER}")
+    for report in reports:
+        print(report.row())
+
+    single, _, wide = reports
+    assert all(report.errors == 0 for report in reports)
+    assert wide.requests_per_second > 8 * single.requests_per_second
+    assert wide.p50_ms < 10 * single.p50_ms
+
+
+def test_error_rate_is_absorbed_by_retries(restore_env):
+    """Arrange: Mock server failing 10% of requests with 503
+    Act: Drive the query tool at concurrency 8
+    Assert: Retries keep the error rate well below the injected rate"""
+    with MockICAETServer(latency=0.01, error_rate=0.1) as server:
+        (report,) = asyncio.run(run_benchmark(server, [8], 200))
+
+    print(f"\n{HEADER}\n{report.row()}")
+    assert report.errors < 0.05 * report.requests
+
+
+def test_large_payloads_stay_within_memory_budget(restore_env):
+    """Arrange: Mock server returning 256 KiB answers
+    Act: Drive the query tool at concurrency 16
+    Assert: Peak traced memory stays bounded"""
+    with MockICAETServer(latency=0.01, payload_size=256 * 1024) as server:
+        (report,) = asyncio.run(run_benchmark(server, [16], 64, trace_memory=True))
+
+    print(f"\n{HEADER}\n{report.row()}")
+    assert report.errors == 0
+    assert report.peak_traced_mb < 64
@@ -0,0 +1,54 @@
+"""Lookup latency benchmark for the semantic answer cache.
+
+Skipped by default. Run with:
+    RUN_BENCHMARKS=1 pytest -m benchmark tests/benchmarks/test_semantic_lookup.py -s
+"""
+
+import os
+import random
+import time
+
+import pytest
+
+from icsaet_mcp.semantic import numpy_available
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not os.getenv("RUN_BENCHMARKS"),
+        reason="Set RUN_BENCHMARKS=1 to run load benchmarks",
+    ),
+    pytest.mark.skipif(not numpy_available(), reason="numpy not installed"),
+]
+
+WORDS = (
+    "platform", "engineering", "data", "ai", "ethics", "security", "devops",
+    "observability", "kubernetes", "leadership", "culture", "productivity", "testing",
+    "architecture", "cloud", "latency", "resilience", "teams", "hiring", "mentoring",
+    "design",
+)  # fmt: skip
+
+
+def test_lookup_latency_at_100k_entries():
+    """Arrange: Semantic cache holding 100k distinct questions
+    Act: Time 200 lookups
+    Assert: Median lookup stays under a millisecond"""
+    from icsaet_mcp.semantic import SemanticCache
+
+    rng = random.Random(0)
+    cache = SemanticCache(threshold=0.85, ttl_seconds=3600, max_entries=100_000)
+    for n in range(100_000):
+        topic = " ".join(rng.sample(WORDS, 3))
+        cache.set("bench@example.com", f"What did speaker {n} say about {topic}?", "a")
+
+    timings = []
+    for _ in range(200):
+        question = f"Who covered {' '.join(rng.sample(WORDS, 2))}?"
+        start = time.perf_counter()
+        cache.get("bench@example.com", question)
+        timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    median_ms = timings[len(timings) // 2] * 1000
+    print(f"\nsemantic lookup at 100k entries: median {median_ms:.2f} ms")
+    assert median_ms < 1
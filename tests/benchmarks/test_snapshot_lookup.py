@@ -0,0 +1,71 @@
+"""Lookup latency benchmark for the local knowledge snapshot.
+
+Skipped by default. Run with:
+    RUN_BENCHMARKS=1 pytest -m benchmark tests/benchmarks/test_snapshot_lookup.py -s
+"""
+
+import os
+import random
+import time
+
+import pytest
+
+from icsaet_mcp.snapshot import ANSWER_SOURCE, KnowledgeSnapshot
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not os.getenv("RUN_BENCHMARKS"),
+        reason="Set RUN_BENCHMARKS=1 to run load benchmarks",
+    ),
+]
+
+USER = "bench@example.com"
+
+WORDS = (
+    "platform", "engineering", "data", "ai", "ethics", "security", "devops",
+    "observability", "kubernetes", "leadership", "culture", "productivity", "testing",
+    "architecture", "cloud", "latency", "resilience", "teams", "hiring", "mentoring",
+    "design",
+)  # fmt: skip
+
+
+def median_ms(timings: list[float]) -> float:
+    return sorted(timings)[len(timings) // 2] * 1000
+
+
+def test_lookup_latency_at_100k_documents(tmp_path):
+    """Arrange: Snapshot holding 100k recorded answers
+    Act: Time 200 fast-path lookups and searches
+    Assert: Median lookups stay under a millisecond"""
+    rng = random.Random(0)
+    snapshot = KnowledgeSnapshot(tmp_path / "snapshot.sqlite3")
+    snapshot.add_many(
+        (
+            f"What did speaker {n} say about {' '.join(rng.sample(WORDS, 3))}?",
+            "answer",
+            ANSWER_SOURCE,
+            USER,
+        )
+        for n in range(100_000)
+    )
+
+    answer_timings = []
+    search_timings = []
+    for n in range(200):
+        question = f"What did speaker {n} say about {' '.join(rng.sample(WORDS, 3))}?"
+        start = time.perf_counter()
+        snapshot.answer(question, USER)
+        answer_timings.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        snapshot.search(f"speaker {n}", user_email=USER)
+        search_timings.append(time.perf_counter() - start)
+    snapshot.close()
+
+    print(
+        f"\nsnapshot at 100k documents: answer median "
+        f"{median_ms(answer_timings):.2f} ms, search median "
+        f"{median_ms(search_timings):.2f} ms"
+    )
+    assert median_ms(answer_timings) < 1
+    assert median_ms(search_timings) < 1
@@ -0,0 +1,115 @@
+"""Cold start benchmarks for the stdio server.
+
+Cursor launches `python -m icsaet_mcp` on demand, so the time until the
+server answers the MCP initialize request is user-visible latency.
+
+Skipped by default. Run with:
+    RUN_BENCHMARKS=1 pytest -m benchmark tests/benchmarks/test_startup.py -s
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not os.getenv("RUN_BENCHMARKS"),
+        reason="Set RUN_BENCHMARKS=1 to run load benchmarks",
+    ),
+]
+
+RUNS = 5
+IMPORT_BUDGET_SECONDS = 2.0
+READY_BUDGET_SECONDS = 3.0
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-06-18",
+        "capabilities": {},
+        "clientInfo": {"name": "startup-benchmark", "version": "0"},
+    },
+}
+
+
+def server_env() -> dict[str, str]:
+    return {
+        **os.environ,
+        "ICAET_API_KEY": "benchmark-key",
+        "USER_EMAIL": "bench@example.com",
+        "FASTMCP_CHECK_FOR_UPDATES": "off",
+    }
+
+
+def median(timings: list[float]) -> float:
+    return sorted(timings)[len(timings) // 2]
+
+
+def time_import() -> float:
+    """Seconds to import the server, tools and prompts in a fresh interpreter."""
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            (
+                "import time; start = time.perf_counter(); import icsaet_mcp.server; "
+                "print(time.perf_counter() - start)"
+            ),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=server_env(),
+    ).stdout
+    return float(output)
+
+
+def time_to_ready() -> float:
+    """Seconds from process launch until the initialize response arrives."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "icsaet_mcp"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=server_env(),
+        text=True,
+    )
+    try:
+        assert process.stdin is not None and process.stdout is not None
+        process.stdin.write(json.dumps(INITIALIZE) + "\n")
+        process.stdin.flush()
+        response = json.loads(process.stdout.readline())
+        elapsed = time.perf_counter() - start
+        assert response["id"] == 1 and "result" in response
+        return elapsed
+    finally:
+        process.kill()
+        process.wait()
+
+
+def test_import_time_within_budget():
+    """Arrange: Fresh interpreters
+    Act: Time importing the server module
+    Assert: Median import time stays within the budget"""
+    seconds = median([time_import() for _ in range(RUNS)])
+
+    print(f"\nserver import: median {seconds * 1000:.0f} ms")
+    assert seconds < IMPORT_BUDGET_SECONDS
+
+
+def test_time_to_ready_within_budget():
+    """Arrange: Fresh server processes with valid configuration
+    Act: Time launch until the initialize response
+    Assert: Median time-to-ready stays within the budget"""
+    seconds = median([time_to_ready() for _ in range(RUNS)])
+
+    print(f"\ntime to ready: median {seconds * 1000:.0f} ms")
+    assert seconds < READY_BUDGET_SECONDS
@@ -0,0 +1,118 @@
+"""Bytes saved by response compression and JSON decode time on large answers.
+
+Skipped by default. Run with:
+    RUN_BENCHMARKS=1 pytest -m benchmark tests/benchmarks/test_wire_encoding.py -s
+"""
+
+import gzip
+import importlib.util
+import json
+import os
+import random
+import time
+from collections.abc import Callable
+
+import httpx
+import pytest
+import respx
+
+from icsaet_mcp import codec
+from icsaet_mcp.client import ICAETClient
+from icsaet_mcp.config import Settings
+from icsaet_mcp.metrics import UPSTREAM_BYTES_RECEIVED
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not os.getenv("RUN_BENCHMARKS"),
+        reason="Set RUN_BENCHMARKS=1 to run load benchmarks",
+    ),
+]
+
+WORDS = (
+    "platform", "engineering", "keynote", "session", "speaker", "observability",
+    "security", "teams", "culture", "latency", "resilience", "leadership", "data", "ai",
+    "ethics", "devops", "architecture",
+)  # fmt: skip
+
+
+def large_answer(words: int) -> bytes:
+    """A JSON /query body with a long answer and a list of sources."""
+    rng = random.Random(0)
+    return json.dumps(
+        {
+            "answer": " ".join(rng.choice(WORDS) for _ in range(words)),
+            "sources": [
+                {"title": f"Session {n}", "url": f"https://icaet.example/{n}"}
+                for n in range(200)
+            ],
+        }
+    ).encode()
+
+
+def encoders() -> dict[str, Callable[[bytes], bytes]]:
+    """Compressors for every coding the client can negotiate here."""
+    available: dict[str, Callable[[bytes], bytes]] = {"gzip": gzip.compress}
+    if importlib.util.find_spec("brotli"):
+        import brotli
+
+        available["br"] = brotli.compress
+    if importlib.util.find_spec("zstandard"):
+        import zstandard
+
+        available["zstd"] = zstandard.ZstdCompressor().compress
+    return available
+
+
+@respx.mock
+def test_compression_bytes_saved_on_large_answers():
+    """Arrange: 500 KB JSON answer served with each installed coding
+    Act: Query through ICAETClient and read the wire byte counter
+    Assert: Every coding saves most of the bytes; gzip at least 70%"""
+    body = large_answer(60_000)
+    settings = Settings.model_construct(
+        icaet_api_key="bench-key", user_email="bench@example.com"
+    )
+    print(f"\nidentity: {len(body)} bytes")
+
+    ratios = {}
+    for coding, compress in encoders().items():
+        encoded = compress(body)
+        respx.post(f"{ICAETClient.BASE_URL}/query").mock(
+            return_value=httpx.Response(
+                200, headers={"content-encoding": coding}, content=encoded
+            )
+        )
+        before = UPSTREAM_BYTES_RECEIVED.value()
+        with ICAETClient(settings) as client:
+            result = client.query("Everything about platforms?")
+        received = UPSTREAM_BYTES_RECEIVED.value() - before
+
+        assert result == json.loads(body)
+        ratios[coding] = received / len(body)
+        print(f"{coding}: {received:.0f} bytes ({1 - ratios[coding]:.0%} saved)")
+
+    assert all(ratio < 0.5 for ratio in ratios.values())
+    assert ratios["gzip"] < 0.3
+
+
+def test_json_decode_time_on_large_answers():
+    """Arrange: 500 KB JSON answer
+    Act: Time 200 decodes with the standard library and with the codec
+    Assert: The codec (orjson when installed) is no slower than json"""
+    body = large_answer(60_000)
+
+    def median_ms(loads: Callable[[bytes], object]) -> float:
+        timings = []
+        for _ in range(200):
+            start = time.perf_counter()
+            loads(body)
+            timings.append(time.perf_counter() - start)
+        return sorted(timings)[len(timings) // 2] * 1000
+
+    baseline = median_ms(json.loads)
+    fast = median_ms(codec.loads)
+    name = "orjson" if codec.orjson_available() else "json"
+
+    print(f"\ndecode {len(body)} bytes: json {baseline:.2f} ms, {name} {fast:.2f} ms")
+    assert fast <= baseline * 1.1
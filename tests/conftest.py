@@ -0,0 +1,68 @@
+"""Shared pytest fixtures."""
+
+import asyncio
+from collections.abc import Callable
+
+import pytest
+
+from icsaet_mcp.answers import reset_continuation_store
+from icsaet_mcp.cache import close_disk_cache, reset_answer_cache
+from icsaet_mcp.client import close_async_client, close_client
+from icsaet_mcp.config import Settings
+from icsaet_mcp.hedging import reset_hedge_policy
+from icsaet_mcp.metrics import REGISTRY, stop_metrics_server
+from icsaet_mcp.ratelimit import reset_rate_limiter
+from icsaet_mcp.refresh import close_refresher
+from icsaet_mcp.resilience import reset_circuit_breaker, reset_retry_budget
+from icsaet_mcp.scheduler import reset_scheduler
+from icsaet_mcp.semantic import reset_semantic_cache
+from icsaet_mcp.snapshot import close_snapshot
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_state():
+    """Drop process-wide clients and caches so state never leaks between tests."""
+    yield
+    close_client()
+    asyncio.run(close_async_client())
+    asyncio.run(close_refresher())
+    reset_answer_cache()
+    reset_continuation_store()
+    close_disk_cache()
+    reset_retry_budget()
+    reset_circuit_breaker()
+    reset_hedge_policy()
+    reset_rate_limiter()
+    reset_scheduler()
+    reset_semantic_cache()
+    close_snapshot()
+    stop_metrics_server()
+    REGISTRY.reset()
+
+
+class FakeClock:
+    """Manually advanced stand-in for time.monotonic or time.time."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Clock that only moves when a test sets or advances ``now``."""
+    return FakeClock()
+
+
+@pytest.fixture
+def make_settings() -> Callable[..., Settings]:
+    """Build test Settings without reading the environment or validating."""
+
+    def make(**overrides) -> Settings:
+        options = {"icaet_api_key": "test-key", "user_email": "test@example.com"}
+        options.update(overrides)
+        return Settings.model_construct(**options)
+
+    return make
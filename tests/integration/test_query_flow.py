@@ -4,8 +4,10 @@ from unittest.mock import MagicMock, patch
 
 import httpx
 import pytest
+import respx
+from fastmcp import Client
 
-from icsaet_mcp.tools import query_icaet
+from icsaet_mcp.tools import ICAETClient, query_icaet
 
 
 @pytest.mark.integration
@@ -18,7 +20,7 @@ def test_full_query_flow_with_valid_config(monkeypatch):
 
     with patch("httpx.Client") as mock_client:
         mock_response = MagicMock()
-        mock_response.json.return_value = {"answer": "Integration test answer"}
+        mock_response.content = b'{"answer": "Integration test answer"}'
         mock_client.return_value.post.return_value = mock_response
 
         from icsaet_mcp.config import get_settings
@@ -110,3 +112,60 @@ def test_prompt_content_integration():
     assert "question" in examples.lower()
     assert "tip" in guidance.lower() or "do" in guidance.lower()
 
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@respx.mock
+async def test_query_tool_through_mcp_client(monkeypatch):
+    """Arrange: Valid config, mocked API and an in-memory MCP client
+    Act: Call the query tool over the MCP protocol
+    Assert: Returns answer from API"""
+    monkeypatch.setenv("ICAET_API_KEY", "test-api-key-12345")
+    monkeypatch.setenv("USER_EMAIL", "test@example.com")
+    respx.post(f"{ICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(200, json={"answer": "MCP answer"})
+    )
+
+    from icsaet_mcp.config import get_settings
+    from icsaet_mcp.server import mcp
+
+    get_settings.cache_clear()
+
+    async with Client(mcp) as client:
+        result = await client.call_tool("query", {"question": "What is ICAET?"})
+
+    assert result.data == "MCP answer"
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@respx.mock
+async def test_query_tool_streams_progress_to_mcp_client(monkeypatch):
+    """Arrange: Upstream streaming SSE and an MCP client with a progress handler
+    Act: Call the query tool
+    Assert: Partial answers arrive as progress notifications before the result"""
+    monkeypatch.setenv("ICAET_API_KEY", "test-api-key-12345")
+    monkeypatch.setenv("USER_EMAIL", "test@example.com")
+    body = b'data: {"delta": "Part one, "}\n\ndata: {"delta": "part two."}\n\n'
+    respx.post(f"{ICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(
+            200, headers={"content-type": "text/event-stream"}, content=body
+        )
+    )
+    progress: list[tuple[float, str | None]] = []
+
+    async def on_progress(value: float, total: float | None, message: str | None):
+        progress.append((value, message))
+
+    from icsaet_mcp.config import get_settings
+    from icsaet_mcp.server import mcp
+
+    get_settings.cache_clear()
+
+    async with Client(mcp) as client:
+        result = await client.call_tool(
+            "query", {"question": "Stream it"}, progress_handler=on_progress
+        )
+
+    assert result.data == "Part one, part two."
+    assert progress == [(10.0, "Part one, "), (19.0, "part two.")]
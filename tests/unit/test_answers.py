@@ -0,0 +1,258 @@
+"""Unit tests for answer rendering and pagination."""
+
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from icsaet_mcp.answers import (
+    ContinuationStore,
+    SharedContinuationStore,
+    extract_sources,
+    extract_speakers,
+    get_continuation_store,
+    render_answer,
+    reset_continuation_store,
+)
+from icsaet_mcp.tools import lifespan, mcp, query, query_batch, query_continue
+
+
+def test_render_answer_returns_plain_answer_unchanged():
+    """Arrange: Response with only an answer
+    Act: Render it
+    Assert: The answer string itself is returned"""
+    answer = "Leslie Miley spoke about AI ethics."
+
+    assert render_answer({"answer": answer}) is answer
+
+
+def test_render_answer_appends_speakers_and_sources():
+    """Arrange: Response with speakers and sources in mixed shapes
+    Act: Render it
+    Assert: Answer followed by unique speakers and "title (url)" sources"""
+    result = {
+        "answer": "Two keynotes covered platforms.",
+        "speakers": [{"name": "Leslie Miley"}, "Nicole Forsgren", "Leslie Miley"],
+        "sources": [
+            {"title": "Keynote", "url": "https://icaet.example/1"},
+            "Workshop notes",
+        ],
+    }
+
+    assert render_answer(result) == (
+        "Two keynotes covered platforms.\n\n"
+        "Speakers: Leslie Miley, Nicole Forsgren\n\n"
+        "Sources:\n- Keynote (https://icaet.example/1)\n- Workshop notes"
+    )
+
+
+def test_render_answer_without_text_field_is_json():
+    """Arrange: Response without an answer field
+    Act: Render it
+    Assert: Compact JSON instead of a Python repr"""
+    assert render_answer({"result": "ok"}) == '{"result":"ok"}'
+
+
+def test_extract_fields_cap_long_lists():
+    """Arrange: Response listing 25 sources under "references" and a single speaker
+    Act: Render and extract
+    Assert: 20 sources shown then a count of the rest"""
+    result = {
+        "answer": "Many sessions.",
+        "speaker": {"name": "Solo"},
+        "references": [{"url": f"https://icaet.example/{n}"} for n in range(25)],
+    }
+
+    rendered = render_answer(result)
+
+    assert extract_speakers(result) == ["Solo"]
+    assert len(extract_sources(result)) == 25
+    assert rendered.count("\n- https://") == 20
+    assert rendered.endswith("\n- ... and 5 more")
+
+
+def test_paginate_short_answer_is_unchanged():
+    """Arrange: Store with 100-character pages
+    Act: Paginate a short answer
+    Assert: Returned as is and nothing stored"""
+    store = ContinuationStore(page_chars=100, ttl_seconds=60, max_entries=4)
+
+    assert store.paginate("short") == "short"
+    assert len(store) == 0
+
+
+def test_pages_join_back_to_the_full_answer():
+    """Arrange: Store with 50-character pages and a 300-character answer
+    Act: Follow continuation tokens to the end
+    Assert: Pages break between words and join back to the answer"""
+    store = ContinuationStore(page_chars=50, ttl_seconds=60, max_entries=4)
+    answer = " ".join(f"word{n:02d}" for n in range(43))
+    pages = []
+
+    page = store.paginate(answer)
+    while '"' in page:
+        text, _, note = page.partition("\n\n[Answer truncated")
+        pages.append(text)
+        assert text.endswith(" ")
+        page = store.next_page(note.split('"')[1])
+    pages.append(page)
+
+    assert "".join(pages) == answer
+    assert len(pages) > 5
+    assert all(len(p) <= 50 for p in pages)
+
+
+def test_continuation_tokens_expire(clock):
+    """Arrange: Store with a 10 second token lifetime
+    Act: Read the next page 11 seconds later
+    Assert: RuntimeError asks to re-ask the question"""
+    store = ContinuationStore(page_chars=10, ttl_seconds=10, max_entries=4, clock=clock)
+    token = store.paginate("a" * 30).split('"')[1]
+    clock.now = 11
+
+    with pytest.raises(RuntimeError, match="expired"):
+        store.next_page(token)
+    assert len(store) == 0
+
+
+def test_continuation_store_evicts_least_recently_read():
+    """Arrange: Store keeping two answers
+    Act: Paginate three answers
+    Assert: The first token no longer works"""
+    store = ContinuationStore(page_chars=10, ttl_seconds=60, max_entries=2)
+    tokens = [store.paginate(c * 30).split('"')[1] for c in "abc"]
+
+    with pytest.raises(RuntimeError):
+        store.next_page(tokens[0])
+    assert store.next_page(tokens[2]).startswith("c")
+
+
+def test_next_page_rejects_malformed_token():
+    """Arrange: Empty store
+    Act: Read a page with a token missing its offset
+    Assert: ValueError"""
+    store = ContinuationStore(page_chars=10, ttl_seconds=60, max_entries=2)
+
+    with pytest.raises(ValueError, match="Invalid continuation token"):
+        store.next_page("nonsense")
+
+
+def test_shared_store_serves_tokens_from_other_workers(tmp_path, clock):
+    """Arrange: Two shared stores on one directory, as in two HTTP workers
+    Act: Paginate on one and read the following pages through the other
+    Assert: The pages join back to the full answer"""
+    first, second = (
+        SharedContinuationStore(
+            tmp_path, page_chars=10, ttl_seconds=60, max_entries=4, clock=clock
+        )
+        for _ in range(2)
+    )
+    answer = "".join(f"{n:02d} " for n in range(10))
+
+    pages = [first.paginate(answer)]
+    while "continuation_token" in pages[-1]:
+        token = pages[-1].rsplit('"', 2)[1]
+        pages.append(second.next_page(token))
+
+    assert "".join(page.split("\n\n[")[0] for page in pages) == answer
+    assert len(second) == 1
+    first.close()
+    second.close()
+
+
+def test_shared_store_expires_and_evicts_answers(tmp_path, clock):
+    """Arrange: Shared store keeping two answers for 10 seconds
+    Act: Paginate three answers, then read one after it expired
+    Assert: The least recently read is evicted and expired tokens fail"""
+    store = SharedContinuationStore(
+        tmp_path, page_chars=10, ttl_seconds=10, max_entries=2, clock=clock
+    )
+    tokens = []
+    for c in "abc":
+        clock.now += 1
+        tokens.append(store.paginate(c * 30).split('"')[1])
+
+    with pytest.raises(RuntimeError, match="expired"):
+        store.next_page(tokens[0])
+    assert store.next_page(tokens[2]).startswith("c")
+    clock.now += 11
+    with pytest.raises(RuntimeError, match="expired"):
+        store.next_page(tokens[2])
+    store.close()
+
+
+def test_get_continuation_store_shares_tokens_when_cache_dir_set(
+    tmp_path, make_settings
+):
+    """Arrange: Settings with and without CACHE_DIR
+    Act: Get the process-wide continuation store
+    Assert: A SharedContinuationStore is used only when CACHE_DIR is set"""
+    options = {
+        "answer_page_chars": 40,
+        "continuation_ttl_seconds": 60,
+        "continuation_max_entries": 8,
+    }
+    local = get_continuation_store(make_settings(**options))
+    assert type(local) is ContinuationStore
+
+    reset_continuation_store()
+    store = get_continuation_store(make_settings(cache_dir=str(tmp_path), **options))
+
+    assert isinstance(store, SharedContinuationStore)
+    assert store.path.parent == tmp_path
+
+
+@pytest.mark.asyncio
+async def test_lifespan_closes_shared_continuation_store(tmp_path, make_settings):
+    """Arrange: SharedContinuationStore created during the server lifetime
+    Act: Exit the server lifespan
+    Assert: Its database connection is closed and the store dropped"""
+    settings = make_settings(cache_dir=str(tmp_path), answer_page_chars=40)
+
+    async with lifespan(mcp):
+        store = get_continuation_store(settings)
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        len(store)
+    assert get_continuation_store(settings) is not store
+
+
+@pytest.mark.asyncio
+async def test_query_tools_page_long_answers(make_settings):
+    """Arrange: 40-character pages and a 100-character answer
+    Act: Call query and query_batch, then query_continue
+    Assert: Answers are truncated with a token that returns the rest"""
+    answer = "x" * 100
+    settings = make_settings(
+        answer_page_chars=40, continuation_ttl_seconds=60, continuation_max_entries=8
+    )
+
+    with (
+        patch("icsaet_mcp.tools.get_settings", return_value=settings),
+        patch("icsaet_mcp.tools.query_icaet_async", return_value=answer),
+    ):
+        first = await query("Long?")
+        [batch] = await query_batch(["Long?"])
+        second = query_continue(first.split('"')[1])
+
+    assert first.startswith("x" * 40 + "\n\n[Answer truncated: 60 more characters")
+    assert batch["answer"].startswith("x" * 40 + "\n\n")
+    assert second.startswith("x" * 40 + "\n\n[Answer truncated: 20 more")
+    assert get_continuation_store(settings) is get_continuation_store(settings)
+
+
+@pytest.mark.asyncio
+async def test_query_returns_whole_answer_when_paging_disabled(make_settings):
+    """Arrange: ANSWER_PAGE_CHARS=0
+    Act: Call query with a long answer
+    Assert: The whole answer is returned"""
+    answer = "y" * 50_000
+    settings = make_settings(
+        answer_page_chars=0, continuation_ttl_seconds=60, continuation_max_entries=8
+    )
+
+    with (
+        patch("icsaet_mcp.tools.get_settings", return_value=settings),
+        patch("icsaet_mcp.tools.query_icaet_async", return_value=answer),
+    ):
+        assert await query("Long?") == answer
@@ -0,0 +1,329 @@
+"""Unit tests for the in-memory and on-disk answer caches."""
+
+import multiprocessing
+from unittest.mock import patch
+
+import httpx
+
+from icsaet_mcp.cache import (
+    AnswerCache,
+    DiskAnswerCache,
+    cache_key,
+    close_disk_cache,
+    normalize_question,
+    reset_answer_cache,
+)
+from icsaet_mcp.config import Settings
+from icsaet_mcp.tools import cache_stats, query_icaet
+
+
+def make_cache(clock, **overrides) -> AnswerCache:
+    options = {"ttl_seconds": 60.0, "max_entries": 10, "max_bytes": 10_000}
+    options.update(overrides)
+    return AnswerCache(clock=clock, **options)
+
+
+def test_normalize_question_ignores_case_whitespace_and_punctuation():
+    """Arrange: Two phrasings differing only in case, spacing and '?'
+    Act: Normalize both
+    Assert: Normalized forms are equal"""
+    first = normalize_question("What did Leslie Miley talk about?")
+    second = normalize_question("  what did   leslie miley talk about ")
+
+    assert first == second == "what did leslie miley talk about"
+
+
+def test_cache_key_is_scoped_per_user():
+    """Arrange: Same question from two users
+    Act: Build cache keys
+    Assert: Keys differ"""
+    assert cache_key("a@example.com", "Q?") != cache_key("b@example.com", "Q?")
+    assert cache_key("A@example.com", "Q?") == cache_key("a@example.com", "q")
+
+
+def test_get_counts_hits_and_misses(clock):
+    """Arrange: Cache with one entry
+    Act: Get a present and a missing key
+    Assert: Hit and miss counters updated"""
+    cache = make_cache(clock)
+    cache.set("k", "answer")
+
+    assert cache.get("k") == "answer"
+    assert cache.get("missing") is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+
+def test_entries_expire_after_ttl(clock):
+    """Arrange: Cached entry and a clock advanced past the TTL
+    Act: Get the entry
+    Assert: Miss and expiration recorded"""
+    cache = make_cache(clock, ttl_seconds=5.0)
+    cache.set("k", "answer")
+    clock.now = 5.0
+
+    assert cache.get("k") is None
+    assert cache.stats().expirations == 1
+    assert cache.stats().entries == 0
+
+
+def test_needs_refresh_between_soft_and_hard_ttl(clock):
+    """Arrange: Entry with a 10 second soft TTL and 60 second hard TTL
+    Act: Check it before, between and after the two TTLs
+    Assert: Only due for refresh in between, and still served then"""
+    cache = make_cache(clock, soft_ttl_seconds=10.0)
+    cache.set("k", "answer")
+
+    due_fresh = cache.needs_refresh("k")
+    clock.now = 30.0
+    due_soft, served = cache.needs_refresh("k"), cache.get("k")
+    clock.now = 60.0
+
+    assert (due_fresh, due_soft, served) == (False, True, "answer")
+    assert cache.needs_refresh("k") is False
+    assert cache.needs_refresh("missing") is False
+
+
+def test_lru_eviction_by_entry_count(clock):
+    """Arrange: Cache limited to two entries, first entry recently used
+    Act: Insert a third entry
+    Assert: Least recently used entry evicted"""
+    cache = make_cache(clock, max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert cache.stats().evictions == 1
+
+
+def test_lru_eviction_by_size(clock):
+    """Arrange: Cache limited to 15 bytes
+    Act: Insert entries totalling more than the limit
+    Assert: Oldest entries evicted and size stays within the limit"""
+    cache = make_cache(clock, max_bytes=15)
+    cache.set("a", "x" * 9)
+    cache.set("b", "y" * 9)
+
+    assert cache.get("a") is None
+    assert cache.stats().size_bytes <= 15
+
+
+def test_oversize_answer_is_not_cached(clock):
+    """Arrange: Cache smaller than the answer
+    Act: Store the answer
+    Assert: Nothing is cached"""
+    cache = make_cache(clock, max_bytes=4)
+    cache.set("k", "too large")
+
+    assert cache.stats().entries == 0
+
+
+def test_query_icaet_serves_repeat_questions_from_cache():
+    """Arrange: Mocked API answering once
+    Act: Ask the same question twice with different formatting
+    Assert: Only one upstream request and stats report one hit"""
+    settings = Settings.model_construct(
+        icaet_api_key="test-key", user_email="test@example.com"
+    )
+    with (
+        patch("icsaet_mcp.tools.get_settings", return_value=settings),
+        patch("httpx.Client") as mock_client,
+    ):
+        mock_client.return_value.post.return_value = httpx.Response(
+            200,
+            json={"answer": "Cached answer"},
+            request=httpx.Request("POST", "https://test/query"),
+        )
+
+        first = query_icaet("What did Leslie Miley talk about?")
+        second = query_icaet("what did leslie miley talk about")
+        stats = cache_stats()
+
+    assert first == second == "Cached answer"
+    mock_client.return_value.post.assert_called_once()
+    assert stats["memory"]["hits"] == 1
+
+
+def test_query_icaet_skips_cache_when_disabled():
+    """Arrange: Caching disabled in settings
+    Act: Ask the same question twice
+    Assert: Both calls reach the API"""
+    settings = Settings.model_construct(
+        icaet_api_key="test-key", user_email="test@example.com", cache_enabled=False
+    )
+    with (
+        patch("icsaet_mcp.tools.get_settings", return_value=settings),
+        patch("httpx.Client") as mock_client,
+    ):
+        mock_client.return_value.post.return_value = httpx.Response(
+            200,
+            json={"answer": "Fresh"},
+            request=httpx.Request("POST", "https://test/query"),
+        )
+
+        query_icaet("Same question")
+        query_icaet("Same question")
+        stats = cache_stats()
+
+    assert mock_client.return_value.post.call_count == 2
+    assert stats == {}
+
+
+def _write_entries(directory: str, worker: int) -> None:
+    cache = DiskAnswerCache(
+        directory, ttl_seconds=60.0, max_entries=1000, max_bytes=1_000_000
+    )
+    for i in range(50):
+        cache.set(f"{worker}-{i}", "answer")
+    cache.close()
+
+
+def make_disk_cache(directory, clock, **overrides) -> DiskAnswerCache:
+    options = {"ttl_seconds": 60.0, "max_entries": 10, "max_bytes": 10_000}
+    options.update(overrides)
+    return DiskAnswerCache(directory, clock=clock, **options)
+
+
+def test_disk_cache_survives_reopen(tmp_path, clock):
+    """Arrange: Disk cache with one stored answer, then closed
+    Act: Reopen the cache from the same directory
+    Assert: Answer is still served"""
+    cache = make_disk_cache(tmp_path, clock)
+    cache.set("k", "persisted")
+    cache.close()
+
+    reopened = make_disk_cache(tmp_path, clock)
+
+    assert reopened.get("k") == "persisted"
+    assert reopened.stats().hits == 1
+
+
+def test_disk_cache_entries_expire(tmp_path, clock):
+    """Arrange: Persisted entry and a clock advanced past the TTL
+    Act: Get the entry
+    Assert: Miss is reported"""
+    cache = make_disk_cache(tmp_path, clock, ttl_seconds=5.0)
+    cache.set("k", "answer")
+    clock.now = 5.0
+
+    assert cache.get("k") is None
+    assert cache.stats().misses == 1
+
+
+def test_disk_cache_compacts_to_entry_limit(tmp_path, clock):
+    """Arrange: Disk cache limited to two entries, first entry recently read
+    Act: Insert a third entry
+    Assert: Least recently used entry removed"""
+    cache = make_disk_cache(tmp_path, clock, max_entries=2)
+    cache.set("a", "1")
+    clock.now = 1.0
+    cache.set("b", "2")
+    clock.now = 2.0
+    cache.get("a")
+    clock.now = 3.0
+
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.stats().entries == 2
+    assert cache.stats().evictions == 1
+
+
+def test_disk_cache_compacts_to_byte_limit(tmp_path, clock):
+    """Arrange: Disk cache limited to 15 bytes
+    Act: Insert entries totalling more than the limit
+    Assert: Database stays within the limit"""
+    cache = make_disk_cache(tmp_path, clock, max_bytes=15)
+    cache.set("a", "x" * 9)
+    clock.now = 1.0
+    cache.set("b", "y" * 9)
+
+    assert cache.get("a") is None
+    assert cache.stats().size_bytes <= 15
+
+
+def test_disk_cache_concurrent_processes(tmp_path):
+    """Arrange: Four processes writing to the same cache directory
+    Act: Each stores 50 answers concurrently
+    Assert: All 200 entries persisted without lock errors"""
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_write_entries, args=(str(tmp_path), worker))
+        for worker in range(4)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(timeout=30)
+
+    assert all(process.exitcode == 0 for process in workers)
+    cache = DiskAnswerCache(
+        tmp_path, ttl_seconds=60.0, max_entries=1000, max_bytes=1_000_000
+    )
+    assert cache.stats().entries == 200
+
+
+def test_query_icaet_warm_start_from_disk(tmp_path):
+    """Arrange: Answer fetched once with a disk cache configured
+    Act: Drop in-memory state (simulated restart) and ask again
+    Assert: Second answer served from disk without a network call"""
+    settings = Settings.model_construct(
+        icaet_api_key="test-key",
+        user_email="test@example.com",
+        cache_dir=str(tmp_path),
+    )
+    with (
+        patch("icsaet_mcp.tools.get_settings", return_value=settings),
+        patch("httpx.Client") as mock_client,
+    ):
+        mock_client.return_value.post.return_value = httpx.Response(
+            200,
+            json={"answer": "Persisted answer"},
+            request=httpx.Request("POST", "https://test/query"),
+        )
+        query_icaet("What is ICAET?")
+        reset_answer_cache()
+        close_disk_cache()
+
+        result = query_icaet("What is ICAET?")
+        stats = cache_stats()
+
+    assert result == "Persisted answer"
+    mock_client.return_value.post.assert_called_once()
+    assert stats["disk"]["hits"] == 1
+
+
+def test_get_stale_serves_expired_entries_within_grace(clock):
+    """Arrange: Cache with a 5s TTL and 10s stale grace, clock past the TTL
+    Act: Call get and get_stale
+    Assert: get misses, get_stale serves until the grace runs out"""
+    cache = make_cache(clock, ttl_seconds=5.0, max_stale_seconds=10.0)
+    cache.set("k", "answer")
+    clock.now = 6.0
+
+    assert cache.get("k") is None
+    assert cache.get_stale("k") == "answer"
+    clock.now = 15.0
+    assert cache.get_stale("k") is None
+    assert cache.stats().stale_hits == 1
+
+
+def test_disk_cache_get_stale_within_grace(tmp_path, clock):
+    """Arrange: Persisted entry past its TTL but within the stale grace
+    Act: Call get and get_stale
+    Assert: get misses and get_stale serves the entry"""
+    cache = make_disk_cache(tmp_path, clock, ttl_seconds=5.0, max_stale_seconds=10.0)
+    cache.set("k", "answer")
+    clock.now = 6.0
+
+    assert cache.get("k") is None
+    assert cache.get_stale("k") == "answer"
+    clock.now = 15.0
+    assert cache.get_stale("k") is None
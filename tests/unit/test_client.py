@@ -0,0 +1,501 @@
+"""Unit tests for the pooled ICAET HTTP client."""
+
+import asyncio
+import gzip
+import json
+import time
+from functools import partial
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+
+from icsaet_mcp.client import (
+    AsyncICAETClient,
+    ICAETClient,
+    ResponseTooLargeError,
+    accept_encoding,
+    build_client_options,
+    build_limits,
+    close_async_client,
+    close_client,
+    get_async_client,
+    get_client,
+    http2_enabled,
+    request_timeout,
+)
+from icsaet_mcp.config import Settings
+from icsaet_mcp.scheduler import DeadlineExceededError
+from icsaet_mcp.tools import lifespan, mcp
+
+
+@pytest.fixture
+def make_settings(make_settings):
+    """Build Settings with custom pool limits."""
+    return partial(
+        make_settings,
+        icaet_max_connections=20,
+        icaet_max_keepalive_connections=10,
+        icaet_keepalive_expiry=15.0,
+    )
+
+
+def test_build_limits_uses_settings(make_settings):
+    """Arrange: Settings with custom pool limits
+    Act: Build httpx limits
+    Assert: Limits mirror the settings"""
+    limits = build_limits(make_settings())
+
+    assert limits == httpx.Limits(
+        max_connections=20, max_keepalive_connections=10, keepalive_expiry=15.0
+    )
+
+
+def test_get_client_reuses_instance(make_settings):
+    """Arrange: Same settings object
+    Act: Call get_client twice
+    Assert: One httpx.Client is created and shared"""
+    settings = make_settings()
+
+    with patch("httpx.Client") as mock_client:
+        first = get_client(settings)
+        second = get_client(settings)
+
+    assert first is second
+    mock_client.assert_called_once()
+    assert mock_client.call_args.kwargs["limits"] == build_limits(settings)
+
+
+def test_get_client_rebuilds_on_new_settings(make_settings):
+    """Arrange: Shared client built from one settings object
+    Act: Call get_client with a different settings object
+    Assert: Old pool is closed and a new client is returned"""
+    with patch("httpx.Client") as mock_client:
+        first = get_client(make_settings())
+        second = get_client(make_settings())
+
+    assert first is not second
+    assert mock_client.return_value.close.call_count == 1
+
+
+def test_close_client_closes_pool(make_settings):
+    """Arrange: Shared client exists
+    Act: Call close_client
+    Assert: Pool closed and next get_client builds a fresh client"""
+    settings = make_settings()
+
+    with patch("httpx.Client") as mock_client:
+        first = get_client(settings)
+        close_client()
+        second = get_client(settings)
+
+    mock_client.return_value.close.assert_called_once()
+    assert first is not second
+
+
+def test_client_context_manager_closes(make_settings):
+    """Arrange: ICAETClient used as context manager
+    Act: Exit the with block
+    Assert: Underlying httpx client is closed"""
+    with patch("httpx.Client") as mock_client, ICAETClient(make_settings()):
+        pass
+
+    mock_client.return_value.close.assert_called_once()
+
+
+def test_lifespan_closes_shared_client(make_settings):
+    """Arrange: Shared client created during server lifetime
+    Act: Exit the server lifespan
+    Assert: Pool is closed on shutdown"""
+
+    async def run_lifespan() -> None:
+        async with lifespan(mcp):
+            get_client(make_settings())
+
+    with patch("httpx.Client") as mock_client:
+        asyncio.run(run_lifespan())
+
+    mock_client.return_value.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_client_query_success(make_settings):
+    """Arrange: AsyncICAETClient with mocked successful response
+    Act: Await client.query()
+    Assert: Returns parsed JSON and sends credentials"""
+    route = respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(200, json={"answer": "Async answer"})
+    )
+
+    async with AsyncICAETClient(make_settings()) as client:
+        result = await client.query("test question")
+
+    assert result == {"answer": "Async answer"}
+    assert route.calls.last.request.headers["x-api-key"] == "test-key"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_client_maps_http_errors(make_settings):
+    """Arrange: API returns 401 Unauthorized
+    Act: Await client.query()
+    Assert: Raises RuntimeError with the same message as the sync client"""
+    respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(401)
+    )
+
+    async with AsyncICAETClient(make_settings()) as client:
+        with pytest.raises(RuntimeError, match="Authentication failed"):
+            await client.query("test question")
+
+
+@pytest.mark.asyncio
+async def test_get_async_client_reuses_instance(make_settings):
+    """Arrange: Same settings object
+    Act: Call get_async_client twice, then close
+    Assert: Client is shared and cleared by close_async_client"""
+    settings = make_settings()
+
+    first = get_async_client(settings)
+    second = get_async_client(settings)
+    await close_async_client()
+
+    assert first is second
+    assert get_async_client(settings) is not first
+
+
+def sse_response(*events: str) -> httpx.Response:
+    body = "".join(f"data: {event}\n\n" for event in events)
+    return httpx.Response(
+        200, headers={"content-type": "text/event-stream"}, content=body.encode()
+    )
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_query_stream_relays_sse_events(make_settings):
+    """Arrange: API streaming JSON and plain-text SSE events
+    Act: Await client.query_stream()
+    Assert: Each fragment is relayed and the full answer returned"""
+    route = respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(
+        return_value=sse_response('{"delta": "Leslie "}', "talked", "[DONE]", "x")
+    )
+    chunks: list[str] = []
+
+    async def on_chunk(chunk: str) -> None:
+        chunks.append(chunk)
+
+    async with AsyncICAETClient(make_settings()) as client:
+        result = await client.query_stream("q", on_chunk)
+
+    assert chunks == ["Leslie ", "talked"]
+    assert result == {"answer": "Leslie talked"}
+    assert "text/event-stream" in route.calls.last.request.headers["accept"]
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_query_stream_relays_chunked_text(make_settings):
+    """Arrange: API answering with text/plain
+    Act: Await client.query_stream()
+    Assert: Text is relayed and returned as the answer"""
+    respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(
+            200, headers={"content-type": "text/plain"}, content=b"Plain answer"
+        )
+    )
+    chunks: list[str] = []
+
+    async def on_chunk(chunk: str) -> None:
+        chunks.append(chunk)
+
+    async with AsyncICAETClient(make_settings()) as client:
+        result = await client.query_stream("q", on_chunk)
+
+    assert "".join(chunks) == "Plain answer"
+    assert result == {"answer": "Plain answer"}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_query_stream_falls_back_to_json(make_settings):
+    """Arrange: API answering with a regular JSON body
+    Act: Await client.query_stream()
+    Assert: Parsed JSON returned and nothing relayed"""
+    respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(200, json={"answer": "Whole answer"})
+    )
+    chunks: list[str] = []
+
+    async def on_chunk(chunk: str) -> None:
+        chunks.append(chunk)
+
+    async with AsyncICAETClient(make_settings()) as client:
+        result = await client.query_stream("q", on_chunk)
+
+    assert result == {"answer": "Whole answer"}
+    assert chunks == []
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_query_stream_maps_http_errors(make_settings):
+    """Arrange: API returning 401 to a streaming request
+    Act: Await client.query_stream()
+    Assert: Same RuntimeError as query()"""
+    respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(401)
+    )
+
+    async def on_chunk(chunk: str) -> None:
+        raise AssertionError("nothing should be relayed")
+
+    async with AsyncICAETClient(make_settings()) as client:
+        with pytest.raises(RuntimeError, match="Authentication failed"):
+            await client.query_stream("q", on_chunk)
+
+
+def test_build_client_options_from_transport_profile():
+    """Arrange: Settings with custom base URL and split timeouts
+    Act: Build client options
+    Assert: Options mirror the transport profile"""
+    settings = Settings.model_construct(
+        icaet_api_key="test-key",
+        user_email="test@example.com",
+        icaet_base_url="http://localhost:9999",
+        icaet_connect_timeout=1.0,
+        icaet_read_timeout=45.0,
+        icaet_write_timeout=2.0,
+        icaet_pool_timeout=3.0,
+    )
+
+    options = build_client_options(settings)
+
+    assert options["base_url"] == "http://localhost:9999"
+    assert options["timeout"] == httpx.Timeout(
+        connect=1.0, read=45.0, write=2.0, pool=3.0
+    )
+    assert options["http2"] is False
+
+
+def test_http2_falls_back_without_h2(caplog):
+    """Arrange: HTTP/2 requested but h2 not importable
+    Act: Check whether HTTP/2 is enabled
+    Assert: Falls back to HTTP/1.1 with a warning"""
+    settings = Settings.model_construct(icaet_http2=True)
+
+    with patch("importlib.util.find_spec", return_value=None):
+        assert http2_enabled(settings) is False
+    assert "h2 package is not installed" in caplog.text
+
+
+def test_http2_enabled_when_h2_available():
+    """Arrange: HTTP/2 requested and h2 importable
+    Act: Check whether HTTP/2 is enabled
+    Assert: HTTP/2 is used"""
+    settings = Settings.model_construct(icaet_http2=True)
+
+    with patch("importlib.util.find_spec", return_value=object()):
+        assert http2_enabled(settings) is True
+
+
+@respx.mock
+def test_client_uses_base_url_override():
+    """Arrange: Settings pointing at a local stand-in
+    Act: Query through ICAETClient
+    Assert: Request is sent to the overridden base URL"""
+    route = respx.post("http://localhost:9999/query").mock(
+        return_value=httpx.Response(200, json={"answer": "local"})
+    )
+    settings = Settings.model_construct(
+        icaet_api_key="test-key",
+        user_email="test@example.com",
+        icaet_base_url="http://localhost:9999",
+    )
+
+    with ICAETClient(settings) as client:
+        assert client.query("q") == {"answer": "local"}
+    assert route.called
+
+
+def test_accept_encoding_prefers_installed_codings():
+    """Arrange: zstandard installed, brotli not
+    Act: Build the Accept-Encoding header
+    Assert: zstd is preferred, brotli is not offered, gzip is the fallback"""
+    installed = {"zstandard"}
+
+    with patch(
+        "importlib.util.find_spec", side_effect=lambda name: name in installed or None
+    ):
+        header = accept_encoding(Settings.model_construct(icaet_compression=True))
+
+    assert header == "zstd;q=1.0, gzip;q=0.8, deflate;q=0.5"
+
+
+def test_accept_encoding_identity_when_disabled():
+    """Arrange: ICAET_COMPRESSION off
+    Act: Build client options
+    Assert: Only uncompressed responses are accepted"""
+    settings = Settings.model_construct(
+        icaet_compression=False, icaet_base_url="http://localhost:9999"
+    )
+
+    options = build_client_options(settings)
+
+    assert options["headers"] == {"accept-encoding": "identity"}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_query_decodes_gzip_answer(make_settings):
+    """Arrange: API answering with a gzip-compressed JSON body
+    Act: Query through AsyncICAETClient
+    Assert: Compression was negotiated, the body sent as JSON and the answer decoded"""
+    answer = "Platform teams. " * 2000
+    compressed = gzip.compress(json.dumps({"answer": answer}).encode())
+    route = respx.post(f"{ICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(
+            200,
+            headers={"content-encoding": "gzip", "content-type": "application/json"},
+            content=compressed,
+        )
+    )
+
+    async with AsyncICAETClient(make_settings()) as client:
+        result = await client.query("What about platforms?")
+
+    request = route.calls.last.request
+    assert "gzip" in request.headers["accept-encoding"]
+    assert request.headers["content-type"] == "application/json"
+    assert json.loads(request.content) == {
+        "email": "test@example.com",
+        "question": "What about platforms?",
+    }
+    assert result == {"answer": answer}
+    assert len(compressed) < len(answer) // 10
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_query_rejects_oversize_content_length(make_settings):
+    """Arrange: 2 KB limit and a 4 KB JSON answer
+    Act: Query through AsyncICAETClient
+    Assert: ResponseTooLargeError"""
+    settings = make_settings().model_copy(update={"icaet_max_response_bytes": 2048})
+    respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(200, json={"answer": "a" * 4096})
+    )
+
+    async with AsyncICAETClient(settings) as client:
+        with pytest.raises(ResponseTooLargeError, match="larger than 2048 bytes"):
+            await client.query("q")
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_query_rejects_oversize_decompressed_body(make_settings):
+    """Arrange: 2 KB limit and a gzip body that inflates past it
+    Act: Query through AsyncICAETClient
+    Assert: Rejected although the compressed body is small"""
+    settings = make_settings().model_copy(update={"icaet_max_response_bytes": 2048})
+    compressed = gzip.compress(json.dumps({"answer": "a" * 100_000}).encode())
+    respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(
+            200, headers={"content-encoding": "gzip"}, content=compressed
+        )
+    )
+
+    async with AsyncICAETClient(settings) as client:
+        with pytest.raises(ResponseTooLargeError):
+            await client.query("q")
+    assert len(compressed) < 2048
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_query_stream_stops_oversize_answers(make_settings):
+    """Arrange: 2 KB limit and a 3 KB plain-text stream
+    Act: Await client.query_stream()
+    Assert: ResponseTooLargeError after relaying at most 2 KB"""
+    settings = make_settings().model_copy(update={"icaet_max_response_bytes": 2048})
+    respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(
+            200,
+            headers={"content-type": "text/plain"},
+            stream=httpx.ByteStream(b"b" * 3072),
+        )
+    )
+    relayed: list[str] = []
+
+    async def on_chunk(chunk: str) -> None:
+        relayed.append(chunk)
+
+    async with AsyncICAETClient(settings) as client:
+        with pytest.raises(ResponseTooLargeError):
+            await client.query_stream("q", on_chunk)
+    assert sum(map(len, relayed)) <= 2048
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_query_stream_limits_bytes_not_characters(make_settings):
+    """Arrange: 2 KB limit and a stream of 1,500 two-byte characters
+    Act: Await client.query_stream()
+    Assert: ResponseTooLargeError, as the text is 3,000 bytes long"""
+    settings = make_settings(icaet_max_response_bytes=2048)
+    respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(
+            200,
+            headers={"content-type": "text/plain; charset=utf-8"},
+            stream=httpx.ByteStream(("é" * 1500).encode()),
+        )
+    )
+
+    async def on_chunk(chunk: str) -> None:
+        pass
+
+    async with AsyncICAETClient(settings) as client:
+        with pytest.raises(ResponseTooLargeError):
+            await client.query_stream("q", on_chunk)
+
+
+@respx.mock
+def test_sync_query_rejects_oversize_answer(make_settings):
+    """Arrange: 2 KB limit and a 4 KB JSON answer
+    Act: Query through ICAETClient
+    Assert: ResponseTooLargeError, a RuntimeError"""
+    settings = make_settings().model_copy(update={"icaet_max_response_bytes": 2048})
+    respx.post(f"{ICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(200, json={"answer": "a" * 4096})
+    )
+
+    with (
+        ICAETClient(settings) as client,
+        pytest.raises(RuntimeError, match="more specific question"),
+    ):
+        client.query("q")
+
+
+def test_request_timeout_is_capped_by_deadline():
+    """Arrange: Configured timeouts and a deadline 2 seconds away
+    Act: Build per-request timeouts with and without the deadline
+    Assert: Each timeout is capped at the time left; none without a deadline"""
+    settings = Settings.model_construct(
+        icaet_api_key="test-key",
+        user_email="test@example.com",
+        icaet_connect_timeout=1.0,
+        icaet_read_timeout=30.0,
+        icaet_write_timeout=10.0,
+        icaet_pool_timeout=5.0,
+    )
+
+    capped = request_timeout(settings, time.monotonic() + 2.0)
+
+    assert capped.connect == 1.0
+    assert 1.5 < capped.read <= 2.0
+    assert capped.write == capped.read
+    assert request_timeout(settings, None).read == 30.0
+    with pytest.raises(DeadlineExceededError):
+        request_timeout(settings, time.monotonic() - 1)
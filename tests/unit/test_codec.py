@@ -0,0 +1,41 @@
+"""Unit tests for the JSON codec."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from icsaet_mcp import codec
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_codec_round_trip_is_compact_utf8(use_orjson):
+    """Arrange: Payload with non-ASCII text, with and without orjson
+    Act: Encode and decode it
+    Assert: Output is compact UTF-8 JSON that decodes to the same value"""
+    if use_orjson and not codec.orjson_available():
+        pytest.skip("orjson not installed")
+    payload = {"email": "test@example.com", "question": "Qu'a dit Zoë ?"}
+
+    with patch.object(codec, "orjson", codec.orjson if use_orjson else None):
+        encoded = codec.dumps(payload)
+        decoded = codec.loads(encoded)
+
+    assert (
+        encoded
+        == json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+    )
+    assert decoded == payload
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_codec_rejects_invalid_json(use_orjson):
+    """Arrange: Truncated JSON body
+    Act: Decode it
+    Assert: ValueError, as with the standard library"""
+    if use_orjson and not codec.orjson_available():
+        pytest.skip("orjson not installed")
+
+    orjson = codec.orjson if use_orjson else None
+    with patch.object(codec, "orjson", orjson), pytest.raises(ValueError):
+        codec.loads(b'{"answer": ')
@@ -97,3 +97,47 @@ def test_invalid_email_format_rejected(monkeypatch):
     with pytest.raises(ValidationError, match="valid email format"):
         Settings()
 
+
+def test_pool_settings_have_defaults(valid_env_vars):
+    """Arrange: Only required environment variables set
+    Act: Create Settings instance
+    Assert: Connection pool settings fall back to defaults"""
+    settings = Settings()
+    assert settings.icaet_max_connections == 10
+    assert settings.icaet_max_keepalive_connections == 5
+    assert settings.icaet_keepalive_expiry == 30.0
+
+
+def test_pool_settings_loaded_from_env(valid_env_vars, monkeypatch):
+    """Arrange: Pool limits set in environment
+    Act: Create Settings instance
+    Assert: Values are parsed from the environment"""
+    monkeypatch.setenv("ICAET_MAX_CONNECTIONS", "50")
+    monkeypatch.setenv("ICAET_KEEPALIVE_EXPIRY", "5")
+    settings = Settings()
+    assert settings.icaet_max_connections == 50
+    assert settings.icaet_keepalive_expiry == 5.0
+
+
+def test_transport_profile_loaded_from_env(valid_env_vars, monkeypatch):
+    """Arrange: Base URL, timeouts and HTTP/2 set in environment
+    Act: Create Settings instance
+    Assert: Transport profile parsed and trailing slash removed"""
+    monkeypatch.setenv("ICAET_BASE_URL", "http://localhost:8080/")
+    monkeypatch.setenv("ICAET_CONNECT_TIMEOUT", "1.5")
+    monkeypatch.setenv("ICAET_READ_TIMEOUT", "90")
+    monkeypatch.setenv("ICAET_HTTP2", "true")
+    settings = Settings()
+    assert settings.icaet_base_url == "http://localhost:8080"
+    assert settings.icaet_connect_timeout == 1.5
+    assert settings.icaet_read_timeout == 90.0
+    assert settings.icaet_http2 is True
+
+
+def test_invalid_base_url_rejected(valid_env_vars, monkeypatch):
+    """Arrange: ICAET_BASE_URL without a scheme
+    Act: Attempt to create Settings instance
+    Assert: ValidationError raised"""
+    monkeypatch.setenv("ICAET_BASE_URL", "localhost:8080")
+    with pytest.raises(ValidationError, match="http:// or https://"):
+        Settings()
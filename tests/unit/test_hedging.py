@@ -0,0 +1,226 @@
+"""Unit tests for hedged ICAET API requests."""
+
+import asyncio
+import time
+from functools import partial
+
+import httpx
+import pytest
+import respx
+
+from icsaet_mcp.client import AsyncICAETClient
+from icsaet_mcp.hedging import (
+    MIN_SAMPLES,
+    HedgePolicy,
+    LatencyTracker,
+    get_hedge_policy,
+)
+from icsaet_mcp.metrics import UPSTREAM_HEDGES
+from icsaet_mcp.resilience import RetryBudget
+
+
+def make_policy(budget_tokens: float = 5.0, latency: float = 0.01) -> HedgePolicy:
+    """Policy whose latency window already holds MIN_SAMPLES responses."""
+    policy = HedgePolicy(
+        percentile=95.0,
+        min_delay=0.0,
+        budget=RetryBudget(ratio=0.0, max_tokens=budget_tokens),
+    )
+    for _ in range(MIN_SAMPLES):
+        policy.tracker.record(latency)
+    return policy
+
+
+@pytest.fixture
+def make_settings(make_settings):
+    """Build Settings with hedging enabled."""
+    return partial(
+        make_settings,
+        hedge_enabled=True,
+        hedge_percentile=95.0,
+        hedge_min_delay_seconds=0.0,
+        hedge_budget_ratio=0.05,
+        hedge_budget_max_tokens=5.0,
+    )
+
+
+class Attempts:
+    """Attempt whose n-th call sleeps, then returns or raises outcomes[n]."""
+
+    def __init__(self, *outcomes: tuple[float, object]) -> None:
+        self.outcomes = list(outcomes)
+        self.started = 0
+        self.cancelled = 0
+
+    async def __call__(self, commit) -> object:
+        delay, outcome = self.outcomes[self.started]
+        self.started += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def test_latency_tracker_needs_enough_samples():
+    """Arrange: A tracker with one sample and one with 100 samples of 1..100 ms
+    Act: Ask each for the 95th percentile
+    Assert: None, then 95 ms"""
+    sparse, full = LatencyTracker(), LatencyTracker()
+    sparse.record(0.5)
+    for ms in range(1, 101):
+        full.record(ms / 1000)
+
+    assert sparse.percentile(95) is None
+    assert full.percentile(95) == pytest.approx(0.095)
+
+
+@pytest.mark.asyncio
+async def test_slow_attempt_is_hedged_and_loser_cancelled():
+    """Arrange: Usual latency 10 ms; first attempt takes 5 s, the duplicate 10 ms
+    Act: Call through the policy
+    Assert: The duplicate's result wins quickly and the slow attempt is cancelled"""
+    attempts = Attempts((5.0, "slow"), (0.01, "fast"))
+    start = time.monotonic()
+
+    result = await make_policy().call(attempts)
+
+    assert result == "fast"
+    assert time.monotonic() - start < 1
+    assert (attempts.started, attempts.cancelled) == (2, 1)
+    assert UPSTREAM_HEDGES.value(outcome="sent") == 1
+    assert UPSTREAM_HEDGES.value(outcome="won") == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_attempt_is_not_hedged():
+    """Arrange: Usual latency 50 ms and an attempt answering in 1 ms
+    Act: Call through the policy
+    Assert: One attempt only"""
+    attempts = Attempts((0.001, "answer"))
+
+    assert await make_policy(latency=0.05).call(attempts) == "answer"
+    assert attempts.started == 1
+    assert UPSTREAM_HEDGES.value(outcome="sent") == 0
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_latency_history_or_budget():
+    """Arrange: A policy with no samples, and one with an empty budget
+    Act: Call a slow attempt through each
+    Assert: Neither sends a duplicate; the empty budget is counted as skipped"""
+    cold = HedgePolicy(95.0, 0.0, RetryBudget(ratio=0.0, max_tokens=5.0))
+    cold_attempts = Attempts((0.05, "cold"))
+    broke_attempts = Attempts((0.05, "broke"))
+
+    assert await cold.call(cold_attempts) == "cold"
+    assert await make_policy(budget_tokens=0).call(broke_attempts) == "broke"
+    assert cold_attempts.started == broke_attempts.started == 1
+    assert UPSTREAM_HEDGES.value(outcome="skipped") == 1
+
+
+@pytest.mark.asyncio
+async def test_primary_error_raised_when_both_attempts_fail():
+    """Arrange: Slow failing first attempt and a failing duplicate
+    Act: Call through the policy
+    Assert: The first attempt's error is raised, as without hedging"""
+    attempts = Attempts(
+        (0.1, httpx.ConnectError("primary")), (0.01, httpx.ReadError("hedge"))
+    )
+
+    with pytest.raises(httpx.ConnectError, match="primary"):
+        await make_policy().call(attempts)
+
+
+@pytest.mark.asyncio
+async def test_committed_attempt_wins_even_if_slower():
+    """Arrange: First attempt commits (starts relaying) after 20 ms, then runs
+    on for 50 ms; the duplicate would finish sooner
+    Act: Call through the policy
+    Assert: The committed attempt's result is used and only it relays"""
+    relayed: list[str] = []
+    started = 0
+
+    async def attempt(commit) -> str:
+        nonlocal started
+        started += 1
+        # (name, seconds before committing, seconds after committing)
+        name, before, after = [("first", 0.02, 0.05), ("second", 0.03, 0.0)][
+            started - 1
+        ]
+        await asyncio.sleep(before)
+        commit()
+        relayed.append(name)
+        await asyncio.sleep(after)
+        return name
+
+    assert await make_policy(latency=0.005).call(attempt) == "first"
+    assert started == 2
+    assert relayed == ["first"]
+
+
+def test_get_hedge_policy_disabled_by_default(make_settings):
+    """Arrange: HEDGE_ENABLED=false
+    Act: Get the hedge policy
+    Assert: None"""
+    assert get_hedge_policy(make_settings(hedge_enabled=False)) is None
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_hedges_slow_replica(make_settings):
+    """Arrange: Hedging on, usual latency 10 ms, and a replica that stalls
+    the first request for 5 s
+    Act: Query through AsyncICAETClient
+    Assert: The duplicate's answer returns quickly and the stalled request
+    is cancelled"""
+    settings = make_settings()
+    policy = get_hedge_policy(settings)
+    for _ in range(MIN_SAMPLES):
+        policy.tracker.record(0.01)
+    stalled: dict[str, bool] = {}
+    calls = 0
+
+    async def replica(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                stalled["cancelled"] = True
+                raise
+        return httpx.Response(200, json={"answer": f"reply {calls}"})
+
+    respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(side_effect=replica)
+    start = time.monotonic()
+
+    async with AsyncICAETClient(settings) as client:
+        result = await client.query("Who spoke?")
+
+    assert result == {"answer": "reply 2"}
+    assert time.monotonic() - start < 1
+    assert stalled == {"cancelled": True}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_client_error_mapping_unchanged_with_hedging(make_settings):
+    """Arrange: Hedging on and an API rejecting the key
+    Act: Query through AsyncICAETClient
+    Assert: Same RuntimeError as without hedging, after a single request"""
+    settings = make_settings()
+    policy = get_hedge_policy(settings)
+    for _ in range(MIN_SAMPLES):
+        policy.tracker.record(0.01)
+    route = respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(401)
+    )
+
+    async with AsyncICAETClient(settings) as client:
+        with pytest.raises(RuntimeError, match="Authentication failed"):
+            await client.query("Who spoke?")
+    assert route.call_count == 1
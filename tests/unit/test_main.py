@@ -1,6 +1,7 @@
 """Unit tests for entry point."""
 
 import logging
+import subprocess
 import sys
 from unittest.mock import MagicMock, patch
 
@@ -34,10 +35,10 @@ def test_main_with_valid_configuration():
         )
         mock_mcp.run.return_value = None
 
-        main()
+        main([])
 
         mock_settings.assert_called_once()
-        mock_mcp.run.assert_called_once()
+        mock_mcp.run.assert_called_once_with(show_banner=False)
 
 
 def test_main_with_missing_configuration(capsys):
@@ -58,7 +59,7 @@ def test_main_with_missing_configuration(capsys):
         )
 
         with pytest.raises(SystemExit) as exc_info:
-            main()
+            main([])
 
         assert exc_info.value.code == 1
 
@@ -82,7 +83,7 @@ def test_main_with_keyboard_interrupt():
         mock_mcp.run.side_effect = KeyboardInterrupt()
 
         with pytest.raises(SystemExit) as exc_info:
-            main()
+            main([])
 
         assert exc_info.value.code == 0
 
@@ -101,7 +102,7 @@ def test_main_with_server_error(capsys):
         mock_mcp.run.side_effect = RuntimeError("Test error")
 
         with pytest.raises(SystemExit) as exc_info:
-            main()
+            main([])
 
         assert exc_info.value.code == 1
 
@@ -124,10 +125,48 @@ def test_main_logs_version():
         )
         mock_mcp.run.return_value = None
 
-        main()
+        main([])
 
         version_logged = any(
             "Starting ICAET MCP Server" in str(call)
             for call in mock_logger.info.call_args_list
         )
         assert version_logged
+
+
+def loaded_modules(statement: str) -> set[str]:
+    """Run statement in a fresh interpreter and return the modules it loaded."""
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys; {statement}; print(' '.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return set(output.split())
+
+
+def test_entry_point_defers_server_import():
+    """Arrange: Fresh interpreter
+    Act: Import the entry point module
+    Assert: FastMCP is not loaded until the server is needed"""
+    modules = loaded_modules("import icsaet_mcp.__main__")
+
+    assert "fastmcp" not in modules
+    assert "icsaet_mcp.tools" not in modules
+
+
+def test_server_import_defers_http_client():
+    """Arrange: Fresh interpreter
+    Act: Import the server, then access the client class through tools
+    Assert: httpx only loads on first use"""
+    at_startup = loaded_modules("import icsaet_mcp.server")
+    on_use = loaded_modules("import icsaet_mcp.tools as t; t.ICAETClient")
+
+    assert "icsaet_mcp.tools" in at_startup
+    assert "httpx" not in at_startup
+    assert "icsaet_mcp.client" not in at_startup
+    assert "httpx" in on_use
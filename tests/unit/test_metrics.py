@@ -0,0 +1,197 @@
+"""Unit tests for Prometheus-style metrics."""
+
+import asyncio
+import math
+import urllib.request
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+
+from icsaet_mcp.client import AsyncICAETClient, ICAETClient
+from icsaet_mcp.metrics import (
+    CACHE_LOOKUPS,
+    QUERIES_IN_FLIGHT,
+    QUERY_SECONDS,
+    UPSTREAM_BYTES_RECEIVED,
+    UPSTREAM_BYTES_SENT,
+    UPSTREAM_IN_FLIGHT,
+    UPSTREAM_REQUESTS,
+    UPSTREAM_RETRIES,
+    UPSTREAM_SECONDS,
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+    start_metrics_server,
+    stop_metrics_server,
+)
+from icsaet_mcp.tools import query_icaet, query_icaet_async, server_stats
+
+
+def test_counter_tracks_values_per_label_set():
+    """Arrange: Counter
+    Act: Increment with two label sets
+    Assert: Each label set keeps its own total"""
+    counter = Counter("requests_total", "Requests")
+
+    counter.inc(status="200")
+    counter.inc(2, status="200")
+    counter.inc(status="500")
+
+    assert counter.value(status="200") == 3
+    assert counter.value(status="500") == 1
+    assert counter.value(status="404") == 0
+
+
+def test_gauge_track_in_progress_restores_value_on_error():
+    """Arrange: Gauge
+    Act: Raise inside track_in_progress
+    Assert: Gauge is raised inside the block and restored afterwards"""
+    gauge = Gauge("in_flight", "In flight")
+
+    with pytest.raises(ValueError), gauge.track_in_progress():
+        assert gauge.value() == 1
+        raise ValueError
+
+    assert gauge.value() == 0
+
+
+def test_histogram_counts_and_estimates_quantiles():
+    """Arrange: Histogram with three buckets
+    Act: Observe values spread across them
+    Assert: Count and bucket-bound quantiles are reported"""
+    histogram = Histogram("latency", "Latency", buckets=(0.1, 1.0, 10.0))
+
+    for value in (0.05, 0.05, 0.5, 5.0):
+        histogram.observe(value)
+    histogram.observe(100.0)
+
+    assert histogram.count() == 5
+    assert histogram.quantile(0.4) == 0.1
+    assert histogram.quantile(0.6) == 1.0
+    assert histogram.quantile(0.99) == math.inf
+
+
+def test_registry_renders_prometheus_text_format():
+    """Arrange: Registry with a counter and a histogram
+    Act: Render it
+    Assert: HELP/TYPE lines, labels and cumulative buckets are emitted"""
+    registry = Registry()
+    counter = registry.register(Counter("hits_total", "Hits"))
+    histogram = registry.register(Histogram("latency", "Latency", buckets=(1.0,)))
+    counter.inc(layer="memory")
+    histogram.observe(0.5, status="200")
+    histogram.observe(2.0, status="200")
+
+    text = registry.render()
+
+    assert "# HELP hits_total Hits\n# TYPE hits_total counter\n" in text
+    assert 'hits_total{layer="memory"} 1\n' in text
+    assert "# TYPE latency histogram" in text
+    assert 'latency_bucket{status="200",le="1"} 1\n' in text
+    assert 'latency_bucket{status="200",le="+Inf"} 2\n' in text
+    assert 'latency_sum{status="200"} 2.5\n' in text
+    assert 'latency_count{status="200"} 2\n' in text
+
+
+@respx.mock
+def test_client_records_upstream_latency_status_and_bytes(make_settings):
+    """Arrange: Mock API returning a JSON answer
+    Act: Query through ICAETClient
+    Assert: Latency, status, bytes and in-flight metrics are recorded"""
+    respx.post(f"{ICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(200, json={"answer": "Test answer"})
+    )
+
+    with ICAETClient(make_settings()) as client:
+        client.query("Q?")
+
+    assert UPSTREAM_REQUESTS.value(status="200") == 1
+    assert UPSTREAM_SECONDS.count(status="200") == 1
+    assert UPSTREAM_BYTES_SENT.value() > 0
+    assert UPSTREAM_BYTES_RECEIVED.value() == len(b'{"answer":"Test answer"}')
+    assert UPSTREAM_IN_FLIGHT.value() == 0
+
+
+@respx.mock
+def test_client_records_retries_and_failed_attempts(make_settings):
+    """Arrange: Mock API failing with 503 once, then a connection error, then OK
+    Act: Query through AsyncICAETClient
+    Assert: Every attempt and each retry reason is counted"""
+    respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(
+        side_effect=[
+            httpx.Response(503),
+            httpx.ConnectError("refused"),
+            httpx.Response(200, json={"answer": "ok"}),
+        ]
+    )
+    settings = make_settings(retry_backoff_base=0.0, retry_backoff_max=0.0)
+
+    async def run() -> None:
+        async with AsyncICAETClient(settings) as client:
+            await client.query("Q?")
+
+    asyncio.run(run())
+
+    assert UPSTREAM_REQUESTS.value(status="503") == 1
+    assert UPSTREAM_REQUESTS.value(status="error") == 1
+    assert UPSTREAM_REQUESTS.value(status="200") == 1
+    assert UPSTREAM_RETRIES.value(reason="503") == 1
+    assert UPSTREAM_RETRIES.value(reason="ConnectError") == 1
+
+
+@respx.mock
+def test_query_records_cache_lookups_and_query_latency(make_settings):
+    """Arrange: Mock API and an enabled memory cache
+    Act: Ask the same question twice
+    Assert: One miss then one hit, two timed queries and a single upstream call"""
+    respx.post(f"{ICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(200, json={"answer": "Test answer"})
+    )
+
+    with patch("icsaet_mcp.tools.get_settings", return_value=make_settings()):
+        query_icaet("Q?")
+        asyncio.run(query_icaet_async("Q?"))
+        stats = server_stats()
+
+    assert CACHE_LOOKUPS.value(layer="memory", result="miss") == 1
+    assert CACHE_LOOKUPS.value(layer="memory", result="hit") == 1
+    assert QUERY_SECONDS.count(path="sync", outcome="ok") == 1
+    assert QUERY_SECONDS.count(path="async", outcome="ok") == 1
+    assert QUERIES_IN_FLIGHT.value(path="sync") == 0
+    assert stats["icaet_upstream_requests_total"] == {'{status="200"}': 1}
+    assert stats["icaet_query_seconds"]['{outcome="ok",path="sync"}']["count"] == 1
+
+
+def test_metrics_server_serves_registry_over_http(make_settings):
+    """Arrange: Metrics listener on an ephemeral port
+    Act: GET /metrics and an unknown path
+    Assert: Prometheus text is served and other paths return 404"""
+    UPSTREAM_REQUESTS.inc(status="200")
+    server = start_metrics_server(
+        make_settings(metrics_port=0, metrics_host="127.0.0.1")
+    )
+    assert server is not None
+    base_url = f"http://127.0.0.1:{server.port}"
+
+    try:
+        with urllib.request.urlopen(f"{base_url}/metrics") as response:
+            content_type = response.headers["content-type"]
+            body = response.read().decode()
+        with pytest.raises(urllib.error.HTTPError) as missing:
+            urllib.request.urlopen(f"{base_url}/other")
+    finally:
+        stop_metrics_server()
+
+    assert content_type.startswith("text/plain")
+    assert 'icaet_upstream_requests_total{status="200"} 1' in body
+    assert missing.value.code == 404
+
+
+def test_metrics_server_disabled_without_port(make_settings):
+    """Arrange: Settings without METRICS_PORT
+    Act: Start the metrics listener
+    Assert: Nothing is started"""
+    assert start_metrics_server(make_settings(metrics_port=None)) is None
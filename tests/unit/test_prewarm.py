@@ -0,0 +1,116 @@
+"""Unit tests for cache prewarming."""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client
+
+from icsaet_mcp.client import ICAETClient
+from icsaet_mcp.prewarm import (
+    example_questions,
+    prewarm,
+    prewarm_questions,
+    read_question_file,
+    start_prewarm,
+)
+from icsaet_mcp.server import mcp
+
+
+def test_example_questions_come_from_both_prompts():
+    """Arrange: Built-in example question and formatting guidance prompts
+    Act: Extract example questions
+    Assert: Quoted questions from both are found and templates skipped"""
+    questions = example_questions()
+
+    assert "What did Leslie Miley talk about?" in questions
+    assert "Who spoke about API security best practices?" in questions
+    assert not any("[" in question for question in questions)
+    assert "Tell me everything" not in questions
+
+
+def test_prewarm_questions_adds_file_and_deduplicates(tmp_path, make_settings):
+    """Arrange: Question file with a comment, a blank line and a duplicate
+    Act: Build the prewarm list
+    Assert: File questions follow the examples, without repeats"""
+    questions_file = tmp_path / "questions.txt"
+    questions_file.write_text(
+        "# Team questions\n\nWhat did Charity Majors say?\nwhat did leslie miley talk about\n"
+    )
+
+    questions = prewarm_questions(make_settings(prewarm_file=str(questions_file)))
+
+    assert read_question_file(questions_file) == [
+        "What did Charity Majors say?",
+        "what did leslie miley talk about",
+    ]
+    assert questions[-1] == "What did Charity Majors say?"
+    assert len(questions) == len(example_questions()) + 1
+
+
+def test_prewarm_limits_concurrency_and_records_failures():
+    """Arrange: Ask function that fails for one question
+    Act: Prewarm six questions with concurrency 2
+    Assert: At most two run at once and the failure is reported"""
+    in_flight = 0
+    peak = 0
+
+    async def ask(question: str) -> str:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if question == "bad":
+            raise RuntimeError("API error: 500. Please try again later.")
+        return "answer"
+
+    result = asyncio.run(prewarm(["a", "b", "bad", "c", "d", "e"], ask, 2))
+
+    assert peak == 2
+    assert result.warmed == 5
+    assert result.failed == {"bad": "API error: 500. Please try again later."}
+
+
+def test_start_prewarm_disabled_by_default(make_settings):
+    """Arrange: Default settings
+    Act: Start prewarming
+    Assert: Nothing is started"""
+
+    async def ask(question: str) -> str:
+        raise AssertionError("should not be called")
+
+    assert start_prewarm(make_settings(prewarm_enabled=False), ask) is None
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_server_prewarms_in_background_without_delaying_startup(make_settings):
+    """Arrange: Slow mock API and prewarming enabled
+    Act: Connect an MCP client, then ask an example question once warmed
+    Assert: The client is ready before prewarming ends and the answer is cached"""
+    answered = asyncio.Event()
+
+    async def slow_answer(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        answered.set()
+        return httpx.Response(200, json={"answer": "Warm answer"})
+
+    route = respx.post(f"{ICAETClient.BASE_URL}/query").mock(side_effect=slow_answer)
+    settings = make_settings(prewarm_enabled=True, prewarm_concurrency=4)
+
+    with patch("icsaet_mcp.tools.get_settings", return_value=settings):
+        async with Client(mcp) as client:
+            assert not answered.is_set()
+            await client.list_tools()
+            while route.call_count < len(example_questions()):
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.1)
+            result = await client.call_tool(
+                "query", {"question": "What did Leslie Miley talk about?"}
+            )
+
+    assert result.data == "Warm answer"
+    assert route.call_count == len(example_questions())
@@ -0,0 +1,313 @@
+"""Unit tests for the client-side rate limiter."""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+
+import httpx
+import pytest
+import respx
+
+from icsaet_mcp.client import AsyncICAETClient, ICAETClient
+from icsaet_mcp.ratelimit import (
+    RateLimitExceededError,
+    SharedTokenBucket,
+    TokenBucket,
+    get_rate_limiter,
+    parse_rate_limit_headers,
+    reset_rate_limiter,
+)
+
+
+def make_bucket(clock, **overrides) -> TokenBucket:
+    options = {"rate": 2.0, "burst": 2, "max_wait": 60.0, "clock": clock}
+    options.update(overrides)
+    return TokenBucket(**options)
+
+
+def test_bucket_allows_burst_then_queues_at_rate(clock):
+    """Arrange: 2 req/s bucket with a burst of 2
+    Act: Reserve five slots at once
+    Assert: Burst goes immediately and later slots are spaced 0.5s apart"""
+    bucket = make_bucket(clock)
+
+    waits = [bucket.reserve() for _ in range(5)]
+
+    assert waits == [0.0, 0.0, 0.5, 1.0, 1.5]
+
+
+def test_bucket_refills_over_time(clock):
+    """Arrange: Drained bucket
+    Act: Let one second pass and reserve again
+    Assert: Refilled tokens are available without waiting"""
+    bucket = make_bucket(clock)
+    bucket.reserve()
+    bucket.reserve()
+
+    clock.now += 1.0
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.5
+
+
+def test_bucket_rejects_wait_beyond_max_wait_without_claiming_slot(clock):
+    """Arrange: Bucket with a 1s max wait and a queue already 1s long
+    Act: Reserve another slot
+    Assert: RateLimitExceededError is raised and the queue is unchanged"""
+    bucket = make_bucket(clock, max_wait=1.0)
+    for _ in range(4):
+        bucket.reserve()
+
+    with pytest.raises(RateLimitExceededError, match="rate limit"):
+        bucket.reserve()
+    with pytest.raises(RateLimitExceededError):
+        bucket.reserve()
+
+
+def test_unlimited_bucket_never_waits(clock):
+    """Arrange: Bucket with rate 0
+    Act: Reserve many slots
+    Assert: No caller waits"""
+    bucket = make_bucket(clock, rate=0.0)
+
+    assert all(bucket.reserve() == 0.0 for _ in range(100))
+
+
+def test_429_pauses_requests_and_halves_rate(clock):
+    """Arrange: Bucket at 2 req/s
+    Act: Observe a 429 with Retry-After: 3
+    Assert: Next request waits out Retry-After plus one slot at the halved rate"""
+    bucket = make_bucket(clock)
+
+    bucket.observe(httpx.Response(429, headers={"Retry-After": "3"}))
+
+    assert bucket.rate == 1.0
+    assert bucket.reserve() == pytest.approx(4.0)
+
+
+def test_429_pauses_unlimited_bucket(clock):
+    """Arrange: Unlimited bucket
+    Act: Observe a 429 with Retry-After: 2
+    Assert: Requests wait for Retry-After, and the rate stays unlimited"""
+    bucket = make_bucket(clock, rate=0.0)
+
+    bucket.observe(httpx.Response(429, headers={"Retry-After": "2"}))
+
+    assert bucket.reserve() == pytest.approx(2.0)
+    clock.now += 2.0
+    assert bucket.reserve() == 0.0
+    assert bucket.rate == 0.0
+
+
+def test_rate_never_drops_below_floor_and_recovers(clock):
+    """Arrange: Bucket at 2 req/s with a 0.1 floor and 0.25 recovery step
+    Act: Observe repeated 429s, then successful responses
+    Assert: Rate stops at the floor and climbs back to the configured rate"""
+    bucket = make_bucket(clock, recovery_ratio=0.25)
+
+    for _ in range(10):
+        bucket.observe(httpx.Response(429, headers={"Retry-After": "0"}))
+    assert bucket.rate == pytest.approx(0.2)
+
+    for _ in range(10):
+        bucket.observe(httpx.Response(200))
+    assert bucket.rate == 2.0
+
+
+def test_rate_limit_headers_cap_rate_and_pause_when_exhausted(clock):
+    """Arrange: Bucket at 2 req/s
+    Act: Observe remaining quota headers, then an exhausted window
+    Assert: Rate drops to remaining/reset, then requests wait for the reset"""
+    bucket = make_bucket(clock)
+
+    bucket.observe(
+        httpx.Response(
+            200, headers={"RateLimit-Remaining": "5", "RateLimit-Reset": "10"}
+        )
+    )
+    assert bucket.rate == 0.5
+
+    bucket.observe(
+        httpx.Response(
+            200, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "7"}
+        )
+    )
+    assert bucket.reserve() == pytest.approx(9.0)
+
+
+def test_parse_rate_limit_headers_accepts_epoch_reset():
+    """Arrange: Reset given as a Unix timestamp
+    Act: Parse headers
+    Assert: Reset is converted to seconds from now; bad values are ignored"""
+    reset_at = time.time() + 30
+    response = httpx.Response(
+        200,
+        headers={"X-RateLimit-Remaining": "3", "X-RateLimit-Reset": str(reset_at)},
+    )
+
+    remaining, reset = parse_rate_limit_headers(response)
+
+    assert remaining == 3
+    assert reset == pytest.approx(30, abs=1)
+    assert parse_rate_limit_headers(
+        httpx.Response(200, headers={"RateLimit-Remaining": "many"})
+    ) == (None, None)
+
+
+def test_shared_buckets_draw_from_one_quota(tmp_path, clock):
+    """Arrange: Two shared buckets (as in two processes) on one directory
+    Act: Reserve slots alternately from each
+    Assert: Slots are allocated from a single bucket"""
+    first = SharedTokenBucket(tmp_path, rate=2.0, burst=2, max_wait=60.0, clock=clock)
+    second = SharedTokenBucket(tmp_path, rate=2.0, burst=2, max_wait=60.0, clock=clock)
+
+    waits = [bucket.reserve() for bucket in (first, second, first, second)]
+
+    assert waits == [0.0, 0.0, 0.5, 1.0]
+    first.close()
+    second.close()
+
+
+def test_shared_bucket_429_pauses_every_process(tmp_path, clock):
+    """Arrange: Two shared buckets on one directory
+    Act: One observes a 429 with Retry-After: 5
+    Assert: The other waits for it and sees the halved rate"""
+    first = SharedTokenBucket(tmp_path, rate=2.0, burst=2, max_wait=60.0, clock=clock)
+    second = SharedTokenBucket(tmp_path, rate=2.0, burst=2, max_wait=60.0, clock=clock)
+
+    first.observe(httpx.Response(429, headers={"Retry-After": "5"}))
+
+    assert second.rate == 1.0
+    assert second.reserve() == pytest.approx(6.0)
+    first.close()
+    second.close()
+
+
+def test_shared_bucket_adopts_lower_configured_rate(tmp_path):
+    """Arrange: Shared bucket created at 10 req/s
+    Act: Reopen it configured for 2 req/s
+    Assert: The stored rate is capped at the new configuration"""
+    SharedTokenBucket(tmp_path, rate=10.0, burst=1, max_wait=60.0).close()
+
+    bucket = SharedTokenBucket(tmp_path, rate=2.0, burst=1, max_wait=60.0)
+
+    assert bucket.rate == 2.0
+    bucket.close()
+
+
+def _reserve_slots(directory: str, queue) -> None:
+    bucket = SharedTokenBucket(
+        directory, rate=50.0, burst=1, max_wait=60.0, clock=lambda: 1000.0
+    )
+    for _ in range(5):
+        queue.put(bucket.reserve())
+    bucket.close()
+
+
+def test_shared_bucket_spaces_requests_across_processes(tmp_path):
+    """Arrange: Four processes sharing a 50 req/s bucket with a burst of 1
+    Act: Each reserves five slots concurrently at the same instant
+    Assert: The 20 slots are handed out once each, 20ms apart"""
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    workers = [
+        context.Process(target=_reserve_slots, args=(str(tmp_path), queue))
+        for _ in range(4)
+    ]
+    for process in workers:
+        process.start()
+    waits = sorted(queue.get(timeout=30) for _ in range(20))
+    for process in workers:
+        process.join(timeout=30)
+
+    assert all(process.exitcode == 0 for process in workers)
+    assert waits == pytest.approx([slot * 0.02 for slot in range(20)])
+
+
+def test_get_rate_limiter_shares_state_when_cache_dir_set(tmp_path, make_settings):
+    """Arrange: Settings with and without CACHE_DIR, with and without a rate
+    Act: Get the process-wide rate limiter
+    Assert: A SharedTokenBucket is used only when both are set"""
+    limited = make_settings(rate_limit_per_second=5.0)
+    assert type(get_rate_limiter(limited)) is TokenBucket
+
+    reset_rate_limiter()
+    unlimited = get_rate_limiter(make_settings(cache_dir=str(tmp_path)))
+    assert type(unlimited) is TokenBucket
+    assert not (tmp_path / SharedTokenBucket.FILENAME).exists()
+
+    reset_rate_limiter()
+    limiter = get_rate_limiter(
+        make_settings(cache_dir=str(tmp_path), rate_limit_per_second=5.0)
+    )
+
+    assert isinstance(limiter, SharedTokenBucket)
+    assert limiter.path.parent == tmp_path
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_client_updates_shared_bucket_off_the_event_loop(
+    tmp_path, make_settings
+):
+    """Arrange: Shared bucket via CACHE_DIR and a mock API
+    Act: Query through AsyncICAETClient
+    Assert: The bucket's SQLite transactions run outside the event loop thread"""
+    respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(200, json={"answer": "ok"})
+    )
+    settings = make_settings(cache_dir=str(tmp_path), rate_limit_per_second=5.0)
+    threads: list[int] = []
+    limiter = get_rate_limiter(settings)
+    state = limiter._state
+
+    def record_state():
+        threads.append(threading.get_ident())
+        return state()
+
+    limiter._state = record_state
+
+    async with AsyncICAETClient(settings) as client:
+        await client.query("Q?")
+
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
+
+
+@respx.mock
+def test_client_queues_requests_at_configured_rate(make_settings):
+    """Arrange: Client limited to 20 req/s with a burst of 1
+    Act: Send three queries
+    Assert: They take at least the two 50ms slots to complete"""
+    respx.post(f"{ICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(200, json={"answer": "ok"})
+    )
+    settings = make_settings(rate_limit_per_second=20.0, rate_limit_burst=1)
+
+    start = time.monotonic()
+    with ICAETClient(settings) as client:
+        for _ in range(3):
+            client.query("Q?")
+
+    assert time.monotonic() - start >= 0.09
+
+
+@respx.mock
+def test_client_waits_out_429_and_reports_quota_errors(make_settings):
+    """Arrange: API returning 429 with Retry-After: 0 for every request
+    Act: Query through AsyncICAETClient
+    Assert: Retries happen and the final error names the rate limit"""
+    route = respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(429, headers={"Retry-After": "0"})
+    )
+    settings = make_settings(retry_backoff_base=0.0, retry_backoff_max=0.0)
+
+    async def run() -> None:
+        async with AsyncICAETClient(settings) as client:
+            await client.query("Q?")
+
+    with pytest.raises(RuntimeError, match="Rate limit exceeded"):
+        asyncio.run(run())
+    assert route.call_count == 3
@@ -0,0 +1,180 @@
+"""Unit tests for stale-while-revalidate refreshes of cached answers."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from functools import partial
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+
+from icsaet_mcp.cache import cache_key, get_answer_cache
+from icsaet_mcp.client import AsyncICAETClient
+from icsaet_mcp.metrics import CACHE_REFRESHES
+from icsaet_mcp.refresh import BackgroundRefresher, get_refresher
+from icsaet_mcp.tools import query_icaet, query_icaet_async
+
+
+@pytest.fixture
+def make_settings(make_settings):
+    """Build Settings that refresh cached answers."""
+    # A tiny soft TTL makes every cached answer due for refresh at once
+    return partial(
+        make_settings, cache_soft_ttl_seconds=1e-9, cache_refresh_concurrency=2
+    )
+
+
+def api_response(answer: str) -> httpx.Response:
+    return httpx.Response(
+        200,
+        json={"answer": answer},
+        request=httpx.Request("POST", "https://test/query"),
+    )
+
+
+def wait_for_refreshes(refresher: BackgroundRefresher) -> None:
+    deadline = time.monotonic() + 5
+    while refresher.in_flight() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_refresher_skips_duplicates_and_caps_concurrency():
+    """Arrange: Refresher allowing two refreshes, with blocked refresh functions
+    Act: Submit the same key twice, then two more keys
+    Assert: Only two refreshes start; the rest are skipped"""
+    refresher = BackgroundRefresher(max_concurrency=2)
+    release = threading.Event()
+
+    started = [
+        refresher.submit("a", release.wait),
+        refresher.submit("a", release.wait),
+        refresher.submit("b", release.wait),
+        refresher.submit("c", release.wait),
+    ]
+    running = refresher.in_flight()
+    release.set()
+    wait_for_refreshes(refresher)
+
+    assert started == [True, False, True, False]
+    assert running == 2
+    assert CACHE_REFRESHES.value(outcome="skipped") == 2
+    assert CACHE_REFRESHES.value(outcome="ok") == 2
+
+
+@pytest.mark.parametrize(
+    "error",
+    [RuntimeError("API down"), sqlite3.OperationalError("database is locked")],
+)
+def test_refresher_counts_failures(error):
+    """Arrange: Refresh function failing like the API or the disk cache
+    Act: Submit it
+    Assert: The error is counted, not raised, and the slot is freed"""
+    refresher = BackgroundRefresher(max_concurrency=1)
+
+    def fail() -> None:
+        raise error
+
+    assert refresher.submit("k", fail)
+    wait_for_refreshes(refresher)
+
+    assert CACHE_REFRESHES.value(outcome="error") == 1
+    assert refresher.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_refresher_does_not_swallow_programming_errors():
+    """Arrange: Refresh coroutine with a bug
+    Act: Submit it and wait for the task
+    Assert: The error surfaces from the task, is not counted as a failed
+    refresh, and the slot is freed"""
+    refresher = BackgroundRefresher(max_concurrency=1)
+
+    async def broken() -> None:
+        raise TypeError("bad argument")
+
+    assert refresher.submit_async("k", broken)
+    (task,) = refresher._tasks
+    with pytest.raises(TypeError):
+        await task
+
+    assert CACHE_REFRESHES.value(outcome="error") == 0
+    assert refresher.in_flight() == 0
+
+
+def test_get_refresher_disabled_with_zero_concurrency(make_settings):
+    """Arrange: CACHE_REFRESH_CONCURRENCY=0
+    Act: Get the refresher
+    Assert: None"""
+    assert get_refresher(make_settings(cache_refresh_concurrency=0)) is None
+
+
+def test_query_icaet_serves_stale_answer_while_refreshing(make_settings):
+    """Arrange: Cached answer past its soft TTL and an API with a newer answer
+    Act: Ask the question again
+    Assert: The cached answer is returned at once and replaced in the background"""
+    settings = make_settings()
+    key = cache_key(settings.user_email, "Who spoke?")
+    with (
+        patch("icsaet_mcp.tools.get_settings", return_value=settings),
+        patch("httpx.Client") as mock_client,
+    ):
+        mock_client.return_value.post.return_value = api_response("Old answer")
+        query_icaet("Who spoke?")
+        mock_client.return_value.post.return_value = api_response("New answer")
+
+        served = query_icaet("Who spoke?")
+        wait_for_refreshes(get_refresher(settings))
+
+    assert served == "Old answer"
+    assert mock_client.return_value.post.call_count == 2
+    assert get_answer_cache(settings).get(key) == "New answer"
+
+
+def test_query_icaet_does_not_refresh_fresh_answers(make_settings):
+    """Arrange: Default one-hour hard TTL and 30 minute soft TTL
+    Act: Ask the same question twice
+    Assert: One upstream request and no refresh"""
+    settings = make_settings(cache_soft_ttl_seconds=1800.0)
+    with (
+        patch("icsaet_mcp.tools.get_settings", return_value=settings),
+        patch("httpx.Client") as mock_client,
+    ):
+        mock_client.return_value.post.return_value = api_response("Answer")
+        query_icaet("Who spoke?")
+        query_icaet("Who spoke?")
+
+    mock_client.return_value.post.assert_called_once()
+    assert CACHE_REFRESHES.value(outcome="ok") == 0
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_query_icaet_async_refreshes_in_background_task(make_settings):
+    """Arrange: Cached answer past its soft TTL and a slow API with a newer answer
+    Act: Ask the question again
+    Assert: The cached answer is returned before the refresh completes"""
+    settings = make_settings()
+    key = cache_key(settings.user_email, "Who spoke?")
+    responses = iter(["Old answer", "New answer"])
+
+    async def answer(request: httpx.Request) -> httpx.Response:
+        text = next(responses)
+        if text == "New answer":
+            await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"answer": text})
+
+    route = respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(side_effect=answer)
+    with patch("icsaet_mcp.tools.get_settings", return_value=settings):
+        await query_icaet_async("Who spoke?")
+        served = await query_icaet_async("Who spoke?")
+        refreshing = get_refresher(settings).in_flight()
+        while get_refresher(settings).in_flight():
+            await asyncio.sleep(0.01)
+
+    assert served == "Old answer"
+    assert refreshing == 1
+    assert route.call_count == 2
+    assert get_answer_cache(settings).get(key) == "New answer"
@@ -0,0 +1,380 @@
+"""Unit tests for retry policy, retry budget and circuit breaker."""
+
+import time
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+
+from icsaet_mcp.client import AsyncICAETClient, ICAETClient
+from icsaet_mcp.config import Settings
+from icsaet_mcp.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    RetryBudget,
+    RetryPolicy,
+    is_retryable,
+    parse_retry_after,
+)
+from icsaet_mcp.tools import circuit_status, query_icaet
+
+REQUEST = httpx.Request("POST", "https://test/query")
+
+
+def status_error(status: int, headers: dict[str, str] | None = None):
+    response = httpx.Response(status, headers=headers, request=REQUEST)
+    return httpx.HTTPStatusError("error", request=REQUEST, response=response)
+
+
+def make_policy(**overrides) -> RetryPolicy:
+    options = {
+        "max_attempts": 3,
+        "backoff_base": 0.1,
+        "backoff_max": 1.0,
+        "deadline": 60.0,
+        "budget": RetryBudget(ratio=0.2, max_tokens=10),
+    }
+    options.update(overrides)
+    return RetryPolicy(**options)
+
+
+def failing_then(errors: list[Exception], result: str = "ok"):
+    remaining = list(errors)
+    calls = []
+
+    def fn() -> str:
+        calls.append(1)
+        if remaining:
+            raise remaining.pop(0)
+        return result
+
+    return fn, calls
+
+
+@pytest.mark.parametrize(
+    "error,expected",
+    [
+        (httpx.ReadTimeout("t", request=REQUEST), True),
+        (httpx.ConnectError("reset", request=REQUEST), True),
+        (httpx.RemoteProtocolError("closed", request=REQUEST), True),
+        (status_error(429), True),
+        (status_error(503), True),
+        (status_error(500), False),
+        (status_error(401), False),
+    ],
+)
+def test_is_retryable(error, expected):
+    """Arrange: Various httpx errors
+    Act: Classify each
+    Assert: Only transient failures are retryable"""
+    assert is_retryable(error) is expected
+
+
+def test_parse_retry_after_seconds_and_date():
+    """Arrange: Retry-After given in seconds and as an HTTP date
+    Act: Parse both
+    Assert: Both yield a delay in seconds"""
+    later = datetime.now(UTC) + timedelta(seconds=30)
+    as_seconds = httpx.Response(429, headers={"Retry-After": "7"})
+    as_date = httpx.Response(429, headers={"Retry-After": format_datetime(later)})
+
+    assert parse_retry_after(as_seconds) == 7.0
+    assert 25 < parse_retry_after(as_date) <= 30
+    assert parse_retry_after(httpx.Response(429)) is None
+
+
+def test_budget_limits_retries_to_ratio():
+    """Arrange: Empty-ish budget with ratio 0.5
+    Act: Deposit twice, withdraw twice
+    Assert: Only one retry is allowed"""
+    budget = RetryBudget(ratio=0.5, max_tokens=1)
+    assert budget.try_withdraw()
+
+    budget.deposit()
+    budget.deposit()
+
+    assert budget.try_withdraw()
+    assert not budget.try_withdraw()
+
+
+def test_policy_retries_transient_errors_until_success():
+    """Arrange: Function failing with 503 then a timeout
+    Act: Call through the policy
+    Assert: Succeeds on the third attempt with two backoff sleeps"""
+    fn, calls = failing_then(
+        [status_error(503), httpx.ReadTimeout("t", request=REQUEST)]
+    )
+    sleeps: list[float] = []
+
+    assert make_policy().call(fn, sleep=sleeps.append) == "ok"
+    assert len(calls) == 3
+    assert len(sleeps) == 2
+    assert all(0 <= delay <= 1.0 for delay in sleeps)
+
+
+def test_policy_does_not_retry_permanent_errors():
+    """Arrange: Function failing with 401
+    Act: Call through the policy
+    Assert: Error raised after a single attempt"""
+    fn, calls = failing_then([status_error(401)])
+
+    with pytest.raises(httpx.HTTPStatusError):
+        make_policy().call(fn, sleep=lambda _: None)
+    assert len(calls) == 1
+
+
+def test_policy_gives_up_after_max_attempts():
+    """Arrange: Function that always times out
+    Act: Call through the policy
+    Assert: Last error raised after max_attempts"""
+    fn, calls = failing_then([httpx.ReadTimeout("t", request=REQUEST)] * 5)
+
+    with pytest.raises(httpx.ReadTimeout):
+        make_policy(max_attempts=3).call(fn, sleep=lambda _: None)
+    assert len(calls) == 3
+
+
+def test_policy_honours_retry_after():
+    """Arrange: 429 with Retry-After: 2
+    Act: Call through the policy
+    Assert: Sleeps at least the advertised delay"""
+    fn, _ = failing_then([status_error(429, {"Retry-After": "2"})])
+    sleeps: list[float] = []
+
+    make_policy().call(fn, sleep=sleeps.append)
+
+    assert sleeps == [2.0]
+
+
+def test_policy_respects_deadline():
+    """Arrange: Retry-After longer than the per-call deadline
+    Act: Call through the policy
+    Assert: Gives up instead of sleeping past the deadline"""
+    fn, calls = failing_then([status_error(503, {"Retry-After": "30"})])
+
+    with pytest.raises(httpx.HTTPStatusError):
+        make_policy(deadline=10.0).call(fn, sleep=lambda _: None)
+    assert len(calls) == 1
+
+
+def test_policy_respects_request_deadline():
+    """Arrange: Retry-After of 2 seconds and a request deadline 1 second away
+    Act: Call through the policy
+    Assert: Gives up instead of retrying past the request's deadline"""
+    fn, calls = failing_then([status_error(503, {"Retry-After": "2"})])
+
+    with pytest.raises(httpx.HTTPStatusError):
+        make_policy().call(fn, sleep=lambda _: None, deadline=time.monotonic() + 1.0)
+    assert len(calls) == 1
+
+
+def test_policy_stops_when_budget_exhausted():
+    """Arrange: Budget with no tokens
+    Act: Call a failing function through the policy
+    Assert: No retry is attempted"""
+    fn, calls = failing_then([status_error(503)])
+    budget = RetryBudget(ratio=0.0, max_tokens=0)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        make_policy(budget=budget).call(fn, sleep=lambda _: None)
+    assert len(calls) == 1
+
+
+@respx.mock
+def test_client_retries_then_returns_answer():
+    """Arrange: API returning 502 once, then an answer
+    Act: Query through ICAETClient
+    Assert: Answer returned after two POSTs"""
+    route = respx.post(f"{ICAETClient.BASE_URL}/query").mock(
+        side_effect=[httpx.Response(502), httpx.Response(200, json={"answer": "ok"})]
+    )
+    settings = Settings.model_construct(
+        icaet_api_key="test-key", user_email="test@example.com", retry_backoff_base=0
+    )
+
+    with ICAETClient(settings) as client:
+        assert client.query("q") == {"answer": "ok"}
+    assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_async_client_keeps_error_mapping_after_retries():
+    """Arrange: API always returning 503
+    Act: Query through AsyncICAETClient
+    Assert: Same RuntimeError as before, after max attempts"""
+    route = respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(503)
+    )
+    settings = Settings.model_construct(
+        icaet_api_key="test-key", user_email="test@example.com", retry_backoff_base=0
+    )
+
+    async with AsyncICAETClient(settings) as client:
+        with pytest.raises(RuntimeError, match="API error: 503"):
+            await client.query("q")
+    assert route.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_policy_call_async_retries():
+    """Arrange: Coroutine failing once with a connection error
+    Act: Call through the async policy
+    Assert: Succeeds on the second attempt"""
+    attempts = 0
+
+    async def fn() -> str:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise httpx.ConnectError("reset", request=REQUEST)
+        return "ok"
+
+    async def no_sleep(_: float) -> None:
+        return None
+
+    assert await make_policy().call_async(fn, sleep=no_sleep) == "ok"
+    assert attempts == 2
+
+
+def make_breaker(clock, **overrides) -> CircuitBreaker:
+    options = {"failure_threshold": 2, "reset_timeout": 10.0}
+    options.update(overrides)
+    return CircuitBreaker(clock=clock, **options)
+
+
+def fail_through(breaker: CircuitBreaker, error: Exception) -> None:
+    with pytest.raises(type(error)), breaker.guard():
+        raise error
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    """Arrange: Breaker with threshold 2
+    Act: Two outage failures, then another call
+    Assert: Circuit open and the call fails fast"""
+    breaker = make_breaker(clock)
+    fail_through(breaker, status_error(503))
+    assert breaker.state is CircuitState.CLOSED
+    fail_through(breaker, httpx.ConnectError("down", request=REQUEST))
+
+    assert breaker.state is CircuitState.OPEN
+    with (
+        pytest.raises(CircuitOpenError, match="try again in 10 seconds"),
+        breaker.guard(),
+    ):
+        pass
+
+
+def test_breaker_ignores_client_errors(clock):
+    """Arrange: Breaker with threshold 2
+    Act: Fail twice with 401
+    Assert: Circuit stays closed"""
+    breaker = make_breaker(clock)
+    fail_through(breaker, status_error(401))
+    fail_through(breaker, status_error(401))
+
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_breaker_half_open_probe_closes_on_success(clock):
+    """Arrange: Open breaker whose reset timeout has elapsed
+    Act: Run one successful probe
+    Assert: Circuit closes"""
+    breaker = make_breaker(clock, failure_threshold=1)
+    fail_through(breaker, status_error(503))
+    clock.now = 10.0
+    assert breaker.state is CircuitState.HALF_OPEN
+
+    with breaker.guard():
+        pass
+
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_breaker_half_open_limits_probes_and_reopens_on_failure(clock):
+    """Arrange: Half-open breaker allowing one probe
+    Act: Start a probe, try a second call, then fail the probe
+    Assert: Second call fails fast and the circuit reopens"""
+    breaker = make_breaker(clock, failure_threshold=1)
+    fail_through(breaker, status_error(503))
+    clock.now = 10.0
+
+    with pytest.raises(httpx.HTTPStatusError), breaker.guard():
+        with pytest.raises(CircuitOpenError), breaker.guard():
+            pass
+        raise status_error(503)
+
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.snapshot()["retry_in_seconds"] == 10.0
+
+
+def test_breaker_releases_probe_on_cancellation(clock):
+    """Arrange: Half-open breaker allowing one probe
+    Act: Probe interrupted by a non-HTTP exception
+    Assert: Probe slot is released for the next caller"""
+    breaker = make_breaker(clock, failure_threshold=1)
+    fail_through(breaker, status_error(503))
+    clock.now = 10.0
+
+    with pytest.raises(KeyboardInterrupt), breaker.guard():
+        raise KeyboardInterrupt
+
+    with breaker.guard():
+        pass
+    assert breaker.state is CircuitState.CLOSED
+
+
+@respx.mock
+def test_client_fails_fast_while_circuit_open():
+    """Arrange: API down and breaker threshold of 1
+    Act: Query twice
+    Assert: Second query fails fast without reaching the API"""
+    route = respx.post(f"{ICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(500)
+    )
+    settings = Settings.model_construct(
+        icaet_api_key="test-key",
+        user_email="test@example.com",
+        breaker_failure_threshold=1,
+    )
+
+    with ICAETClient(settings) as client:
+        with pytest.raises(RuntimeError, match="API error: 500"):
+            client.query("q")
+        with pytest.raises(CircuitOpenError):
+            client.query("q")
+    assert route.call_count == 1
+
+
+@respx.mock
+def test_query_serves_stale_answer_while_circuit_open():
+    """Arrange: Answer cached, then expired, and the API goes down
+    Act: Ask again after the circuit has opened
+    Assert: Stale answer is served and the status tool reports open"""
+    respx.post(f"{ICAETClient.BASE_URL}/query").mock(
+        side_effect=[
+            httpx.Response(200, json={"answer": "Old answer"}),
+            httpx.Response(500),
+        ]
+    )
+    settings = Settings.model_construct(
+        icaet_api_key="test-key",
+        user_email="test@example.com",
+        cache_ttl_seconds=0.01,
+        breaker_failure_threshold=1,
+    )
+
+    with patch("icsaet_mcp.tools.get_settings", return_value=settings):
+        assert query_icaet("Q?") == "Old answer"
+        time.sleep(0.02)
+        with pytest.raises(RuntimeError, match="API error: 500"):
+            query_icaet("Q?")
+        result = query_icaet("Q?")
+        status = circuit_status()
+
+    assert result == "Old answer"
+    assert status["state"] == "open"
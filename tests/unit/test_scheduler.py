@@ -0,0 +1,285 @@
+"""Unit tests for request priority scheduling, deadlines and cancellation."""
+
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+
+from icsaet_mcp.client import AsyncICAETClient
+from icsaet_mcp.scheduler import (
+    DeadlineExceededError,
+    Priority,
+    RequestScheduler,
+    deadline_after,
+    deadline_scope,
+    get_scheduler,
+    time_left,
+)
+from icsaet_mcp.tools import query, query_icaet_async
+
+
+async def admit_in_order(
+    scheduler: RequestScheduler, requests: list[tuple[str, Priority, float | None]]
+) -> list[str]:
+    """Queue requests behind a held slot and record the order they run in."""
+    admitted: list[str] = []
+    release = asyncio.Event()
+
+    async def hold() -> None:
+        async with scheduler.slot(Priority.INTERACTIVE):
+            await release.wait()
+
+    async def run(name: str, priority: Priority, deadline: float | None) -> None:
+        async with scheduler.slot(priority, deadline):
+            admitted.append(name)
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(run(*request)) for request in requests]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(holder, *waiters)
+    return admitted
+
+
+@pytest.mark.asyncio
+async def test_scheduler_admits_by_priority_then_deadline():
+    """Arrange: One slot held and requests queued in mixed classes
+    Act: Release the slot
+    Assert: Interactive first, then batch by earliest deadline, then background"""
+    scheduler = RequestScheduler(max_concurrency=1)
+
+    admitted = await admit_in_order(
+        scheduler,
+        [
+            ("prewarm", Priority.BACKGROUND, None),
+            ("batch-late", Priority.BATCH, 200.0),
+            ("batch-early", Priority.BATCH, 100.0),
+            ("typed", Priority.INTERACTIVE, None),
+        ],
+    )
+
+    assert admitted == ["typed", "batch-early", "batch-late", "prewarm"]
+    assert (scheduler.active(), scheduler.queued()) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue_without_a_slot():
+    """Arrange: One slot held and two queued requests
+    Act: Cancel the first waiter, then release the slot
+    Assert: The other waiter runs and the slot count returns to zero"""
+    scheduler = RequestScheduler(max_concurrency=1)
+    release = asyncio.Event()
+    ran: list[str] = []
+
+    async def hold() -> None:
+        async with scheduler.slot(Priority.INTERACTIVE):
+            await release.wait()
+
+    async def run(name: str) -> None:
+        async with scheduler.slot(Priority.INTERACTIVE):
+            ran.append(name)
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    first, second = asyncio.create_task(run("a")), asyncio.create_task(run("b"))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    queued = scheduler.queued()
+    release.set()
+    await asyncio.gather(holder, second)
+
+    assert first.cancelled()
+    assert queued == 1
+    assert ran == ["b"]
+    assert scheduler.active() == 0
+
+
+def test_scheduler_defaults_to_connection_pool_size(make_settings):
+    """Arrange: Settings with a 32 connection pool and no explicit cap
+    Act: Build the shared scheduler
+    Assert: It admits as many requests as the pool holds connections"""
+    scheduler = get_scheduler(make_settings(icaet_max_connections=32))
+
+    assert scheduler.max_concurrency == 32
+
+
+@pytest.mark.asyncio
+async def test_deadline_scope_raises_deadline_exceeded():
+    """Arrange: 50 ms deadline
+    Act: Sleep for a second inside the scope
+    Assert: DeadlineExceededError, a RuntimeError, after about 50 ms"""
+    start = time.monotonic()
+
+    with pytest.raises(RuntimeError, match="did not finish in time"):
+        async with deadline_scope(deadline_after(0.05)):
+            await asyncio.sleep(1)
+
+    assert time.monotonic() - start < 0.5
+
+
+def test_time_left():
+    """Arrange: No deadline, a future deadline and a past one
+    Act: Ask for the time left
+    Assert: None, a positive number, and DeadlineExceededError"""
+    assert time_left(None) is None
+    assert 0 < time_left(deadline_after(10)) <= 10
+    with pytest.raises(DeadlineExceededError):
+        time_left(time.monotonic() - 1)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_interactive_query_overtakes_queued_background_work(make_settings):
+    """Arrange: One upstream slot busy with a prewarm and another prewarm queued
+    Act: Ask an interactive question
+    Assert: The interactive question reaches the API before the queued prewarm"""
+    settings = make_settings(upstream_max_concurrency=1, cache_enabled=False)
+    order: list[str] = []
+
+    async def answer(request: httpx.Request) -> httpx.Response:
+        question = json.loads(request.content)["question"]
+        order.append(question)
+        await asyncio.sleep(0.02)
+        return httpx.Response(200, json={"answer": question})
+
+    respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(side_effect=answer)
+    with patch("icsaet_mcp.tools.get_settings", return_value=settings):
+        running = asyncio.create_task(
+            query_icaet_async("prewarm one", priority=Priority.BACKGROUND)
+        )
+        await asyncio.sleep(0.005)
+        queued = asyncio.create_task(
+            query_icaet_async("prewarm two", priority=Priority.BACKGROUND)
+        )
+        await asyncio.sleep(0)
+        await query_icaet_async("typed question")
+        await asyncio.gather(running, queued)
+
+    assert order == ["prewarm one", "typed question", "prewarm two"]
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_query_deadline_aborts_upstream_request(make_settings):
+    """Arrange: API that takes 5 seconds and a 100 ms query deadline
+    Act: Call the query tool
+    Assert: DeadlineExceededError quickly and the upstream request is cancelled"""
+    settings = make_settings(query_deadline_seconds=0.1)
+    upstream: dict[str, bool] = {}
+
+    async def slow(request: httpx.Request) -> httpx.Response:
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            upstream["cancelled"] = True
+            raise
+        return httpx.Response(200, json={"answer": "late"})
+
+    respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(side_effect=slow)
+    start = time.monotonic()
+    with patch("icsaet_mcp.tools.get_settings", return_value=settings):
+        with pytest.raises(DeadlineExceededError):
+            await query("Slow question?")
+        elapsed = time.monotonic() - start
+        # The shared upstream task is cancelled without waiting for it
+        await asyncio.sleep(0.01)
+
+    assert elapsed < 1
+    assert upstream == {"cancelled": True}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_cancelling_query_aborts_upstream_request(make_settings):
+    """Arrange: API that takes 5 seconds
+    Act: Cancel the query tool call, as when the MCP client cancels
+    Assert: The in-flight upstream request is cancelled too"""
+    settings = make_settings()
+    upstream: dict[str, bool] = {}
+
+    async def slow(request: httpx.Request) -> httpx.Response:
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            upstream["cancelled"] = True
+            raise
+        return httpx.Response(200, json={"answer": "late"})
+
+    respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(side_effect=slow)
+    with patch("icsaet_mcp.tools.get_settings", return_value=settings):
+        call = asyncio.create_task(query("Slow question?"))
+        await asyncio.sleep(0.05)
+        call.cancel()
+        await asyncio.gather(call, return_exceptions=True)
+        await asyncio.sleep(0.01)
+
+    assert call.cancelled()
+    assert upstream == {"cancelled": True}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_joined_callers_share_one_slot(make_settings):
+    """Arrange: One upstream slot busy with another question
+    Act: Ask the same question twice while the slot is busy
+    Assert: Only one request queues and both callers get its answer"""
+    settings = make_settings(upstream_max_concurrency=1, cache_enabled=False)
+    calls: list[str] = []
+
+    async def answer(request: httpx.Request) -> httpx.Response:
+        question = json.loads(request.content)["question"]
+        calls.append(question)
+        await asyncio.sleep(0.02)
+        return httpx.Response(200, json={"answer": question})
+
+    respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(side_effect=answer)
+    scheduler = get_scheduler(settings)
+    with patch("icsaet_mcp.tools.get_settings", return_value=settings):
+        busy = asyncio.create_task(query_icaet_async("Busy question?"))
+        await asyncio.sleep(0.005)
+        first = asyncio.create_task(query_icaet_async("Shared question?"))
+        second = asyncio.create_task(query_icaet_async("Shared question?"))
+        await asyncio.sleep(0.005)
+        queued = scheduler.queued()
+        answers = await asyncio.gather(busy, first, second)
+
+    assert queued == 1
+    assert answers[1:] == ["Shared question?", "Shared question?"]
+    assert calls == ["Busy question?", "Shared question?"]
+    assert scheduler.active() == 0
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_cancelled_starter_leaves_slot_with_joined_request(make_settings):
+    """Arrange: Two callers sharing one upstream request under a one slot cap
+    Act: Cancel the caller that started it
+    Assert: The request keeps its slot until it answers the other caller"""
+    settings = make_settings(upstream_max_concurrency=1, cache_enabled=False)
+
+    async def answer(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"answer": "shared"})
+
+    respx.post(f"{AsyncICAETClient.BASE_URL}/query").mock(side_effect=answer)
+    scheduler = get_scheduler(settings)
+    with patch("icsaet_mcp.tools.get_settings", return_value=settings):
+        starter = asyncio.create_task(query_icaet_async("Shared question?"))
+        await asyncio.sleep(0.01)
+        joiner = asyncio.create_task(query_icaet_async("Shared question?"))
+        await asyncio.sleep(0.01)
+        starter.cancel()
+        await asyncio.sleep(0.01)
+        active = scheduler.active()
+        result = await joiner
+
+    assert starter.cancelled()
+    assert active == 1
+    assert result == "shared"
+    assert scheduler.active() == 0
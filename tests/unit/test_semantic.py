@@ -0,0 +1,245 @@
+"""Unit tests for the semantic near-duplicate answer cache."""
+
+import logging
+from functools import partial
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+
+from icsaet_mcp.client import ICAETClient
+from icsaet_mcp.semantic import (
+    get_semantic_cache,
+    numpy_available,
+    question_features,
+    question_intent,
+)
+from icsaet_mcp.tools import cache_stats, query_icaet
+
+needs_numpy = pytest.mark.skipif(not numpy_available(), reason="numpy not installed")
+
+
+@pytest.fixture
+def make_settings(make_settings):
+    """Build Settings with the semantic cache enabled."""
+    return partial(make_settings, semantic_cache_enabled=True)
+
+
+def make_cache(**overrides):
+    from icsaet_mcp.semantic import SemanticCache
+
+    options = {"threshold": 0.85, "ttl_seconds": 60.0, "max_entries": 100}
+    options.update(overrides)
+    return SemanticCache(**options)
+
+
+def test_question_features_drop_stopwords_and_possessives():
+    """Arrange: Two phrasings of the same question
+    Act: Extract their word features
+    Assert: Only the topic words remain, identical for both"""
+
+    def words(question: str) -> set[str]:
+        return {f for f, _ in question_features(question) if f.startswith("w:")}
+
+    assert words("What did Leslie Miley talk about?") == {"w:leslie", "w:miley"}
+    assert words("Leslie Miley's talk topics?") == {"w:leslie", "w:miley"}
+
+
+def test_question_intent_from_first_question_word():
+    """Arrange: Questions with and without question words
+    Act: Classify their intent
+    Assert: What/which and no question word share the generic intent"""
+    assert question_intent("What did Leslie Miley talk about?") == ""
+    assert question_intent("Which talks covered AI?") == ""
+    assert question_intent("Leslie Miley's talk topics?") == ""
+    assert question_intent("Who is Leslie Miley?") == "who"
+    assert question_intent("When did Leslie Miley speak?") == "when"
+    assert question_intent("How did they say when to deploy?") == "how"
+
+
+@needs_numpy
+@pytest.mark.parametrize(
+    "cached,asked",
+    [
+        ("What did Leslie Miley talk about?", "Leslie Miley's talk topics?"),
+        ("What sessions covered AI ethics?", "Which talks were about AI ethics?"),
+        (
+            "Who spoke about platform engineering?",
+            "who talked about platform engineering",
+        ),
+    ],
+)
+def test_semantic_cache_matches_paraphrases(cached, asked):
+    """Arrange: Semantic cache holding an answer
+    Act: Look up a paraphrase
+    Assert: The cached answer is served"""
+    cache = make_cache()
+    cache.set("test@example.com", cached, "Answer")
+
+    assert cache.get("test@example.com", asked) == "Answer"
+
+
+@needs_numpy
+@pytest.mark.parametrize(
+    "cached,asked",
+    [
+        ("What did Leslie Miley talk about?", "What did Kelsey Hightower talk about?"),
+        ("Who spoke about platform engineering?", "Who spoke about data engineering?"),
+        ("What sessions covered AI ethics?", "What sessions covered AI?"),
+        ("What did Leslie Miley talk about?", "Who is Leslie Miley?"),
+        ("What did Leslie Miley talk about?", "When did Leslie Miley speak?"),
+        ("What did Leslie Miley talk about?", "Where did Leslie Miley present?"),
+        ("What did Leslie Miley talk about?", "Why did Leslie Miley speak?"),
+        ("Who spoke about platform engineering?", "How is platform engineering?"),
+    ],
+)
+def test_semantic_cache_rejects_different_questions(cached, asked):
+    """Arrange: Semantic cache holding an answer
+    Act: Look up a question on a different topic
+    Assert: Nothing is served"""
+    cache = make_cache()
+    cache.set("test@example.com", cached, "Answer")
+
+    assert cache.get("test@example.com", asked) is None
+
+
+@needs_numpy
+def test_semantic_cache_is_scoped_per_user():
+    """Arrange: Answer cached for one user
+    Act: Ask the same question as another user
+    Assert: The other user misses"""
+    cache = make_cache()
+    cache.set("alice@example.com", "What did Leslie Miley talk about?", "Answer")
+
+    assert cache.get("bob@example.com", "What did Leslie Miley talk about?") is None
+    assert cache.get("ALICE@example.com", "Leslie Miley's talk?") == "Answer"
+
+
+@needs_numpy
+def test_semantic_cache_expires_entries(clock):
+    """Arrange: Semantic cache with a 60s TTL
+    Act: Look up after the TTL has passed
+    Assert: Expired answers are not served"""
+    cache = make_cache(clock=clock)
+    cache.set("test@example.com", "What did Leslie Miley talk about?", "Answer")
+
+    clock.now += 61
+
+    assert cache.get("test@example.com", "What did Leslie Miley talk about?") is None
+
+
+@needs_numpy
+def test_expired_best_match_does_not_hide_live_match(clock):
+    """Arrange: An expired exact match and a live, weaker match
+    Act: Ask for the single nearest question
+    Assert: The live match is returned instead of nothing"""
+    cache = make_cache(clock=clock)
+    cache.set("test@example.com", "What did Leslie Miley talk about?", "Old")
+    clock.now += 30
+    cache.set("test@example.com", "Leslie Miley keynote topics?", "Live")
+    clock.now += 31
+
+    matches = cache.nearest("test@example.com", "What did Leslie Miley talk about?")
+
+    assert [answer for _, _, answer in matches] == ["Live"]
+
+
+@needs_numpy
+def test_semantic_cache_overwrites_oldest_when_full():
+    """Arrange: Semantic cache limited to two entries per user
+    Act: Store three questions
+    Assert: The first is replaced and the index stays at two entries"""
+    cache = make_cache(max_entries=2)
+    for speaker in ("Leslie Miley", "Kelsey Hightower", "Charity Majors"):
+        cache.set("test@example.com", f"What did {speaker} talk about?", speaker)
+
+    assert cache.get("test@example.com", "Leslie Miley talk") is None
+    assert cache.get("test@example.com", "Charity Majors talk") == "Charity Majors"
+    assert cache.stats()["entries"] == 2
+
+
+@needs_numpy
+def test_nearest_returns_top_k_best_first():
+    """Arrange: Semantic cache with several speakers
+    Act: Ask for the top 2 matches
+    Assert: Matches are ordered by similarity"""
+    cache = make_cache()
+    for question in (
+        "What did Leslie Miley talk about?",
+        "What did Leslie Lamport talk about?",
+        "What did Kelsey Hightower talk about?",
+    ):
+        cache.set("test@example.com", question, question)
+
+    matches = cache.nearest("test@example.com", "Leslie Miley keynote", k=2)
+
+    assert [question for _, question, _ in matches] == [
+        "What did Leslie Miley talk about?",
+        "What did Leslie Lamport talk about?",
+    ]
+    assert matches[0][0] > matches[1][0]
+
+
+@needs_numpy
+@respx.mock
+def test_query_serves_paraphrase_from_semantic_cache(make_settings):
+    """Arrange: Mock API and semantic cache enabled
+    Act: Ask a question, then a paraphrase of it
+    Assert: Only one upstream call is made and stats report the hit"""
+    route = respx.post(f"{ICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(200, json={"answer": "Test answer"})
+    )
+
+    with patch("icsaet_mcp.tools.get_settings", return_value=make_settings()):
+        first = query_icaet("What did Leslie Miley talk about?")
+        second = query_icaet("Leslie Miley's talk topics?")
+        stats = cache_stats()
+
+    assert first == second == "Test answer"
+    assert route.call_count == 1
+    assert stats["semantic"]["hits"] == 1
+
+
+@needs_numpy
+@respx.mock
+def test_query_does_not_serve_answer_to_different_question_word(make_settings):
+    """Arrange: Mock API returning a different answer per question
+    Act: Ask what Leslie Miley talked about, then who Leslie Miley is, twice
+    Assert: The second question gets its own answer, from the API once and
+    then from the exact-match cache"""
+    route = respx.post(f"{ICAETClient.BASE_URL}/query").mock(
+        side_effect=[
+            httpx.Response(200, json={"answer": "Topics"}),
+            httpx.Response(200, json={"answer": "Biography"}),
+        ]
+    )
+
+    with patch("icsaet_mcp.tools.get_settings", return_value=make_settings()):
+        topics = query_icaet("What did Leslie Miley talk about?")
+        who = query_icaet("Who is Leslie Miley?")
+        again = query_icaet("Who is Leslie Miley?")
+
+    assert (topics, who, again) == ("Topics", "Biography", "Biography")
+    assert route.call_count == 2
+
+
+def test_semantic_cache_disabled_by_default(make_settings):
+    """Arrange: Default settings
+    Act: Get the semantic cache
+    Assert: It is disabled"""
+    assert get_semantic_cache(make_settings(semantic_cache_enabled=False)) is None
+
+
+def test_semantic_cache_without_numpy_is_disabled_with_warning(caplog, make_settings):
+    """Arrange: Semantic cache enabled but numpy missing
+    Act: Get the semantic cache
+    Assert: It is disabled and the install hint is logged"""
+    with (
+        patch("icsaet_mcp.semantic.numpy_available", return_value=False),
+        caplog.at_level(logging.WARNING),
+    ):
+        cache = get_semantic_cache(make_settings())
+
+    assert cache is None
+    assert "icsaet-mcp[semantic]" in caplog.text
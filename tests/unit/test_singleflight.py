@@ -0,0 +1,193 @@
+"""Unit tests for in-flight request coalescing."""
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+
+from icsaet_mcp.config import Settings
+from icsaet_mcp.singleflight import AsyncSingleFlight, SingleFlight
+from icsaet_mcp.tools import ICAETClient, query_icaet, query_icaet_async
+
+UNCACHED_SETTINGS = Settings.model_construct(
+    icaet_api_key="test-key", user_email="test@example.com", cache_enabled=False
+)
+
+
+def test_sync_calls_with_same_key_are_coalesced():
+    """Arrange: Slow function and five threads asking for the same key
+    Act: Call do() concurrently
+    Assert: Function runs once and every caller gets its result"""
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = 0
+
+    def fetch() -> str:
+        nonlocal calls
+        calls += 1
+        release.wait(timeout=5)
+        return "shared"
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futures = [pool.submit(flights.do, "k", fetch) for _ in range(5)]
+        threading.Timer(0.2, release.set).start()
+        results = [future.result(timeout=5) for future in futures]
+
+    assert results == ["shared"] * 5
+    assert calls == 1
+    assert flights.in_flight() == 0
+
+
+def test_sync_error_is_shared_and_not_remembered():
+    """Arrange: Function that fails once
+    Act: Call do() twice in sequence
+    Assert: First call raises, second call runs fn again"""
+    flights = SingleFlight()
+    outcomes = iter([RuntimeError("boom"), "ok"])
+
+    def fetch() -> str:
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    with pytest.raises(RuntimeError, match="boom"):
+        flights.do("k", fetch)
+    assert flights.do("k", fetch) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_async_calls_with_same_key_are_coalesced():
+    """Arrange: Slow coroutine and three concurrent callers
+    Act: Await do() concurrently
+    Assert: Coroutine runs once and all callers share the result"""
+    flights = AsyncSingleFlight()
+    calls = 0
+
+    async def fetch() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "shared"
+
+    results = await asyncio.gather(*(flights.do("k", fetch) for _ in range(3)))
+
+    assert results == ["shared"] * 3
+    assert calls == 1
+    assert flights.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_async_error_is_shared():
+    """Arrange: Failing coroutine and two concurrent callers
+    Act: Await do() concurrently
+    Assert: Both callers receive the error"""
+    flights = AsyncSingleFlight()
+
+    async def fetch() -> str:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        flights.do("k", fetch), flights.do("k", fetch), return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_async_cancelled_waiter_does_not_cancel_others():
+    """Arrange: Two callers sharing one slow call
+    Act: Cancel the first caller
+    Assert: Second caller still receives the result"""
+    flights = AsyncSingleFlight()
+
+    async def fetch() -> str:
+        await asyncio.sleep(0.05)
+        return "shared"
+
+    first = asyncio.create_task(flights.do("k", fetch))
+    second = asyncio.create_task(flights.do("k", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "shared"
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_async_call_cancelled_when_all_waiters_leave():
+    """Arrange: One caller waiting on a slow call
+    Act: Cancel the caller
+    Assert: Shared call is cancelled too"""
+    flights = AsyncSingleFlight()
+    finished = False
+
+    async def fetch() -> str:
+        nonlocal finished
+        await asyncio.sleep(0.05)
+        finished = True
+        return "shared"
+
+    caller = asyncio.create_task(flights.do("k", fetch))
+    await asyncio.sleep(0)
+    caller.cancel()
+    await asyncio.sleep(0.1)
+
+    assert not finished
+    assert flights.in_flight() == 0
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_query_icaet_async_coalesces_identical_questions():
+    """Arrange: Caching disabled and a slow upstream
+    Act: Ask the same question three times concurrently
+    Assert: One POST is sent upstream"""
+
+    async def slow_answer(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"answer": "once"})
+
+    route = respx.post(f"{ICAETClient.BASE_URL}/query").mock(side_effect=slow_answer)
+    with patch("icsaet_mcp.tools.get_settings", return_value=UNCACHED_SETTINGS):
+        results = await asyncio.gather(
+            query_icaet_async("What is ICAET?"),
+            query_icaet_async("what is icaet"),
+            query_icaet_async("What is ICAET?"),
+        )
+
+    assert results == ["once"] * 3
+    assert route.call_count == 1
+
+
+def test_query_icaet_coalesces_identical_questions_across_threads():
+    """Arrange: Caching disabled and a slow upstream
+    Act: Ask the same question from four threads at once
+    Assert: One POST is sent upstream"""
+    release = threading.Event()
+
+    def slow_answer(request: httpx.Request) -> httpx.Response:
+        release.wait(timeout=5)
+        question = json.loads(request.content)["question"]
+        return httpx.Response(200, json={"answer": question})
+
+    with (
+        respx.mock,
+        patch("icsaet_mcp.tools.get_settings", return_value=UNCACHED_SETTINGS),
+    ):
+        route = respx.post(f"{ICAETClient.BASE_URL}/query").mock(
+            side_effect=slow_answer
+        )
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(query_icaet, "Same?") for _ in range(4)]
+            threading.Timer(0.2, release.set).start()
+            results = [future.result(timeout=5) for future in futures]
+
+    assert results == ["Same?"] * 4
+    assert route.call_count == 1
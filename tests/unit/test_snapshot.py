@@ -0,0 +1,238 @@
+"""Unit tests for the local knowledge snapshot."""
+
+import json
+import sqlite3
+from functools import partial
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+
+from icsaet_mcp.cache import DiskAnswerCache
+from icsaet_mcp.client import ICAETClient
+from icsaet_mcp.snapshot import KnowledgeSnapshot, main, read_dump
+from icsaet_mcp.tools import query_icaet, search_local
+
+USER = "test@example.com"
+
+DOCUMENTS = [
+    (
+        "Leslie Miley keynote",
+        "Leslie Miley discussed the environmental cost of AI infrastructure.",
+        "sessions.json",
+    ),
+    (
+        "Platform engineering panel",
+        "Panelists covered internal developer platforms and golden paths.",
+        "sessions.json",
+    ),
+    (
+        "Data engineering workshop",
+        "A hands-on workshop about streaming pipelines and data contracts.",
+        "sessions.json",
+    ),
+]
+
+
+@pytest.fixture
+def make_settings(make_settings, tmp_path):
+    """Build Settings that read the snapshot under tmp_path."""
+    return partial(make_settings, snapshot_path=str(tmp_path / "snapshot.sqlite3"))
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    snapshot = KnowledgeSnapshot(tmp_path / "snapshot.sqlite3")
+    yield snapshot
+    snapshot.close()
+
+
+def test_search_ranks_matching_documents(snapshot):
+    """Arrange: Snapshot with three sessions
+    Act: Search for platform engineering
+    Assert: The platform panel ranks first with a highlighted snippet"""
+    snapshot.add_many(DOCUMENTS)
+
+    results = snapshot.search("Who talked about platform engineering?")
+
+    assert results[0].title == "Platform engineering panel"
+    assert results[0].source == "sessions.json"
+    assert results[0].score > results[-1].score
+    assert "**platforms**" in results[0].snippet
+
+
+def test_search_uses_stemming_and_ignores_fts_syntax(snapshot):
+    """Arrange: Snapshot with three sessions
+    Act: Search with a different word form and FTS5 operator characters
+    Assert: Stemmed matches are found and the query never errors"""
+    snapshot.add_many(DOCUMENTS)
+
+    assert snapshot.search("workshops")[0].title == "Data engineering workshop"
+    assert snapshot.search('pipelines" OR NEAR(*') != []
+    assert snapshot.search("what is the") == []
+
+
+def test_adding_same_title_replaces_document(snapshot):
+    """Arrange: Snapshot with a recorded answer
+    Act: Record a new answer to the same question, phrased differently
+    Assert: Only the newer answer remains"""
+    snapshot.add("What did Leslie Miley talk about?", "Old answer", user_email=USER)
+    snapshot.add("what did leslie miley talk about", "New answer", user_email=USER)
+
+    assert snapshot.count() == 1
+    assert snapshot.answer("What did Leslie Miley talk about?", USER) == "New answer"
+
+
+def test_answer_requires_same_content_words(snapshot):
+    """Arrange: Snapshot with a recorded answer
+    Act: Ask a paraphrase, a narrower and a broader question
+    Assert: Only the paraphrase is answered"""
+    snapshot.add("What did Leslie Miley talk about?", "Answer", user_email=USER)
+
+    assert snapshot.answer("Leslie Miley's talks?", USER) == "Answer"
+    assert snapshot.answer("What did Leslie talk about?", USER) is None
+    assert snapshot.answer("What did Leslie Miley say about hiring?", USER) is None
+
+
+def test_recorded_answers_are_scoped_to_their_user(snapshot):
+    """Arrange: Answer recorded for one user, plus shared session documents
+    Act: Ask and search as that user (in another case) and as another user
+    Assert: Only the owner gets the answer; everyone sees shared documents"""
+    snapshot.add_many(DOCUMENTS)
+    snapshot.add("What did Leslie Miley talk about?", "Mine", user_email="A@x.com")
+
+    assert snapshot.answer("Leslie Miley's talks?", "a@x.com") == "Mine"
+    assert snapshot.answer("Leslie Miley's talks?", "b@x.com") is None
+    owner = [result.title for result in snapshot.search("Leslie", user_email="a@x.com")]
+    other = [result.title for result in snapshot.search("Leslie", user_email="b@x.com")]
+    assert "What did Leslie Miley talk about?" in owner
+    assert other == ["Leslie Miley keynote"]
+
+
+def test_answer_ignores_imported_documents(snapshot):
+    """Arrange: Snapshot with only imported session documents
+    Act: Ask a question matching a document title
+    Assert: No answer is made up from a document"""
+    snapshot.add_many(DOCUMENTS)
+
+    assert snapshot.answer("Leslie Miley keynote", USER) is None
+
+
+def test_read_dump_accepts_json_and_json_lines(tmp_path):
+    """Arrange: JSON array and JSON-lines dumps
+    Act: Read both
+    Assert: Records are parsed with field aliases and default sources"""
+    array = tmp_path / "sessions.json"
+    array.write_text(json.dumps([{"title": "T", "body": "B", "source": "s"}]))
+    lines = tmp_path / "answers.jsonl"
+    lines.write_text(
+        '{"question": "Q", "answer": "A"}\n\n{"title": "T", "text": "X"}\n'
+    )
+
+    assert list(read_dump(array)) == [("T", "B", "s")]
+    assert list(read_dump(lines)) == [
+        ("Q", "A", "answers.jsonl"),
+        ("T", "X", "answers.jsonl"),
+    ]
+
+
+def test_read_dump_rejects_incomplete_records(tmp_path):
+    """Arrange: Dump with a record missing its body
+    Act: Read it
+    Assert: ValueError names the record"""
+    dump = tmp_path / "bad.jsonl"
+    dump.write_text('{"title": "T"}\n')
+
+    with pytest.raises(ValueError, match="record 1"):
+        list(read_dump(dump))
+
+
+def test_cli_imports_dump_and_cached_answers(tmp_path, capsys):
+    """Arrange: A dump file and a disk cache holding one answer
+    Act: Run the import, import-cache and search commands
+    Assert: Both sources are indexed and searchable"""
+    dump = tmp_path / "sessions.json"
+    dump.write_text(json.dumps([{"title": t, "body": b} for t, b, _ in DOCUMENTS]))
+    cache = DiskAnswerCache(
+        tmp_path / "cache", ttl_seconds=60, max_entries=10, max_bytes=10_000
+    )
+    cache.set("test@example.com\x00who spoke about kubernetes", "Kelsey Hightower")
+    cache.close()
+    path = str(tmp_path / "snapshot.sqlite3")
+
+    assert main(["--path", path, "import", str(dump)]) == 0
+    assert (
+        main(["--path", path, "import-cache", "--cache-dir", str(tmp_path / "cache")])
+        == 0
+    )
+    assert main(["--path", path, "search", "kubernetes"]) == 0
+
+    output = capsys.readouterr().out
+    assert "Indexed 3 documents" in output
+    assert "Indexed 1 cached answers" in output
+    assert "who spoke about kubernetes (answer)" in output
+    snapshot = KnowledgeSnapshot(path)
+    assert snapshot.answer("Who spoke about Kubernetes?", USER) == "Kelsey Hightower"
+    assert snapshot.answer("Who spoke about Kubernetes?", "other@x.com") is None
+    snapshot.close()
+
+
+def test_opening_old_snapshot_drops_unscoped_answers(tmp_path):
+    """Arrange: Snapshot file from before answers were scoped by user
+    Act: Open it
+    Assert: Its recorded answers are dropped and imported documents kept"""
+    path = tmp_path / "snapshot.sqlite3"
+    old = KnowledgeSnapshot(path)
+    old.add("Keynote", "Original", source="s.json")
+    old.add("What did Leslie Miley talk about?", "Answer", user_email=USER)
+    old.close()
+    conn = sqlite3.connect(path)
+    keys = conn.execute("SELECT id, key FROM documents").fetchall()
+    conn.executemany(
+        "UPDATE documents SET key = ? WHERE id = ?",
+        [(key.split("\x00", 1)[1], row_id) for row_id, key in keys],
+    )
+    conn.execute("ALTER TABLE documents DROP COLUMN user")
+    conn.commit()
+    conn.close()
+
+    snapshot = KnowledgeSnapshot(path)
+    snapshot.add("Keynote", "Updated", source="s.json")
+
+    assert snapshot.count() == 1
+    assert [result.snippet for result in snapshot.search("keynote")] == ["Updated"]
+    snapshot.close()
+
+
+@respx.mock
+def test_query_records_answers_and_uses_fast_path(tmp_path, make_settings):
+    """Arrange: Mock API and a snapshot with the fast path enabled
+    Act: Ask a question, then a paraphrase after the memory cache is cleared
+    Assert: The paraphrase is answered from the snapshot without the API"""
+    route = respx.post(f"{ICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(200, json={"answer": "Test answer"})
+    )
+    settings = make_settings(snapshot_fast_path=True, cache_enabled=False)
+
+    with patch("icsaet_mcp.tools.get_settings", return_value=settings):
+        first = query_icaet("What did Leslie Miley talk about?")
+        second = query_icaet("Leslie Miley's talk topics?")
+        results = search_local("Leslie Miley")
+
+    assert first == second == "Test answer"
+    assert route.call_count == 1
+    assert results[0]["title"] == "What did Leslie Miley talk about?"
+
+
+def test_search_local_requires_snapshot_path(make_settings):
+    """Arrange: Settings without SNAPSHOT_PATH
+    Act: Call search_local
+    Assert: RuntimeError explains how to enable it"""
+    settings = make_settings(snapshot_path=None)
+
+    with (
+        patch("icsaet_mcp.tools.get_settings", return_value=settings),
+        pytest.raises(RuntimeError, match="SNAPSHOT_PATH"),
+    ):
+        search_local("anything")
@@ -0,0 +1,36 @@
+"""Unit tests for SQLite databases shared between processes."""
+
+import pytest
+
+from icsaet_mcp.storage import immediate_transaction, open_shared_db
+
+
+def test_open_shared_db_creates_wal_database(tmp_path):
+    """Arrange: Path in a directory that does not exist yet
+    Act: Open the database
+    Assert: The directory is created and the database uses WAL"""
+    conn = open_shared_db(tmp_path / "nested" / "shared.sqlite3")
+
+    (mode,) = conn.execute("PRAGMA journal_mode").fetchone()
+    conn.close()
+
+    assert mode == "wal"
+    assert (tmp_path / "nested" / "shared.sqlite3").exists()
+
+
+def test_immediate_transaction_commits_or_rolls_back(tmp_path):
+    """Arrange: Database with an empty table
+    Act: Insert in one transaction that succeeds and one that raises
+    Assert: Only the successful insert is kept"""
+    conn = open_shared_db(tmp_path / "shared.sqlite3")
+    conn.execute("CREATE TABLE items (name TEXT)")
+
+    with immediate_transaction(conn):
+        conn.execute("INSERT INTO items VALUES ('kept')")
+    with pytest.raises(ValueError), immediate_transaction(conn):
+        conn.execute("INSERT INTO items VALUES ('dropped')")
+        raise ValueError("abort")
+    names = [name for (name,) in conn.execute("SELECT name FROM items")]
+    conn.close()
+
+    assert names == ["kept"]
@@ -1,12 +1,23 @@
 """Unit tests for MCP tools."""
 
+import asyncio
+import json
+import time
 from unittest.mock import MagicMock, patch
 
 import httpx
 import pytest
+import respx
 from pydantic import ValidationError
 
-from icsaet_mcp.tools import ICAETClient, query_icaet
+from icsaet_mcp.config import Settings
+from icsaet_mcp.tools import (
+    ICAETClient,
+    query,
+    query_batch,
+    query_icaet,
+    query_icaet_async,
+)
 
 
 def test_query_with_valid_question():
@@ -17,12 +28,12 @@ def test_query_with_valid_question():
         patch("icsaet_mcp.tools.get_settings") as mock_settings,
         patch("httpx.Client") as mock_client,
     ):
-        mock_settings.return_value = MagicMock(
+        mock_settings.return_value = Settings.model_construct(
             icaet_api_key="test-key",
             user_email="test@example.com",
         )
         mock_response = MagicMock()
-        mock_response.json.return_value = {"answer": "Test answer"}
+        mock_response.content = b'{"answer": "Test answer"}'
         mock_client.return_value.post.return_value = mock_response
 
         result = query_icaet("What did Leslie talk about?")
@@ -74,7 +85,7 @@ def test_query_with_api_timeout():
         patch("icsaet_mcp.tools.get_settings") as mock_settings,
         patch("httpx.Client") as mock_client,
     ):
-        mock_settings.return_value = MagicMock(
+        mock_settings.return_value = Settings.model_construct(
             icaet_api_key="test-key",
             user_email="test@example.com",
         )
@@ -94,7 +105,7 @@ def test_query_with_401_error():
         patch("icsaet_mcp.tools.get_settings") as mock_settings,
         patch("httpx.Client") as mock_client,
     ):
-        mock_settings.return_value = MagicMock(
+        mock_settings.return_value = Settings.model_construct(
             icaet_api_key="invalid-key",
             user_email="test@example.com",
         )
@@ -114,14 +125,14 @@ def test_icaet_client_query_success():
     """Arrange: ICAETClient with valid settings and mocked successful response
     Act: Call client.query()
     Assert: Returns parsed JSON response"""
-    settings = MagicMock(
+    settings = Settings.model_construct(
         icaet_api_key="test-key",
         user_email="test@example.com",
     )
 
     with patch("httpx.Client") as mock_client:
         mock_response = MagicMock()
-        mock_response.json.return_value = {"answer": "Test answer"}
+        mock_response.content = b'{"answer": "Test answer"}'
         mock_client.return_value.post.return_value = mock_response
 
         client = ICAETClient(settings)
@@ -138,15 +149,164 @@ def test_icaet_client_strips_whitespace():
         patch("icsaet_mcp.tools.get_settings") as mock_settings,
         patch("httpx.Client") as mock_client,
     ):
-        mock_settings.return_value = MagicMock(
+        mock_settings.return_value = Settings.model_construct(
             icaet_api_key="test-key",
             user_email="test@example.com",
         )
         mock_response = MagicMock()
-        mock_response.json.return_value = {"answer": "Test"}
+        mock_response.content = b'{"answer": "Test"}'
         mock_client.return_value.post.return_value = mock_response
 
         query_icaet("  test question  ")
 
         call_args = mock_client.return_value.post.call_args.kwargs
-        assert call_args["json"]["question"] == "test question"
+        assert json.loads(call_args["content"])["question"] == "test question"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_query_async_with_valid_question():
+    """Arrange: Valid question and mocked successful API response
+    Act: Await the async query path
+    Assert: Returns answer from API response"""
+    respx.post(f"{ICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(200, json={"answer": "Async answer"})
+    )
+    with patch("icsaet_mcp.tools.get_settings") as mock_settings:
+        mock_settings.return_value = Settings(
+            icaet_api_key="test-key-12345", user_email="test@example.com"
+        )
+
+        result = await query_icaet_async("  What did Leslie talk about?  ")
+
+    assert result == "Async answer"
+    sent = json.loads(respx.calls.last.request.content)
+    assert sent["question"] == "What did Leslie talk about?"
+
+
+@pytest.mark.asyncio
+async def test_query_async_with_empty_question():
+    """Arrange: Empty question string
+    Act: Await the async query path
+    Assert: Raises ValueError with helpful message"""
+    with pytest.raises(ValueError, match="cannot be empty"):
+        await query_icaet_async("")
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_query_tool_runs_questions_concurrently():
+    """Arrange: Upstream that takes 0.2s per answer
+    Act: Fire three query tool calls at once
+    Assert: Total wall time is close to a single call, not the sum"""
+
+    async def slow_answer(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, json={"answer": "slow"})
+
+    respx.post(f"{ICAETClient.BASE_URL}/query").mock(side_effect=slow_answer)
+    with patch("icsaet_mcp.tools.get_settings") as mock_settings:
+        mock_settings.return_value = Settings(
+            icaet_api_key="test-key-12345", user_email="test@example.com"
+        )
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(query(f"question {i}") for i in range(3)))
+        elapsed = time.perf_counter() - start
+
+    assert results == ["slow", "slow", "slow"]
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_query_batch_preserves_order_and_dedupes():
+    """Arrange: Mocked API echoing the question, batch with a duplicate
+    Act: Call the batch tool
+    Assert: Results follow input order and duplicates hit the API once"""
+
+    def echo(request: httpx.Request) -> httpx.Response:
+        question = json.loads(request.content)["question"]
+        return httpx.Response(200, json={"answer": f"A: {question}"})
+
+    route = respx.post(f"{ICAETClient.BASE_URL}/query").mock(side_effect=echo)
+    with patch("icsaet_mcp.tools.get_settings") as mock_settings:
+        mock_settings.return_value = Settings.model_construct(
+            icaet_api_key="test-key", user_email="test@example.com"
+        )
+
+        results = await query_batch(["First?", "Second?", "first?"])
+
+    assert results == [
+        {"question": "First?", "answer": "A: First?"},
+        {"question": "Second?", "answer": "A: Second?"},
+        {"question": "first?", "answer": "A: First?"},
+    ]
+    assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_query_batch_reports_per_question_errors():
+    """Arrange: API failing for one question, batch with an empty question
+    Act: Call the batch tool
+    Assert: Failures are reported per question without failing the batch"""
+
+    def answer(request: httpx.Request) -> httpx.Response:
+        if json.loads(request.content)["question"] == "Broken":
+            return httpx.Response(500)
+        return httpx.Response(200, json={"answer": "ok"})
+
+    respx.post(f"{ICAETClient.BASE_URL}/query").mock(side_effect=answer)
+    with patch("icsaet_mcp.tools.get_settings") as mock_settings:
+        mock_settings.return_value = Settings.model_construct(
+            icaet_api_key="test-key", user_email="test@example.com"
+        )
+
+        results = await query_batch(["Fine", "Broken", " "])
+
+    assert results[0] == {"question": "Fine", "answer": "ok"}
+    assert "API error: 500" in results[1]["error"]
+    assert "cannot be empty" in results[2]["error"]
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_query_batch_honours_concurrency_cap():
+    """Arrange: Upstream taking 0.1s, batch concurrency of 2
+    Act: Send four distinct questions
+    Assert: Never more than two requests in flight, wall time ~2 rounds"""
+    in_flight = 0
+    peak = 0
+
+    async def slow_answer(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.1)
+        in_flight -= 1
+        return httpx.Response(200, json={"answer": "ok"})
+
+    respx.post(f"{ICAETClient.BASE_URL}/query").mock(side_effect=slow_answer)
+    with patch("icsaet_mcp.tools.get_settings") as mock_settings:
+        mock_settings.return_value = Settings.model_construct(
+            icaet_api_key="test-key",
+            user_email="test@example.com",
+            batch_concurrency=2,
+        )
+
+        start = time.perf_counter()
+        await query_batch([f"question {i}" for i in range(4)])
+        elapsed = time.perf_counter() - start
+
+    assert peak == 2
+    assert elapsed < 0.35
+
+
+@pytest.mark.asyncio
+async def test_query_batch_rejects_empty_list():
+    """Arrange: No questions
+    Act: Call the batch tool
+    Assert: Raises ValueError"""
+    with pytest.raises(ValueError, match="cannot be empty"):
+        await query_batch([])
@@ -0,0 +1,196 @@
+"""Unit tests for optional OpenTelemetry tracing."""
+
+import importlib.util
+import json
+import logging
+from unittest.mock import mock_open, patch
+
+import httpx
+import pytest
+import respx
+from opentelemetry import trace
+from opentelemetry.trace import NonRecordingSpan, SpanContext, TraceFlags
+
+from icsaet_mcp.client import ICAETClient
+from icsaet_mcp.tools import query_icaet
+from icsaet_mcp.tracing import (
+    configure_tracing,
+    record_response,
+    shutdown_tracing,
+    start_span,
+)
+
+HAS_SDK = importlib.util.find_spec("opentelemetry.sdk") is not None
+
+TRACE_ID = 0x4BF92F3577B34DA6A3CE929D0E0E4736
+SPAN_ID = 0x00F067AA0BA902B7
+
+
+def parent_span() -> NonRecordingSpan:
+    return NonRecordingSpan(
+        SpanContext(
+            trace_id=TRACE_ID,
+            span_id=SPAN_ID,
+            is_remote=False,
+            trace_flags=TraceFlags(TraceFlags.SAMPLED),
+        )
+    )
+
+
+@respx.mock
+def test_outbound_request_carries_trace_context(make_settings):
+    """Arrange: Active trace context and a mock API
+    Act: Query through ICAETClient
+    Assert: The request carries a W3C traceparent header for that trace"""
+    route = respx.post(f"{ICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(200, json={"answer": "Test answer"})
+    )
+
+    with trace.use_span(parent_span()), ICAETClient(make_settings()) as client:
+        client.query("Q?")
+
+    traceparent = route.calls.last.request.headers["traceparent"]
+    assert traceparent.startswith(f"00-{TRACE_ID:032x}-")
+
+
+@respx.mock
+def test_outbound_request_without_trace_has_no_traceparent(make_settings):
+    """Arrange: No active trace and a mock API
+    Act: Query through ICAETClient
+    Assert: No traceparent header is sent"""
+    route = respx.post(f"{ICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(200, json={"answer": "Test answer"})
+    )
+
+    with ICAETClient(make_settings()) as client:
+        client.query("Q?")
+
+    assert "traceparent" not in route.calls.last.request.headers
+
+
+def test_spans_are_noops_without_configured_exporter():
+    """Arrange: No tracer provider installed
+    Act: Open a span and record a response on it
+    Assert: The span is non-recording and recording is skipped"""
+    response = httpx.Response(500, request=httpx.Request("POST", "https://x/"))
+
+    with start_span("icsaet.test", {"key": "value"}) as span:
+        record_response(span, response)
+
+    assert span is not None
+    assert not span.is_recording()
+
+
+def test_configure_tracing_disabled_by_default(make_settings):
+    """Arrange: Default TRACE_EXPORTER
+    Act: Configure tracing
+    Assert: No exporter is installed"""
+    assert configure_tracing(make_settings(trace_exporter="none")) is False
+
+
+@pytest.mark.skipif(HAS_SDK, reason="opentelemetry-sdk is installed")
+def test_configure_tracing_without_sdk_warns(caplog, make_settings):
+    """Arrange: TRACE_EXPORTER=console without opentelemetry-sdk
+    Act: Configure tracing
+    Assert: Tracing stays disabled with an install hint"""
+    with caplog.at_level(logging.WARNING):
+        enabled = configure_tracing(make_settings(trace_exporter="console"))
+
+    assert enabled is False
+    assert "icsaet-mcp[tracing]" in caplog.text
+
+
+@pytest.mark.skipif(not HAS_SDK, reason="opentelemetry-sdk is not installed")
+@respx.mock
+def test_query_records_nested_spans(make_settings):
+    """Arrange: In-memory span exporter and a mock API
+    Act: Ask a question
+    Assert: Settings, cache and client spans plus an HTTP client span with
+    status code and response size are recorded in one trace"""
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    respx.post(f"{ICAETClient.BASE_URL}/query").mock(
+        return_value=httpx.Response(200, json={"answer": "Test answer"})
+    )
+
+    with (
+        patch("icsaet_mcp.tools.get_settings", return_value=make_settings()),
+        patch("icsaet_mcp.tracing.trace.get_tracer", provider.get_tracer),
+        provider.get_tracer("test").start_as_current_span("root"),
+    ):
+        query_icaet("Q?")
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert {"icsaet.settings", "icsaet.cache_lookup", "icsaet.client"} <= set(spans)
+    http_span = spans["POST /query"]
+    assert http_span.attributes["http.response.status_code"] == 200
+    assert http_span.attributes["http.response.body.size"] > 0
+    assert spans["icsaet.cache_lookup"].attributes["icsaet.cache.hit"] is False
+    assert len({span.context.trace_id for span in spans.values()}) == 1
+
+
+@pytest.mark.skipif(not HAS_SDK, reason="opentelemetry-sdk is not installed")
+def test_console_exporter_writes_to_stderr(capfd, make_settings):
+    """Arrange: TRACE_EXPORTER=console
+    Act: Configure tracing, finish a span and flush
+    Assert: The span is written to stderr and nothing to stdout, which
+    carries the MCP protocol on the stdio transport"""
+    from icsaet_mcp import tracing
+
+    with patch("icsaet_mcp.tracing.trace.set_tracer_provider"):
+        assert configure_tracing(make_settings(trace_exporter="console")) is True
+        tracing._provider.get_tracer("test").start_span("icsaet.test").end()
+        shutdown_tracing()
+
+    out, err = capfd.readouterr()
+    assert out == ""
+    assert '"icsaet.test"' in err
+
+
+@pytest.mark.skipif(not HAS_SDK, reason="opentelemetry-sdk is not installed")
+def test_file_exporter_writes_json_lines_and_closes_file(tmp_path, make_settings):
+    """Arrange: TRACE_EXPORTER=file
+    Act: Configure tracing, finish a span and shut tracing down
+    Assert: The span is appended as one JSON line and the file is closed"""
+    from icsaet_mcp import tracing
+
+    path = tmp_path / "spans.jsonl"
+    settings = make_settings(trace_exporter="file", trace_file=str(path))
+
+    with patch("icsaet_mcp.tracing.trace.set_tracer_provider"):
+        assert configure_tracing(settings) is True
+        trace_file = tracing._trace_file
+        tracing._provider.get_tracer("test").start_span("icsaet.test").end()
+        shutdown_tracing()
+
+    (line,) = path.read_text().splitlines()
+    assert json.loads(line)["name"] == "icsaet.test"
+    assert trace_file.closed
+
+
+@pytest.mark.skipif(not HAS_SDK, reason="opentelemetry-sdk is not installed")
+def test_file_exporter_closes_file_when_setup_fails(tmp_path, make_settings):
+    """Arrange: TRACE_EXPORTER=file and a tracer provider that cannot be installed
+    Act: Configure tracing
+    Assert: The error propagates and the trace file is closed again"""
+    settings = make_settings(trace_exporter="file", trace_file=str(tmp_path / "t"))
+    opener = mock_open()
+
+    with (
+        patch("icsaet_mcp.tracing.open", opener, create=True),
+        patch(
+            "icsaet_mcp.tracing.trace.set_tracer_provider",
+            side_effect=RuntimeError("boom"),
+        ),
+        pytest.raises(RuntimeError, match="boom"),
+    ):
+        configure_tracing(settings)
+
+    opener.return_value.close.assert_called_once()
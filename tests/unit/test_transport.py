@@ -0,0 +1,210 @@
+"""Unit tests for the HTTP and SSE transports."""
+
+import asyncio
+import logging
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from icsaet_mcp.__main__ import main, parse_args
+from icsaet_mcp.server import mcp
+from icsaet_mcp.transport import (
+    ClientConcurrencyMiddleware,
+    client_address,
+    configure_http,
+    create_app,
+    serve_http,
+)
+
+
+def test_client_address_outside_http_request():
+    """Arrange: No active HTTP request
+    Act: Look up the client address
+    Assert: None, so stdio and in-memory calls are not limited"""
+    assert client_address() is None
+
+
+def test_client_concurrency_middleware_limits_each_client():
+    """Arrange: Middleware allowing two calls per client
+    Act: Start five calls from one client and one from another
+    Assert: The first client never exceeds two; the second is not held up"""
+    middleware = ClientConcurrencyMiddleware(limit=2)
+    running: dict[str, int] = {"alice": 0, "bob": 0}
+    peak: dict[str, int] = {"alice": 0, "bob": 0}
+
+    async def call(client: str) -> str:
+        async def call_next(context):
+            running[client] += 1
+            peak[client] = max(peak[client], running[client])
+            await asyncio.sleep(0.01)
+            running[client] -= 1
+            return client
+
+        with patch("icsaet_mcp.transport.client_address", return_value=client):
+            return await middleware.on_call_tool(MagicMock(), call_next)
+
+    async def run() -> list[str]:
+        return await asyncio.gather(*(call("alice") for _ in range(5)), call("bob"))
+
+    results = asyncio.run(run())
+
+    assert results == ["alice"] * 5 + ["bob"]
+    assert peak == {"alice": 2, "bob": 1}
+    assert middleware.in_flight("alice") == 0
+    assert middleware._slots == {}
+
+
+def test_configure_http_skips_middleware_when_unlimited(make_settings):
+    """Arrange: Per-client limit disabled
+    Act: Configure a server for HTTP
+    Assert: No middleware is added"""
+    server = MagicMock()
+
+    configure_http(server, make_settings(client_max_concurrency=0))
+
+    server.add_middleware.assert_not_called()
+
+
+def test_serve_http_single_worker_runs_in_process(make_settings):
+    """Arrange: Mocked server and a 10 second shutdown timeout
+    Act: Serve over SSE with one worker
+    Assert: The server runs with the transport, address and graceful timeout"""
+    server = MagicMock()
+    settings = make_settings(client_max_concurrency=3, shutdown_timeout_seconds=10)
+
+    serve_http(server, settings, "sse", host="0.0.0.0", port=9000)
+
+    middleware = server.add_middleware.call_args.args[0]
+    assert isinstance(middleware, ClientConcurrencyMiddleware)
+    assert middleware.limit == 3
+    server.run.assert_called_once_with(
+        transport="sse",
+        show_banner=False,
+        host="0.0.0.0",
+        port=9000,
+        uvicorn_config={"timeout_graceful_shutdown": 10},
+    )
+
+
+def test_serve_http_multiple_workers_use_app_factory(make_settings):
+    """Arrange: Two workers over streamable HTTP
+    Act: Serve
+    Assert: Uvicorn starts worker processes from the app factory"""
+    server = MagicMock()
+    settings = make_settings(shutdown_timeout_seconds=5, metrics_port=None)
+
+    with patch("uvicorn.run") as uvicorn_run:
+        serve_http(server, settings, "http", host="0.0.0.0", port=9000, workers=2)
+
+    uvicorn_run.assert_called_once_with(
+        "icsaet_mcp.transport:create_app",
+        factory=True,
+        host="0.0.0.0",
+        port=9000,
+        workers=2,
+        timeout_graceful_shutdown=5,
+    )
+    server.run.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("transport", "overrides", "message"),
+    [
+        ("sse", {"metrics_port": None}, "SSE sessions"),
+        ("http", {"metrics_port": 9100}, "METRICS_PORT"),
+    ],
+)
+def test_serve_http_rejects_unsupported_worker_setups(
+    transport, overrides, message, make_settings
+):
+    """Arrange: Two workers with SSE or a metrics port
+    Act: Serve
+    Assert: RuntimeError explains the conflict"""
+    settings = make_settings(shutdown_timeout_seconds=5, **overrides)
+
+    with pytest.raises(RuntimeError, match=message):
+        serve_http(MagicMock(), settings, transport, "0.0.0.0", 9000, workers=2)
+
+
+def test_serve_http_warns_that_workers_need_cache_dir_for_paging(caplog, make_settings):
+    """Arrange: Two workers with answer paging on and no CACHE_DIR
+    Act: Serve
+    Assert: A warning says continuation tokens need CACHE_DIR"""
+    settings = make_settings(
+        shutdown_timeout_seconds=5, metrics_port=None, answer_page_chars=20_000
+    )
+
+    with patch("uvicorn.run"), caplog.at_level(logging.WARNING):
+        serve_http(MagicMock(), settings, "http", "0.0.0.0", 9000, workers=2)
+
+    assert "set CACHE_DIR" in caplog.text
+
+
+def test_create_app_builds_stateless_streamable_http_app(make_settings):
+    """Arrange: Settings with a per-client limit
+    Act: Build the worker app
+    Assert: The app serves /mcp and the limit middleware is installed"""
+    with (
+        patch(
+            "icsaet_mcp.transport.get_settings",
+            return_value=make_settings(client_max_concurrency=2),
+        ),
+        patch.object(mcp, "middleware", []),
+    ):
+        app = create_app()
+        installed = list(mcp.middleware)
+
+    assert app.state.path == "/mcp"
+    assert any(isinstance(m, ClientConcurrencyMiddleware) for m in installed)
+
+
+def test_main_selects_http_transport_from_cli(make_settings):
+    """Arrange: Settings defaulting to stdio
+    Act: Run main with --transport http --port 9000
+    Assert: serve_http gets the CLI values and settings fill the rest"""
+    settings = make_settings(
+        mcp_transport="stdio", http_host="127.0.0.1", http_port=8000, http_workers=1
+    )
+
+    with (
+        patch("icsaet_mcp.__main__.get_settings", return_value=settings),
+        patch("icsaet_mcp.__main__.mcp") as mock_mcp,
+        patch("icsaet_mcp.transport.serve_http") as mock_serve,
+    ):
+        main(["--transport", "http", "--port", "9000"])
+
+    mock_serve.assert_called_once_with(
+        mock_mcp, settings, "http", host="127.0.0.1", port=9000, workers=1
+    )
+    mock_mcp.run.assert_not_called()
+
+
+def test_main_selects_transport_from_settings(make_settings):
+    """Arrange: MCP_TRANSPORT=sse in settings
+    Act: Run main without flags
+    Assert: The server is served over SSE"""
+    settings = make_settings(
+        mcp_transport="sse", http_host="0.0.0.0", http_port=8000, http_workers=1
+    )
+
+    with (
+        patch("icsaet_mcp.__main__.get_settings", return_value=settings),
+        patch("icsaet_mcp.__main__.mcp"),
+        patch("icsaet_mcp.transport.serve_http") as mock_serve,
+    ):
+        main([])
+
+    assert mock_serve.call_args.args[2] == "sse"
+    assert mock_serve.call_args.kwargs["host"] == "0.0.0.0"
+
+
+@pytest.mark.parametrize("workers", ["0", "-2", "two"])
+def test_cli_rejects_invalid_worker_count(workers, capsys):
+    """Arrange: A --workers value that is not a positive integer
+    Act: Parse the command line
+    Assert: argparse exits with a usage error instead of using HTTP_WORKERS"""
+    with pytest.raises(SystemExit) as exit_info:
+        parse_args(["--transport", "http", "--workers", workers])
+
+    assert exit_info.value.code == 2
+    assert "--workers" in capsys.readouterr().err